@@ -28,9 +28,13 @@ cube = np.array(
 )
 
 
+# The same rotation is applied on every frame, until the axis is changed
+rotation_cache = rl.RotationCache(maxsize=8)
+
+
 # Rotate cube with quaternions
 def rotate_qube(theta, axis, cube):
-    return np.array([rl.rotate_by_quaternion(v, theta, axis) for v in cube])
+    return cube @ rotation_cache.matrix(theta, axis).T
 
 
 # project cube to 2D
@@ -3,8 +3,6 @@ import numpy as np
 
 import robolie as rl
 
-import time
-
 # Define the initial point
 p0 = np.array([0, -1, 0])
 
@@ -24,8 +22,11 @@ rotations.append((avg_angle, avg_axis))
 labels.append("Average Rotation")
 
 
-def make_angles(angle, steps=100):
-    return np.linspace(0, angle, steps)
+def make_path(angle, axis, steps=100):
+    identity = rl.Quaternion(1, 0, 0, 0)
+    rotation = rl.Quaternion.from_angle_and_axis(angle / 2, axis)
+    quaternions = rl.slerp(identity, rotation, np.linspace(0, 1, steps))
+    return rl.rotate_points(p0, quaternions)
 
 
 # Initialize the figure
@@ -37,13 +38,7 @@ ax.set_zlim([-1, 1])
 
 # Plot the paths
 for i, (angle, axis) in enumerate(rotations):
-    path = []
-    p = p0.copy()
-    angles = make_angles(angle)
-    for angle in angles:
-        rotated_point = rl.rotate_by_quaternion(p0, angle, axis)
-        path.append(rotated_point)
-    path = np.array(path)
+    path = make_path(angle, axis)
     ax.plot(path[:, 0], path[:, 1], path[:, 2], label=labels[i])
 
 # Add lines on the sphere
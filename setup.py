@@ -29,6 +29,10 @@ setup(
     install_requires=required,
     extras_require={
         "dev": required_dev,
+        "numba": ["numba"],
+    },
+    entry_points={
+        "console_scripts": ["robolie-benchmark = robolie.benchmark:main"],
     },
     python_requires=">=3",
     url="https://github.com/EStorvik/robolie.git",
@@ -3,14 +3,197 @@ Root directory for the RoboLie package.
 
 This package contains implementations of Lie groups and algebras for robotics.
 
+The public names are loaded lazily. Importing robolie only sets up the table
+below, and the submodule defining a name is imported the first time the name
+is accessed, so short-lived processes only pay for what they use, and
+optional heavy dependencies stay out of the import of the package.
+
 isort:skip_file
 
 """
 
-from robolie.quaternions.quaternion import *
-from robolie.quaternions.rotate import *
+import importlib
+import os
+from typing import TYPE_CHECKING, Any
+
+_PUBLIC_NAMES = {
+    "robolie.quaternions.quaternion": ("Quaternion", "PureQuaternion"),
+    "robolie.quaternions.quaternion_array": (
+        "QuaternionArray",
+        "hamilton_product",
+        "left_multiplication_matrix",
+        "right_multiplication_matrix",
+    ),
+    "robolie.quaternions.unit_quaternion": ("UnitQuaternion", "UnitQuaternionArray"),
+    "robolie.quaternions.maps": (
+        "SMALL_ANGLE",
+        "quaternion_exp",
+        "quaternion_log",
+        "sinc",
+    ),
+    "robolie.quaternions.rotate": (
+        "rotate_by_quaternion",
+        "quaternion_to_rotation_matrix",
+        "rotate_points",
+        "compute_average_rotation_quaternion",
+    ),
+    "robolie.quaternions.average": (
+        "markley_mean",
+        "karcher_mean",
+        "grouped_average",
+        "RotationAverager",
+    ),
+    "robolie.quaternions.interpolation": ("slerp", "QuaternionSpline"),
+    "robolie.quaternions.products": ("cumulative_product", "reduce_product"),
+    "robolie.quaternions.integration": (
+        "AngularVelocityIntegrator",
+        "integrate_angular_velocity",
+    ),
+    "robolie.quaternions.index": ("OrientationIndex",),
+    "robolie.quaternions.cache": ("CachedRotation", "RotationCache"),
+    "robolie.so.rotate": ("rotate_by_matrix",),
+    "robolie.so.so3": ("SO3", "hat", "vee", "rodrigues_coefficients"),
+    "robolie.so.so": ("SO",),
+    "robolie.twodimensional.so2": ("SO2", "wrap_angle"),
+    "robolie.twodimensional.so2_array": ("SO2Array",),
+    "robolie.twodimensional.se2": ("SE2",),
+    "robolie.twodimensional.se2_array": ("SE2Array", "se2_coefficients"),
+    "robolie.se.se3": ("SE3",),
+    "robolie.se.se3_array": (
+        "SE3Array",
+        "se3_coefficients",
+        "v_matrix",
+        "inverse_v_matrix",
+    ),
+    "robolie.storage.trajectory": (
+        "TRAJECTORY_MAGIC",
+        "TRAJECTORY_VERSION",
+        "HEADER_SIZE",
+        "record_dtype",
+        "TrajectoryWriter",
+        "Trajectory",
+        "write_trajectory",
+    ),
+    "robolie.group": (
+        "LieGroup",
+        "GroupInfo",
+        "register_group",
+        "group_info",
+        "algebra_exp",
+        "group_log",
+        "group_mean",
+        "interpolate",
+    ),
+    "robolie.jacobians": (
+        "left_jacobian",
+        "right_jacobian",
+        "inverse_left_jacobian",
+        "inverse_right_jacobian",
+        "adjoint",
+    ),
+    "robolie.exponential": ("exp",),
+    "robolie.logarithm": ("log",),
+    "robolie.precision": (
+        "get_default_dtype",
+        "set_default_dtype",
+        "default_dtype",
+        "as_float_array",
+        "tolerances",
+        "isclose",
+    ),
+    "robolie.backend": (
+        "available_backends",
+        "get_backend",
+        "set_backend",
+        "use_backend",
+    ),
+    "robolie.instrumentation": (
+        "INSTRUMENTED_FUNCTIONS",
+        "INSTRUMENTED_METHODS",
+        "Instrumentation",
+        "instrument",
+        "active_instrumentation",
+    ),
+}
+
+# Subpackages and modules that are accessible as attributes of the package.
+_SUBMODULES = (
+    "quaternions",
+    "so",
+    "se",
+    "twodimensional",
+    "storage",
+    "visualization",
+    "exponential",
+    "logarithm",
+    "group",
+    "jacobians",
+    "precision",
+    "backend",
+    "instrumentation",
+    "parallel",
+    "benchmark",
+)
+
+_MODULE_OF = {name: module for module, names in _PUBLIC_NAMES.items() for name in names}
+
+__all__ = list(_MODULE_OF)
+
+
+def __getattr__(name: str) -> Any:
+    """Imports the submodule defining a public name on first access."""
+    if name in _MODULE_OF:
+        value = getattr(importlib.import_module(_MODULE_OF[name]), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f"{__name__}.{name}")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Later accesses find the name directly, without calling __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__) | set(_SUBMODULES))
+
+
+if TYPE_CHECKING:
+    from robolie.quaternions.quaternion import *
+    from robolie.quaternions.quaternion_array import *
+    from robolie.quaternions.unit_quaternion import *
+    from robolie.quaternions.maps import *
+    from robolie.quaternions.rotate import *
+    from robolie.quaternions.average import *
+    from robolie.quaternions.interpolation import *
+    from robolie.quaternions.products import *
+    from robolie.quaternions.integration import *
+    from robolie.quaternions.index import *
+    from robolie.quaternions.cache import *
+
+    from robolie.so.rotate import *
+    from robolie.so.so3 import *
+    from robolie.so.so import *
+
+    from robolie.twodimensional.so2 import *
+    from robolie.twodimensional.so2_array import *
+    from robolie.twodimensional.se2 import *
+    from robolie.twodimensional.se2_array import *
+
+    from robolie.se.se3 import *
+    from robolie.se.se3_array import *
+
+    from robolie.storage.trajectory import *
+
+    from robolie.group import *
+    from robolie.jacobians import *
+
+    from robolie.exponential import *
+    from robolie.logarithm import *
+
+    from robolie.precision import *
+    from robolie.backend import *
 
-from robolie.twodimensional.so2 import *
+    from robolie.instrumentation import *
 
-from robolie.exponential import *
-from robolie.logarithm import *
+if os.environ.get("ROBOLIE_INSTRUMENT", "0") not in ("", "0"):
+    importlib.import_module("robolie.instrumentation")
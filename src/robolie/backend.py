@@ -0,0 +1,221 @@
+"""Selection of the compute kernels behind the batched quaternion operations.
+
+The Hamilton product, rotate_points, quaternion_exp, quaternion_log and the
+matrix of markley_mean are vectorized numpy expressions, which allocate a
+temporary array for every intermediate result. Where Numba is installed, the
+same operations are also available as fused loops over the batch, compiled on
+first use, which compute every element in registers and write the result
+once. This pays off on small and medium batches, where the temporaries and
+the per-call overhead of numpy dominate; run
+
+    robolie-benchmark --backends numpy numba
+
+to find the sizes where each backend is fastest on a machine.
+
+The backend is chosen at runtime with set_backend or temporarily with
+
+    with rl.use_backend("numpy"):
+        ...
+
+and defaults to the ROBOLIE_BACKEND environment variable, or to Numba if it
+is installed. Numba is an optional dependency, installed with
+
+    pip install robolie[numba]
+
+and without it the default is numpy. Both backends agree within rounding
+errors. Inputs the compiled loops do not cover, such as broadcasting batches,
+always use numpy.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import math
+import os
+import warnings
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+import numpy as np
+
+
+def _hamilton_loop(a: np.ndarray, b: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Computes the products a * b of (N, 4) arrays into out.
+
+    Row i of out is written after reading row i of a and b, so out may be a or b
+    itself, but must not overlap them otherwise, e.g. as a reversed view.
+    """
+    for i in range(a.shape[0]):
+        aw, ax, ay, az = a[i, 0], a[i, 1], a[i, 2], a[i, 3]
+        bw, bx, by, bz = b[i, 0], b[i, 1], b[i, 2], b[i, 3]
+        out[i, 0] = aw * bw - ax * bx - ay * by - az * bz
+        out[i, 1] = aw * bx + ax * bw + ay * bz - az * by
+        out[i, 2] = aw * by - ax * bz + ay * bw + az * bx
+        out[i, 3] = aw * bz + ax * by - ay * bx + az * bw
+    return out
+
+
+def _rotate_loop(points: np.ndarray, q: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Rotates (N, 3) points by (N, 4) unit quaternions into out.
+
+    As for _hamilton_loop, out may be points itself but must not overlap them
+    otherwise.
+    """
+    for i in range(points.shape[0]):
+        w, x, y, z = q[i, 0], q[i, 1], q[i, 2], q[i, 3]
+        vx, vy, vz = points[i, 0], points[i, 1], points[i, 2]
+        tx = 2 * (y * vz - z * vy)
+        ty = 2 * (z * vx - x * vz)
+        tz = 2 * (x * vy - y * vx)
+        out[i, 0] = vx + w * tx + y * tz - z * ty
+        out[i, 1] = vy + w * ty + z * tx - x * tz
+        out[i, 2] = vz + w * tz + x * ty - y * tx
+    return out
+
+
+def _exp_loop(vectors: np.ndarray, out: np.ndarray, small: float) -> np.ndarray:
+    """Computes quaternion_exp of (N, 3) vectors into (N, 4) out."""
+    for i in range(vectors.shape[0]):
+        x, y, z = vectors[i, 0], vectors[i, 1], vectors[i, 2]
+        theta_sq = x * x + y * y + z * z
+        theta = math.sqrt(theta_sq)
+        if theta < small:
+            scale = 1 - theta_sq / 6 + theta_sq * theta_sq / 120
+        else:
+            scale = math.sin(theta) / theta
+        out[i, 0] = math.cos(theta)
+        out[i, 1] = scale * x
+        out[i, 2] = scale * y
+        out[i, 3] = scale * z
+    return out
+
+
+def _log_loop(q: np.ndarray, out: np.ndarray, small: float) -> np.ndarray:
+    """Computes quaternion_log of (N, 4) quaternions into (N, 3) out."""
+    for i in range(q.shape[0]):
+        w, x, y, z = q[i, 0], q[i, 1], q[i, 2], q[i, 3]
+        r = math.sqrt(x * x + y * y + z * z)
+        if r < small and w > 0:
+            x_sq = (r / w) ** 2
+            scale = (1 - x_sq / 3 + x_sq * x_sq / 5) / w
+        elif r > 0:
+            scale = math.atan2(r, w) / r
+        elif w < 0:
+            # The quaternion -1 has no unique logarithm.
+            x, scale = math.pi, 1.0
+        else:
+            scale = 0.0
+        out[i, 0] = scale * x
+        out[i, 1] = scale * y
+        out[i, 2] = scale * z
+    return out
+
+
+def _mean_loop(q: np.ndarray, w: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Computes the weighted sum of the outer products q q^T into (4, 4) out."""
+    out[:, :] = 0
+    for i in range(q.shape[0]):
+        for j in range(4):
+            weighted = w[i] * q[i, j]
+            for k in range(j, 4):
+                out[j, k] += weighted * q[i, k]
+    for j in range(4):
+        for k in range(j):
+            out[j, k] = out[k, j]
+    return out
+
+
+# The loops implementing the kernels, compiled by Numba on first use.
+_LOOPS: dict[str, Callable[..., np.ndarray]] = {
+    "hamilton_product": _hamilton_loop,
+    "rotate": _rotate_loop,
+    "exp": _exp_loop,
+    "log": _log_loop,
+    "mean": _mean_loop,
+}
+_compiled: dict[str, Callable[..., np.ndarray]] = {}
+
+if importlib.util.find_spec("numba") is None:
+    _AVAILABLE: tuple[str, ...] = ("numpy",)
+else:
+    _AVAILABLE = ("numpy", "numba")
+
+
+def _initial_backend() -> str:
+    """Returns the backend requested by ROBOLIE_BACKEND, or the fastest one."""
+    requested = os.environ.get("ROBOLIE_BACKEND", "")
+    if requested in _AVAILABLE:
+        return requested
+    if requested:
+        warnings.warn(f"The backend {requested} is not available, using numpy.")
+        return "numpy"
+    return _AVAILABLE[-1]
+
+
+_active = _initial_backend()
+
+
+def available_backends() -> tuple[str, ...]:
+    """Returns the names of the backends that can be used."""
+    return _AVAILABLE
+
+
+def get_backend() -> str:
+    """Returns the name of the active backend."""
+    return _active
+
+
+def set_backend(name: str) -> None:
+    """Sets the active backend.
+
+    Args:
+        name: One of available_backends().
+
+    Raises:
+        ValueError: If the backend is unknown or its dependency is missing.
+    """
+    global _active
+    if name not in _AVAILABLE:
+        raise ValueError(
+            f"The backend {name} is not available, choose one of {_AVAILABLE}."
+        )
+    _active = name
+
+
+@contextmanager
+def use_backend(name: str) -> Iterator[str]:
+    """Context manager setting the active backend, restoring it on exit."""
+    previous = _active
+    set_backend(name)
+    try:
+        yield name
+    finally:
+        set_backend(previous)
+
+
+def loop_safe(out: np.ndarray, *inputs: np.ndarray) -> bool:
+    """Returns whether a loop may write out while reading the inputs row by row.
+
+    This is the case if out is one of the inputs or shares no memory with them.
+    """
+    return all(out is x or not np.may_share_memory(out, x) for x in inputs)
+
+
+def kernel(name: str) -> Optional[Callable[..., Any]]:
+    """Returns a compiled kernel of the active backend.
+
+    Args:
+        name: The name of the kernel, "hamilton_product", "rotate", "exp",
+            "log" or "mean".
+
+    Returns:
+        The compiled loop, or None if the operation uses numpy.
+    """
+    if _active == "numpy":
+        return None
+    compiled = _compiled.get(name)
+    if compiled is None:
+        import numba
+
+        compiled = _compiled[name] = numba.njit(cache=True)(_LOOPS[name])
+    return compiled
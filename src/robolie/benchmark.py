@@ -0,0 +1,478 @@
+"""Benchmark suite for the core operations of robolie.
+
+Every operation is timed for a range of input sizes, reporting the best time
+per call, the throughput in elements per second and the peak memory traced
+during one call. Where scipy.spatial.transform.Rotation offers the same
+operation it is timed alongside as a baseline. Results can be saved as JSON,
+and two result files can be compared to find regressions. With several
+compute backends, see robolie.backend, the operations are timed with each of
+them, and the sizes at which another backend becomes the fastest are listed.
+
+Run from the command line with
+
+    robolie-benchmark --max-size 100000 --output results.json
+    robolie-benchmark --compare results.json
+    robolie-benchmark --backends numpy numba
+
+or equivalently with python -m robolie.benchmark.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+import robolie as rl
+
+DEFAULT_SIZES = [10**k for k in range(8)]
+
+Setup = Callable[[int, np.random.Generator], Callable[[], Any]]
+
+
+class Operation(NamedTuple):
+    """An operation to benchmark.
+
+    Attributes:
+        name: The name used in reports and on the command line.
+        setup: Creates the inputs of a given size and returns a function
+            performing the operation on them.
+        baseline: An optional setup of the equivalent scipy operation.
+        max_size: The largest size to run, for operations that loop in Python.
+    """
+
+    name: str
+    setup: Setup
+    baseline: Optional[Setup] = None
+    max_size: Optional[int] = None
+
+
+def _quaternions(n: int, rng: np.random.Generator) -> np.ndarray:
+    """Returns n random unit quaternions, shape (n, 4)."""
+    q = rng.normal(size=(n, 4))
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    return q
+
+
+def _scipy_rotations(n: int, rng: np.random.Generator) -> Any:
+    """Returns n random rotations as a scipy Rotation."""
+    from scipy.spatial.transform import Rotation
+
+    # scipy orders the quaternion components as (x, y, z, w).
+    return Rotation.from_quat(np.roll(_quaternions(n, rng), -1, axis=1))
+
+
+def _quaternion_mul(n: int, rng: np.random.Generator) -> Callable[[], Any]:
+    pairs = [
+        (rl.Quaternion(*a), rl.Quaternion(*b))
+        for a, b in zip(_quaternions(n, rng).tolist(), _quaternions(n, rng).tolist())
+    ]
+    return lambda: [a * b for a, b in pairs]
+
+
+def _quaternion_create_mul(n: int, rng: np.random.Generator) -> Callable[[], Any]:
+    # Construction from components dominates code building many small quaternions.
+    a, b = _quaternions(n, rng).tolist(), _quaternions(n, rng).tolist()
+    return lambda: [rl.Quaternion(*p) * rl.Quaternion(*q) for p, q in zip(a, b)]
+
+
+def _scipy_create_product(n: int, rng: np.random.Generator) -> Callable[[], Any]:
+    from scipy.spatial.transform import Rotation
+
+    a, b = _quaternions(n, rng), _quaternions(n, rng)
+    return lambda: Rotation.from_quat(a) * Rotation.from_quat(b)
+
+
+def _hamilton_product(n: int, rng: np.random.Generator) -> Callable[[], Any]:
+    a, b = _quaternions(n, rng), _quaternions(n, rng)
+    return lambda: rl.hamilton_product(a, b)
+
+
+def _scipy_product(n: int, rng: np.random.Generator) -> Callable[[], Any]:
+    a, b = _scipy_rotations(n, rng), _scipy_rotations(n, rng)
+    return lambda: a * b
+
+
+def _rotate_by_quaternion(n: int, rng: np.random.Generator) -> Callable[[], Any]:
+    quaternions = [rl.Quaternion(*q) for q in _quaternions(n, rng).tolist()]
+    points = rng.normal(size=(n, 3))
+    return lambda: [
+        rl.rotate_by_quaternion(p, quaternion=q) for p, q in zip(points, quaternions)
+    ]
+
+
+def _rotate_points(n: int, rng: np.random.Generator) -> Callable[[], Any]:
+    q, points = _quaternions(n, rng), rng.normal(size=(n, 3))
+    return lambda: rl.rotate_points(points, q)
+
+
+def _scipy_apply(n: int, rng: np.random.Generator) -> Callable[[], Any]:
+    rotations, points = _scipy_rotations(n, rng), rng.normal(size=(n, 3))
+    return lambda: rotations.apply(points)
+
+
+def _exp(n: int, rng: np.random.Generator) -> Callable[[], Any]:
+    vectors = rng.normal(size=(n, 3))
+    return lambda: rl.exp(vectors)
+
+
+def _scipy_exp(n: int, rng: np.random.Generator) -> Callable[[], Any]:
+    from scipy.spatial.transform import Rotation
+
+    # Rotation vectors are twice the pure quaternions used by rl.exp.
+    vectors = 2 * rng.normal(size=(n, 3))
+    return lambda: Rotation.from_rotvec(vectors)
+
+
+def _log(n: int, rng: np.random.Generator) -> Callable[[], Any]:
+    q = _quaternions(n, rng)
+    return lambda: rl.log(q)
+
+
+def _scipy_log(n: int, rng: np.random.Generator) -> Callable[[], Any]:
+    rotations = _scipy_rotations(n, rng)
+    return lambda: rotations.as_rotvec()
+
+
+def _average(n: int, rng: np.random.Generator) -> Callable[[], Any]:
+    axes = rng.normal(size=(n, 3))
+    axes /= np.linalg.norm(axes, axis=1, keepdims=True)
+    rotations = list(zip(rng.uniform(0, np.pi, n).tolist(), axes))
+    return lambda: rl.compute_average_rotation_quaternion(rotations)
+
+
+def _markley_mean(n: int, rng: np.random.Generator) -> Callable[[], Any]:
+    q = _quaternions(n, rng)
+    return lambda: rl.markley_mean(q)
+
+
+def _scipy_mean(n: int, rng: np.random.Generator) -> Callable[[], Any]:
+    rotations = _scipy_rotations(n, rng)
+    return lambda: rotations.mean()
+
+
+OPERATIONS = [
+    Operation("quaternion_mul", _quaternion_mul, _scipy_product, max_size=10**5),
+    Operation(
+        "quaternion_create_mul",
+        _quaternion_create_mul,
+        _scipy_create_product,
+        max_size=10**5,
+    ),
+    Operation("hamilton_product", _hamilton_product, _scipy_product),
+    Operation("rotate_by_quaternion", _rotate_by_quaternion, _scipy_apply, 10**5),
+    Operation("rotate_points", _rotate_points, _scipy_apply),
+    Operation("exp", _exp, _scipy_exp),
+    Operation("log", _log, _scipy_log),
+    Operation("average", _average, _scipy_mean, max_size=10**6),
+    Operation("markley_mean", _markley_mean, _scipy_mean),
+]
+
+
+def time_call(function: Callable[[], Any], min_time: float = 0.2) -> float:
+    """Returns the best time of repeated calls of a function in seconds.
+
+    The function is called until the total time exceeds min_time, at least
+    twice and at most 1000 times.
+    """
+    best = np.inf
+    total = 0.0
+    for repeat in range(1000):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+        if repeat >= 1 and total >= min_time:
+            break
+    return best
+
+
+def peak_memory(function: Callable[[], Any]) -> int:
+    """Returns the peak memory in bytes allocated during one call of a function."""
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_benchmarks(
+    operations: Optional[Sequence[str]] = None,
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    baseline: bool = True,
+    min_time: float = 0.2,
+    seed: int = 0,
+    backends: Optional[Sequence[str]] = None,
+) -> list[dict[str, Any]]:
+    """Runs the benchmarks.
+
+    Args:
+        operations: The names of the operations to run, by default all.
+        sizes: The input sizes to run every operation with.
+        baseline: If True, the scipy baselines are run as well.
+        min_time: The minimal total time spent timing every case.
+        seed: The seed of the random inputs.
+        backends: The compute backends to run robolie with, by default only
+            the active one. Their results are labeled "robolie-<backend>".
+
+    Returns:
+        One record per operation, library and size, with the keys "operation",
+        "library", "size", "seconds", "throughput" and "peak_bytes".
+    """
+    selected = [o for o in OPERATIONS if operations is None or o.name in operations]
+    if operations is not None and len(selected) != len(set(operations)):
+        unknown = set(operations) - {o.name for o in OPERATIONS}
+        raise ValueError(f"Unknown operations {sorted(unknown)}.")
+    if baseline:
+        try:
+            from scipy.spatial.transform import Rotation  # noqa: F401
+        except ImportError:
+            baseline = False
+
+    if backends is None:
+        libraries: list[tuple[str, Optional[str]]] = [("robolie", None)]
+    else:
+        libraries = [(f"robolie-{backend}", backend) for backend in backends]
+
+    results = []
+    for operation in selected:
+        setups = [(library, backend, operation.setup) for library, backend in libraries]
+        if baseline and operation.baseline is not None:
+            setups.append(("scipy", None, operation.baseline))
+        for size in sizes:
+            if operation.max_size is not None and size > operation.max_size:
+                continue
+            for library, backend, setup in setups:
+                with _using(backend):
+                    function = setup(size, np.random.default_rng(seed))
+                    # Warm up first, the first call also compiles the kernels
+                    # of the backend, which should not count as memory or time.
+                    function()
+                    memory = peak_memory(function)
+                    seconds = time_call(function, min_time)
+                results.append(
+                    {
+                        "operation": operation.name,
+                        "library": library,
+                        "size": size,
+                        "seconds": seconds,
+                        "throughput": size / seconds if seconds > 0 else np.inf,
+                        "peak_bytes": memory,
+                    }
+                )
+    return results
+
+
+def _using(backend: Optional[str]) -> Any:
+    """Returns a context running robolie with a backend, or the active one."""
+    if backend is None:
+        return contextlib.nullcontext()
+    return rl.use_backend(backend)
+
+
+def find_crossovers(results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Finds the sizes at which another robolie backend becomes the fastest.
+
+    Args:
+        results: Results of run_benchmarks with several backends.
+
+    Returns:
+        For every operation, one record for its smallest size and one for
+        every size at which the fastest backend differs from the one at the
+        next smaller size, with the keys "operation", "size", "fastest" and
+        "speedup", the time of the second fastest over the fastest backend.
+    """
+    cases: dict[tuple[str, int], dict[str, float]] = {}
+    for r in results:
+        if r["library"].startswith("robolie"):
+            key = (r["operation"], r["size"])
+            cases.setdefault(key, {})[r["library"]] = r["seconds"]
+
+    crossovers: list[dict[str, Any]] = []
+    previous: dict[str, str] = {}
+    for (operation, size), times in sorted(cases.items()):
+        if len(times) < 2:
+            continue
+        fastest, second = sorted(times, key=times.__getitem__)[:2]
+        if previous.get(operation) != fastest:
+            crossovers.append(
+                {
+                    "operation": operation,
+                    "size": size,
+                    "fastest": fastest,
+                    "speedup": times[second] / times[fastest],
+                }
+            )
+        previous[operation] = fastest
+    return crossovers
+
+
+def compare_results(
+    old: list[dict[str, Any]], new: list[dict[str, Any]], threshold: float = 0.1
+) -> list[dict[str, Any]]:
+    """Compares two benchmark runs.
+
+    Args:
+        old: The results of the reference run.
+        new: The results of the current run.
+        threshold: The relative slowdown above which a case is a regression.
+
+    Returns:
+        One record per case present in both runs, with the keys "operation",
+        "library", "size", "old_seconds", "new_seconds", "ratio" and
+        "regression".
+    """
+    reference = {(r["operation"], r["library"], r["size"]): r for r in old}
+    comparison = []
+    for result in new:
+        key = (result["operation"], result["library"], result["size"])
+        if key not in reference:
+            continue
+        ratio = result["seconds"] / reference[key]["seconds"]
+        comparison.append(
+            {
+                "operation": key[0],
+                "library": key[1],
+                "size": key[2],
+                "old_seconds": reference[key]["seconds"],
+                "new_seconds": result["seconds"],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+            }
+        )
+    return comparison
+
+
+def format_results(results: list[dict[str, Any]]) -> str:
+    """Formats benchmark results as a table."""
+    lines = [
+        f"{'operation':<22}{'library':<15}{'size':>10}{'time [s]':>12}"
+        f"{'elements/s':>12}{'peak [MB]':>11}"
+    ]
+    for r in results:
+        lines.append(
+            f"{r['operation']:<22}{r['library']:<15}{r['size']:>10}"
+            f"{r['seconds']:>12.3e}{r['throughput']:>12.3e}"
+            f"{r['peak_bytes'] / 2**20:>11.2f}"
+        )
+    return "\n".join(lines)
+
+
+def format_crossovers(crossovers: list[dict[str, Any]]) -> str:
+    """Formats the sizes at which the fastest backend changes as a table."""
+    lines = [f"{'operation':<22}{'from size':>10}  {'fastest':<16}{'speedup':>8}"]
+    for c in crossovers:
+        lines.append(
+            f"{c['operation']:<22}{c['size']:>10}  {c['fastest']:<16}"
+            f"{c['speedup']:>8.2f}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(comparison: list[dict[str, Any]]) -> str:
+    """Formats a comparison of two benchmark runs as a table."""
+    lines = [
+        f"{'operation':<22}{'library':<15}{'size':>10}{'old [s]':>12}"
+        f"{'new [s]':>12}{'ratio':>8}"
+    ]
+    for c in comparison:
+        lines.append(
+            f"{c['operation']:<22}{c['library']:<15}{c['size']:>10}"
+            f"{c['old_seconds']:>12.3e}{c['new_seconds']:>12.3e}{c['ratio']:>8.2f}"
+            + ("  REGRESSION" if c["regression"] else "")
+        )
+    return "\n".join(lines)
+
+
+def save_results(path: str, results: list[dict[str, Any]]) -> None:
+    """Saves benchmark results together with the environment to a JSON file."""
+    document = {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(path, "w") as file:
+        json.dump(document, file, indent=2)
+
+
+def load_results(path: str) -> list[dict[str, Any]]:
+    """Loads benchmark results saved with save_results."""
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Runs the benchmarks from the command line.
+
+    Returns:
+        The exit code, 1 if a regression was found in a comparison.
+    """
+    parser = argparse.ArgumentParser(
+        prog="robolie-benchmark", description="Benchmark robolie operations."
+    )
+    parser.add_argument(
+        "operations",
+        nargs="*",
+        help=f"operations to run, by default all of {[o.name for o in OPERATIONS]}",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--max-size", type=int, help="skip sizes above this")
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--no-baseline", action="store_true", help="skip scipy")
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        choices=rl.available_backends(),
+        help="run robolie with each of these compute backends",
+    )
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--compare", help="compare with results in this JSON file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown reported as a regression",
+    )
+    args = parser.parse_args(argv)
+
+    sizes = [s for s in args.sizes if args.max_size is None or s <= args.max_size]
+    results = run_benchmarks(
+        args.operations or None,
+        sizes,
+        not args.no_baseline,
+        args.min_time,
+        backends=args.backends,
+    )
+    print(format_results(results))
+    if args.backends and len(args.backends) > 1:
+        print()
+        print(format_crossovers(find_crossovers(results)))
+    if args.output:
+        save_results(args.output, results)
+    if args.compare:
+        comparison = compare_results(
+            load_results(args.compare), results, args.threshold
+        )
+        print()
+        print(format_comparison(comparison))
+        if any(c["regression"] for c in comparison):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,20 @@
 import robolie as rl
 
 
-def exp(x):
-    """Returns the exponential of x. Function changes depending on the type of x."""
-    if isinstance(x, rl.PureQuaternion):
-        return x.exp()
-    else:
-        raise NotImplementedError(f"Exponential not implemented for {type(x)}")
+def exp(x, group=None):
+    """Returns the exponential of x. Function changes depending on the type of x.
+
+    The exponential map is looked up once per type of x in the group registry,
+    see robolie.group. PureQuaternions are mapped to Quaternions, and arrays of
+    shape (..., 3) are treated as batches of pure quaternions and are mapped to
+    arrays of unit quaternions of shape (..., 4). For other groups the group
+    has to be given, since their lie algebras share the array type.
+
+    Args:
+        x: The element or elements of the lie algebra.
+        group: Optional registered group type, such as rl.SO3 or rl.SE2Array,
+            whose exponential map is used.
+    """
+    if group is not None:
+        return rl.group_info(group).group.exp(x)
+    return rl.algebra_exp(type(x))(x)
@@ -0,0 +1,339 @@
+"""Generic interface to the lie groups of robolie.
+
+Every group type, scalar or batched, implements the LieGroup protocol and is
+registered here together with its batched counterpart. The registry is looked
+up by type once, the result is cached per type, so generic code such as exp,
+log, group_mean and interpolate does not pay for a chain of isinstance checks
+on every call. New groups plug in through register_group.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, NamedTuple, Optional, Protocol, Sequence, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import robolie as rl
+
+
+class LieGroup(Protocol):
+    """The interface of the group types, scalar as well as batched.
+
+    Elements of the lie algebra are numpy arrays of the dimension of the group,
+    except for the scalar quaternions, whose lie algebra is PureQuaternion,
+    and SO2, whose lie algebra elements are floats. Batched types act
+    elementwise with broadcasting, a batch of length one acts on every element.
+    """
+
+    def compose(self, other: Any) -> Any:
+        """Returns the product self * other, applying other first."""
+
+    def inverse(self) -> Any:
+        """Returns the inverse element."""
+
+    def log(self) -> Any:
+        """Logarithmic map to the lie algebra."""
+
+    def adjoint(self) -> np.ndarray:
+        """Returns the matrix of the adjoint action on the lie algebra."""
+
+    def act(self, points: ArrayLike) -> np.ndarray:
+        """Returns the points transformed by the element."""
+
+    @classmethod
+    def exp(cls, x: Any) -> Any:
+        """Exponential map from the lie algebra."""
+
+    @classmethod
+    def identity(cls) -> Any:
+        """Returns the identity element."""
+
+
+class GroupInfo(NamedTuple):
+    """The registry entry of a group type.
+
+    Attributes:
+        group: The registered type.
+        batch: The batched type used by the generic algorithms.
+        dimension: The dimension of the lie algebra.
+        stack: Creates a batch from a sequence of elements.
+        mean: Optional specialized mean(batch, weights), replacing the
+            generic Karcher mean.
+        interpolate: Optional specialized interpolate(a, b, t), replacing the
+            generic geodesic interpolation.
+    """
+
+    group: type
+    batch: type
+    dimension: int
+    stack: Callable[[Sequence[Any]], Any]
+    mean: Optional[Callable[[Any, Optional[np.ndarray]], Any]] = None
+    interpolate: Optional[Callable[[Any, Any, Any], Any]] = None
+
+
+_GROUPS: dict[type, GroupInfo] = {}
+# Exponential maps of the lie algebra types, for exp without a given group.
+_ALGEBRAS: dict[type, Callable[[Any], Any]] = {}
+# Logarithmic maps of types that are not groups themselves, such as arrays.
+_LOGS: dict[type, Callable[[Any], Any]] = {}
+# The lookups per type, resolved along the method resolution order.
+_cache: dict[tuple[str, type], Any] = {}
+_builtins_registered = False
+
+
+def register_group(
+    group: type,
+    dimension: int,
+    batch: Optional[type] = None,
+    stack: Optional[Callable[[Sequence[Any]], Any]] = None,
+    mean: Optional[Callable[[Any, Optional[np.ndarray]], Any]] = None,
+    interpolate: Optional[Callable[[Any, Any, Any], Any]] = None,
+    algebra: Optional[type] = None,
+) -> None:
+    """Registers a type implementing the LieGroup protocol.
+
+    Args:
+        group: The group type.
+        dimension: The dimension of the lie algebra.
+        batch: The batched counterpart, by default the type itself.
+        stack: Creates a batch from a sequence of elements, required if the
+            type is not batched itself.
+        mean: Optional specialized mean, see GroupInfo.
+        interpolate: Optional specialized interpolation, see GroupInfo.
+        algebra: Optional type of the lie algebra elements, which exp maps to
+            this group if no group is given.
+    """
+    if batch is None:
+        batch = group
+    if stack is None:
+        if batch is not group:
+            raise ValueError("A stack function is required for scalar types.")
+        stack = _cannot_stack
+    _GROUPS[group] = GroupInfo(group, batch, dimension, stack, mean, interpolate)
+    if algebra is not None:
+        _ALGEBRAS[algebra] = _exp_of(group)
+    _cache.clear()
+
+
+def group_info(value: Any) -> GroupInfo:
+    """Returns the registry entry of a group element or group type.
+
+    Raises:
+        NotImplementedError: If the type is not a registered group.
+    """
+    cls = value if isinstance(value, type) else type(value)
+    info = _lookup("group", cls, _GROUPS)
+    if info is None:
+        raise NotImplementedError(f"{cls.__name__} is not a registered lie group.")
+    return info
+
+
+def algebra_exp(cls: type) -> Callable[[Any], Any]:
+    """Returns the exponential map of a lie algebra type.
+
+    Raises:
+        NotImplementedError: If no group is registered for the type.
+    """
+    function = _lookup("exp", cls, _ALGEBRAS)
+    if function is None:
+        raise NotImplementedError(f"Exponential not implemented for {cls}")
+    return function
+
+
+def group_log(cls: type) -> Callable[[Any], Any]:
+    """Returns the logarithmic map of a group type.
+
+    Raises:
+        NotImplementedError: If the type is not a registered group.
+    """
+    function = _lookup("log", cls, _LOGS)
+    if function is None:
+        if _lookup("group", cls, _GROUPS) is None:
+            raise NotImplementedError(f"Logarithm not implemented for {cls}")
+        function = _cache[("log", cls)] = _call_log
+    return function
+
+
+def _lookup(table: str, cls: type, entries: dict[type, Any]) -> Any:
+    """Looks up a type and its bases in a table, caching the result."""
+    key = (table, cls)
+    if key in _cache:
+        return _cache[key]
+    _register_builtin_groups()
+    value = None
+    for base in cls.__mro__:
+        if base in entries:
+            value = entries[base]
+            break
+    _cache[key] = value
+    return value
+
+
+def _exp_of(group: type) -> Callable[[Any], Any]:
+    """Returns the exponential map of a group, looked up at call time."""
+
+    def exp(x: Any) -> Any:
+        return group.exp(x)  # type: ignore[attr-defined]
+
+    return exp
+
+
+def _call_log(element: Any) -> Any:
+    return element.log()
+
+
+def _array_exp(vectors: np.ndarray) -> np.ndarray:
+    return rl.quaternion_exp(vectors)
+
+
+def _array_log(quaternions: np.ndarray) -> np.ndarray:
+    return rl.quaternion_log(quaternions)
+
+
+def _cannot_stack(batches: Sequence[Any]) -> Any:
+    """Batched types are passed as a batch, not as a sequence."""
+    raise NotImplementedError(
+        f"Cannot stack elements of {type(batches[0]).__name__}, pass a batch."
+    )
+
+
+def group_mean(
+    elements: Union[Any, Sequence[Any]],
+    weights: Optional[ArrayLike] = None,
+    tolerance: float = 1e-12,
+    max_iterations: int = 100,
+) -> Any:
+    """Computes the Karcher mean of elements of any registered group.
+
+    Starting from the first element, all elements are mapped to the lie
+    algebra relative to the current estimate, averaged there, and the average
+    is mapped back, until the update is below the tolerance. Groups with a
+    specialized mean, such as unit quaternions, use that instead.
+
+    Args:
+        elements: A batch or a sequence of elements of the same group.
+        weights: Optional non-negative weights, shape (N,).
+        tolerance: The iteration stops once the update is smaller than this.
+        max_iterations: The maximal number of iterations.
+
+    Returns:
+        The mean, as an element of the scalar type where there is one.
+    """
+    if isinstance(elements, (list, tuple)):
+        batch = group_info(elements[0]).stack(elements)
+    else:
+        batch = elements
+    info = group_info(batch)
+    if len(batch) == 0:
+        raise ValueError("Cannot average an empty set of elements.")
+    if weights is None:
+        w = np.full(len(batch), 1 / len(batch))
+    else:
+        w = np.asarray(weights, dtype=np.float64).reshape(-1)
+        w = w / w.sum()
+    if info.mean is not None:
+        return info.mean(batch, w)
+
+    mean = batch[np.arange(1)]
+    for _ in range(max_iterations):
+        step = w @ np.asarray((mean.inverse() * batch).log())
+        mean = mean * info.batch.exp(step)  # type: ignore[attr-defined]
+        if np.linalg.norm(step) < tolerance:
+            break
+    return mean[0]
+
+
+def interpolate(a: Any, b: Any, t: ArrayLike) -> Any:
+    """Interpolates along the geodesic a exp(t log(a^-1 b)) of any group.
+
+    Args:
+        a: The start, a group element or a batch.
+        b: The end, of the same type as a.
+        t: The interpolation parameters, 0 gives a and 1 gives b. Scalar for
+            scalar types, broadcast against the batch for batched types.
+
+    Returns:
+        The interpolated elements, of the type of a.
+    """
+    info = group_info(a)
+    if info.interpolate is not None:
+        return info.interpolate(a, b, t)
+    delta = np.asarray((a.inverse() * b).log())
+    t = np.asarray(t, dtype=np.float64)
+    if 0 < t.ndim < delta.ndim:
+        t = t.reshape(t.shape + (1,) * (delta.ndim - t.ndim))
+    step = t * delta
+    return a * type(a).exp(step if step.ndim else float(step))
+
+
+def _quaternion_mean(batch: rl.QuaternionArray, w: Optional[np.ndarray]) -> Any:
+    return rl.karcher_mean(batch, w)
+
+
+def _unit_quaternion_mean(batch: rl.QuaternionArray, w: Optional[np.ndarray]) -> Any:
+    return rl.UnitQuaternion.from_quaternion(rl.karcher_mean(batch, w))
+
+
+def _quaternion_interpolate(a: Any, b: Any, t: ArrayLike) -> Any:
+    if isinstance(a, rl.Quaternion):
+        return type(a)(*rl.slerp(a, b, t))
+    return type(a)(rl.slerp(a, b, t))
+
+
+def _so2_mean(batch: rl.SO2Array, w: Optional[np.ndarray]) -> Any:
+    return batch.mean(w)
+
+
+def _stack_so(rotations: Sequence[rl.SO]) -> rl.SO3:
+    return rl.SO3(np.array([r.matrix for r in rotations]))
+
+
+def _register_builtin_groups() -> None:
+    """Registers the groups of robolie, on the first lookup."""
+    global _builtins_registered
+    if _builtins_registered:
+        return
+
+    register_group(
+        rl.Quaternion,
+        3,
+        rl.QuaternionArray,
+        rl.QuaternionArray.from_quaternions,
+        _quaternion_mean,
+        _quaternion_interpolate,
+        algebra=rl.PureQuaternion,
+    )
+    register_group(
+        rl.QuaternionArray,
+        3,
+        mean=_quaternion_mean,
+        interpolate=_quaternion_interpolate,
+    )
+    register_group(
+        rl.UnitQuaternion,
+        3,
+        rl.UnitQuaternionArray,
+        rl.UnitQuaternionArray.from_quaternions,
+        _unit_quaternion_mean,
+        _quaternion_interpolate,
+    )
+    register_group(
+        rl.UnitQuaternionArray,
+        3,
+        mean=_unit_quaternion_mean,
+        interpolate=_quaternion_interpolate,
+    )
+    register_group(rl.SO2, 1, rl.SO2Array, rl.SO2Array.from_rotations, _so2_mean)
+    register_group(rl.SO2Array, 1, mean=_so2_mean)
+    register_group(rl.SO3, 3)
+    register_group(rl.SO, 3, rl.SO3, _stack_so)
+    register_group(rl.SE2, 3, rl.SE2Array, rl.SE2Array.from_transforms)
+    register_group(rl.SE2Array, 3)
+    register_group(rl.SE3, 6, rl.SE3Array, rl.SE3Array.from_transforms)
+    register_group(rl.SE3Array, 6)
+    # Arrays of shape (..., 3) are pure quaternions, as they have always been.
+    _ALGEBRAS[np.ndarray] = _array_exp
+    _LOGS[np.ndarray] = _array_log
+    _builtins_registered = True
+    _cache.clear()
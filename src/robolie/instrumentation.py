@@ -0,0 +1,360 @@
+"""Opt-in instrumentation of the public operations of robolie.
+
+While instrumentation is enabled, the public functions and methods listed in
+INSTRUMENTED_FUNCTIONS and INSTRUMENTED_METHODS are replaced by wrappers that
+record call counts, cumulative and own wall time, and optionally the memory
+allocated through tracemalloc, which includes numpy arrays. When it is
+disabled the original functions are put back, so there is no overhead at all
+when instrumentation is off.
+
+Instrumentation is enabled with the context manager
+
+    with rl.instrument() as instrumentation:
+        ...
+    print(instrumentation.table())
+
+or for a whole program by setting the environment variable ROBOLIE_INSTRUMENT
+before importing robolie. A value of 1 prints the table at exit, any other
+value is taken as a path to write a cProfile-compatible dump to, which can be
+read with pstats or tools such as snakeviz.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import marshal
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Optional
+
+import robolie as rl
+
+INSTRUMENTED_FUNCTIONS = (
+    "exp",
+    "log",
+    "hamilton_product",
+    "quaternion_exp",
+    "quaternion_log",
+    "rotate_by_quaternion",
+    "rotate_points",
+    "rotate_by_matrix",
+    "quaternion_to_rotation_matrix",
+    "compute_average_rotation_quaternion",
+    "markley_mean",
+    "karcher_mean",
+    "grouped_average",
+    "slerp",
+    "cumulative_product",
+    "reduce_product",
+    "integrate_angular_velocity",
+    "left_jacobian",
+    "right_jacobian",
+    "inverse_left_jacobian",
+    "inverse_right_jacobian",
+)
+
+INSTRUMENTED_METHODS = {
+    "Quaternion": (
+        "__mul__",
+        "from_angle_and_axis",
+        "normalize",
+        "normalized",
+        "conjugate",
+        "conjugated",
+        "inverse",
+        "log",
+        "which_rotation",
+    ),
+    "PureQuaternion": ("__mul__", "__add__", "exp"),
+    "QuaternionArray": (
+        "__mul__",
+        "from_angle_and_axis",
+        "normalize",
+        "normalized",
+        "conjugated",
+        "inverse",
+        "exp",
+        "log",
+    ),
+    "UnitQuaternion": ("__mul__", "compose", "inverse", "log"),
+    "UnitQuaternionArray": ("__mul__", "compose", "inverse", "exp"),
+    "SO2": ("__mul__", "exp", "log", "inverse"),
+    "SO2Array": ("__mul__", "exp", "log", "inverse", "apply", "mean"),
+    "SE2": ("__mul__", "exp", "log", "inverse", "apply"),
+    "SE2Array": ("__mul__", "exp", "log", "inverse", "apply"),
+    "SO3": ("__mul__", "exp", "log", "inverse", "apply", "to_quaternions"),
+    "SE3": ("__mul__", "exp", "log", "inverse", "apply"),
+    "SE3Array": ("__mul__", "exp", "log", "inverse", "apply"),
+    "RotationAverager": ("update", "value"),
+    "RotationCache": ("get", "matrix"),
+}
+
+_active: Optional[Instrumentation] = None
+
+
+class _Record:
+    """The statistics of one operation, in the terms used by pstats."""
+
+    __slots__ = (
+        "calls",
+        "primitive_calls",
+        "own_time",
+        "total_time",
+        "allocated_bytes",
+        "peak_bytes",
+        "callers",
+    )
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.primitive_calls = 0
+        self.own_time = 0.0
+        self.total_time = 0.0
+        self.allocated_bytes = 0
+        self.peak_bytes = 0
+        # Per calling operation: calls, primitive calls, own and total time.
+        self.callers: dict[str, list] = {}
+
+
+class Instrumentation:
+    """Collects statistics of the calls of the public robolie operations.
+
+    Only one instrumentation can be enabled at a time. The statistics are
+    kept after disabling, and are extended if it is enabled again.
+
+    Attributes:
+        allocations: Whether allocated memory is traced. This uses
+            tracemalloc, which slows down every allocation considerably.
+    """
+
+    def __init__(self, allocations: bool = False) -> None:
+        """Initializes an instrumentation without enabling it.
+
+        Args:
+            allocations: If True, the memory allocated by every operation is
+                traced as well. It is attributed to the outermost instrumented
+                operation only.
+        """
+        self.allocations = allocations
+        self._records: dict[str, _Record] = {}
+        self._codes: dict[str, tuple[str, int, str]] = {}
+        self._originals: list[tuple[Any, str, Any]] = []
+        self._local = threading.local()
+        self._started_tracemalloc = False
+
+    @property
+    def enabled(self) -> bool:
+        """Returns whether the operations are currently instrumented."""
+        return bool(self._originals)
+
+    def enable(self) -> None:
+        """Replaces the public operations by instrumented wrappers."""
+        global _active
+        if _active is self:
+            return
+        if _active is not None:
+            raise RuntimeError("Another instrumentation is already enabled.")
+        _active = self
+        if self.allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        for name in INSTRUMENTED_FUNCTIONS:
+            function = getattr(rl, name)
+            wrapper = self._wrap(name, function)
+            self._patch(rl, name, wrapper)
+            # Calls from within the defining module bypass the package.
+            module = sys.modules[function.__module__]
+            if getattr(module, name, None) is function:
+                self._patch(module, name, wrapper)
+        for class_name, methods in INSTRUMENTED_METHODS.items():
+            cls = getattr(rl, class_name)
+            for name in methods:
+                self._patch_method(cls, name)
+
+    def disable(self) -> None:
+        """Restores the original operations."""
+        global _active
+        if _active is not self:
+            return
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals.clear()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        _active = None
+
+    def reset(self) -> None:
+        """Discards all statistics collected so far."""
+        self._records.clear()
+
+    def __enter__(self) -> Instrumentation:
+        self.enable()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.disable()
+
+    def _patch(self, owner: Any, name: str, value: Any) -> None:
+        """Sets an attribute, remembering the original value."""
+        self._originals.append((owner, name, owner.__dict__[name]))
+        setattr(owner, name, value)
+
+    def _patch_method(self, cls: type, name: str) -> None:
+        """Replaces a method, classmethod or staticmethod by a wrapper."""
+        attribute = cls.__dict__[name]
+        key = f"{cls.__name__}.{name}"
+        wrapper: Any
+        if isinstance(attribute, (classmethod, staticmethod)):
+            wrapper = type(attribute)(self._wrap(key, attribute.__func__))
+        else:
+            wrapper = self._wrap(key, attribute)
+        self._patch(cls, name, wrapper)
+
+    def _wrap(self, key: str, function: Callable) -> Callable:
+        """Returns a wrapper of function recording its calls under key."""
+        code = getattr(function, "__code__", None)
+        if code is not None:
+            self._codes[key] = (code.co_filename, code.co_firstlineno, key)
+        else:
+            self._codes[key] = ("~", 0, key)
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            return self._call(key, function, args, kwargs)
+
+        return wrapper
+
+    def _call(self, key: str, function: Callable, args: tuple, kwargs: dict) -> Any:
+        """Calls function and records the call."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        recursive = any(frame[0] == key for frame in stack)
+        trace = self.allocations and not stack and tracemalloc.is_tracing()
+        if trace:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+
+        # The frame holds the key and the time spent in instrumented callees.
+        frame: list[Any] = [key, 0.0]
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            own = elapsed - frame[1]
+            record = self._records.get(key)
+            if record is None:
+                record = self._records[key] = _Record()
+            record.calls += 1
+            record.own_time += own
+            if not recursive:
+                record.primitive_calls += 1
+                record.total_time += elapsed
+            if stack:
+                parent = stack[-1]
+                parent[1] += elapsed
+                caller = record.callers.setdefault(parent[0], [0, 0, 0.0, 0.0])
+                caller[0] += 0 if recursive else 1
+                caller[1] += 1
+                caller[2] += own
+                caller[3] += 0.0 if recursive else elapsed
+            if trace:
+                allocated = tracemalloc.get_traced_memory()[1] - before
+                record.allocated_bytes += allocated
+                record.peak_bytes = max(record.peak_bytes, allocated)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Returns the statistics per operation.
+
+        Returns:
+            A dictionary mapping the operation names to dictionaries with the
+            keys "calls", "primitive_calls", "total_time" and "own_time" in
+            seconds, and "allocated_bytes" and "peak_bytes", which stay zero
+            unless allocations are traced.
+        """
+        return {
+            key: {
+                "calls": r.calls,
+                "primitive_calls": r.primitive_calls,
+                "total_time": r.total_time,
+                "own_time": r.own_time,
+                "allocated_bytes": r.allocated_bytes,
+                "peak_bytes": r.peak_bytes,
+            }
+            for key, r in self._records.items()
+        }
+
+    def table(self, sort: str = "total_time") -> str:
+        """Returns the statistics as a table, sorted by the given column."""
+        rows = sorted(self.stats().items(), key=lambda item: -item[1][sort])
+        width = max([len("operation")] + [len(key) for key, _ in rows])
+        lines = [
+            f"{'operation':<{width}}{'calls':>10}{'total [s]':>12}"
+            f"{'own [s]':>12}{'per call [us]':>15}{'peak [MB]':>11}"
+        ]
+        for key, s in rows:
+            lines.append(
+                f"{key:<{width}}{s['calls']:>10}{s['total_time']:>12.4f}"
+                f"{s['own_time']:>12.4f}"
+                f"{1e6 * s['total_time'] / max(s['primitive_calls'], 1):>15.2f}"
+                f"{s['peak_bytes'] / 2**20:>11.2f}"
+            )
+        return "\n".join(lines)
+
+    def dump_stats(self, path: str) -> None:
+        """Writes the statistics in the format of cProfile.Profile.dump_stats."""
+        stats = {}
+        for key, r in self._records.items():
+            callers = {self._codes[caller]: tuple(c) for caller, c in r.callers.items()}
+            stats[self._codes[key]] = (
+                r.primitive_calls,
+                r.calls,
+                r.own_time,
+                r.total_time,
+                callers,
+            )
+        with open(path, "wb") as file:
+            marshal.dump(stats, file)
+
+
+def instrument(allocations: bool = False) -> Instrumentation:
+    """Returns a new instrumentation, to be used as a context manager.
+
+    Args:
+        allocations: If True, the memory allocated by every operation is
+            traced as well.
+    """
+    return Instrumentation(allocations)
+
+
+def active_instrumentation() -> Optional[Instrumentation]:
+    """Returns the currently enabled instrumentation, if any."""
+    return _active
+
+
+def _instrument_from_environment(value: str) -> None:
+    """Enables instrumentation for the whole program and reports at exit."""
+    instrumentation = instrument()
+    instrumentation.enable()
+
+    def report() -> None:
+        instrumentation.disable()
+        if value == "1":
+            print(instrumentation.table(), file=sys.stderr)
+        else:
+            instrumentation.dump_stats(value)
+
+    atexit.register(report)
+
+
+if os.environ.get("ROBOLIE_INSTRUMENT", "0") not in ("", "0"):
+    _instrument_from_environment(os.environ["ROBOLIE_INSTRUMENT"])
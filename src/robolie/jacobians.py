@@ -0,0 +1,245 @@
+"""Analytic Jacobians of the exponential maps, for on-manifold optimization.
+
+The left Jacobian J_l and the right Jacobian J_r of a group relate
+perturbations in the lie algebra to perturbations of the group element,
+
+    exp(xi + d) = exp(J_l(xi) d) exp(xi) = exp(xi) exp(J_r(xi) d),
+
+for small d, and their inverses give the derivatives of the logarithm,
+log(exp(d) X) = log(X) + J_l^-1 d and log(X exp(d)) = log(X) + J_r^-1 d,
+with xi = log(X). All functions are batched and return arrays of shape
+(N, k, k), where k is the dimension of the lie algebra, so that the Jacobians
+of many residuals are assembled in one vectorized pass.
+
+The group is given as any registered group type, scalar or batched. The lie
+algebra coordinates are the ones of the log of that group: rotation vectors
+for SO3, pure quaternions for unit quaternions, which are half the rotation
+vector, and twists (rho, phi) for SE3.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import robolie as rl
+
+
+def _so2_jacobian(tangents: np.ndarray) -> np.ndarray:
+    """The group is abelian, so all Jacobians are the identity."""
+    return np.ones((len(tangents), 1, 1))
+
+
+def _so3_left(phi: np.ndarray) -> np.ndarray:
+    return rl.v_matrix(phi)
+
+
+def _so3_right(phi: np.ndarray) -> np.ndarray:
+    return rl.v_matrix(-phi)
+
+
+def _so3_inverse_left(phi: np.ndarray) -> np.ndarray:
+    return rl.inverse_v_matrix(phi)
+
+
+def _so3_inverse_right(phi: np.ndarray) -> np.ndarray:
+    return rl.inverse_v_matrix(-phi)
+
+
+def _su2(jacobian: Callable[[np.ndarray], np.ndarray]) -> Callable:
+    """Returns the unit quaternion version of a Jacobian of SO3.
+
+    The pure quaternion v is the rotation vector 2 v, and perturbations scale
+    alike, so the Jacobian in v is the one of SO3 evaluated at 2 v.
+    """
+
+    def su2_jacobian(v: np.ndarray) -> np.ndarray:
+        return jacobian(2 * v)
+
+    return su2_jacobian
+
+
+def _q_coefficients(theta: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the coefficients (theta - sin)/theta^3, (theta^2 + 2 cos - 2) /
+    (2 theta^4) and (2 theta - 3 sin + theta cos) / (2 theta^5) of the
+    translational block of the Jacobians of SE3.
+
+    Taylor series are used below 0.1, as the last closed form cancels to
+    fifth order.
+    """
+    t2 = theta * theta
+    t4 = t2 * t2
+    small = theta < 0.1
+    s = np.where(small, 1, theta)
+    sin, cos = np.sin(s), np.cos(s)
+    c1 = np.where(
+        small,
+        1 / 6 - t2 / 120 + t4 / 5040 - t2 * t4 / 362880,
+        (s - sin) / s**3,
+    )
+    c2 = np.where(
+        small,
+        1 / 24 - t2 / 720 + t4 / 40320 - t2 * t4 / 3628800,
+        (s * s + 2 * cos - 2) / (2 * s**4),
+    )
+    c3 = np.where(
+        small,
+        1 / 120 - t2 / 2520 + t4 / 120960 - t2 * t4 / 9979200,
+        (2 * s - 3 * sin + s * cos) / (2 * s**5),
+    )
+    return c1, c2, c3
+
+
+def _q_matrix(twists: np.ndarray) -> np.ndarray:
+    """Returns the translational blocks Q(rho, phi) of the left Jacobians."""
+    rho, phi = twists[:, :3], twists[:, 3:]
+    c1, c2, c3 = _q_coefficients(np.linalg.norm(phi, axis=-1))
+    r, p = rl.hat(rho), rl.hat(phi)
+    pr = p @ r
+    rp = r @ p
+    prp = pr @ p
+    pp = p @ p
+    matrix = 0.5 * r
+    matrix += c1[:, np.newaxis, np.newaxis] * (pr + rp + prp)
+    matrix += c2[:, np.newaxis, np.newaxis] * (p @ pr + rp @ p - 3 * prp)
+    matrix += c3[:, np.newaxis, np.newaxis] * (prp @ p + pp @ rp)
+    return matrix
+
+
+def _se3_left(twists: np.ndarray) -> np.ndarray:
+    rotational = rl.v_matrix(twists[:, 3:])
+    jacobian = np.zeros((len(twists), 6, 6))
+    jacobian[:, :3, :3] = rotational
+    jacobian[:, 3:, 3:] = rotational
+    jacobian[:, :3, 3:] = _q_matrix(twists)
+    return jacobian
+
+
+def _se3_inverse_left(twists: np.ndarray) -> np.ndarray:
+    inverse = rl.inverse_v_matrix(twists[:, 3:])
+    jacobian = np.zeros((len(twists), 6, 6))
+    jacobian[:, :3, :3] = inverse
+    jacobian[:, 3:, 3:] = inverse
+    jacobian[:, :3, 3:] = -inverse @ _q_matrix(twists) @ inverse
+    return jacobian
+
+
+def _se3_right(twists: np.ndarray) -> np.ndarray:
+    return _se3_left(-twists)
+
+
+def _se3_inverse_right(twists: np.ndarray) -> np.ndarray:
+    return _se3_inverse_left(-twists)
+
+
+# The left, right, inverse left and inverse right Jacobian per batched type.
+_JACOBIANS: dict[type, tuple[Callable, Callable, Callable, Callable]] = {}
+
+
+def _jacobians(group: Any) -> tuple[int, tuple[Callable, ...]]:
+    """Returns the dimension and the Jacobians of a registered group."""
+    if not _JACOBIANS:
+        _JACOBIANS[rl.SO2Array] = (_so2_jacobian,) * 4
+        _JACOBIANS[rl.SO3] = (
+            _so3_left,
+            _so3_right,
+            _so3_inverse_left,
+            _so3_inverse_right,
+        )
+        _JACOBIANS[rl.QuaternionArray] = (
+            _su2(_so3_left),
+            _su2(_so3_right),
+            _su2(_so3_inverse_left),
+            _su2(_so3_inverse_right),
+        )
+        _JACOBIANS[rl.SE3Array] = (
+            _se3_left,
+            _se3_right,
+            _se3_inverse_left,
+            _se3_inverse_right,
+        )
+    info = rl.group_info(group)
+    for batch in info.batch.__mro__:
+        if batch in _JACOBIANS:
+            return info.dimension, _JACOBIANS[batch]
+    raise NotImplementedError(f"No Jacobians implemented for {info.group}")
+
+
+def _evaluate(group: Any, tangents: ArrayLike, which: int) -> np.ndarray:
+    dimension, jacobians = _jacobians(group)
+    if isinstance(tangents, rl.PureQuaternion):
+        tangents = tangents.vector
+    xi = np.asarray(tangents, dtype=np.float64).reshape(-1, dimension)
+    return jacobians[which](xi)
+
+
+def left_jacobian(group: Any, tangents: ArrayLike) -> np.ndarray:
+    """Returns the left Jacobians J_l with exp(xi + d) = exp(J_l d) exp(xi).
+
+    Args:
+        group: A registered group type, or an element of it.
+        tangents: Lie algebra elements, shape (N, k) or (k,).
+
+    Returns:
+        The Jacobians, shape (N, k, k).
+    """
+    return _evaluate(group, tangents, 0)
+
+
+def right_jacobian(group: Any, tangents: ArrayLike) -> np.ndarray:
+    """Returns the right Jacobians J_r with exp(xi + d) = exp(xi) exp(J_r d).
+
+    Args:
+        group: A registered group type, or an element of it.
+        tangents: Lie algebra elements, shape (N, k) or (k,).
+
+    Returns:
+        The Jacobians, shape (N, k, k).
+    """
+    return _evaluate(group, tangents, 1)
+
+
+def inverse_left_jacobian(group: Any, tangents: ArrayLike) -> np.ndarray:
+    """Returns the inverses of the left Jacobians, the derivatives of
+    log(exp(d) X) at d = 0, where X = exp(xi).
+
+    Args:
+        group: A registered group type, or an element of it.
+        tangents: Lie algebra elements, shape (N, k) or (k,).
+
+    Returns:
+        The inverse Jacobians, shape (N, k, k).
+    """
+    return _evaluate(group, tangents, 2)
+
+
+def inverse_right_jacobian(group: Any, tangents: ArrayLike) -> np.ndarray:
+    """Returns the inverses of the right Jacobians, the derivatives of
+    log(X exp(d)) at d = 0, where X = exp(xi).
+
+    Args:
+        group: A registered group type, or an element of it.
+        tangents: Lie algebra elements, shape (N, k) or (k,).
+
+    Returns:
+        The inverse Jacobians, shape (N, k, k).
+    """
+    return _evaluate(group, tangents, 3)
+
+
+def adjoint(elements: Any) -> np.ndarray:
+    """Returns the adjoint matrices Ad with X exp(xi) X^-1 = exp(Ad xi).
+
+    Args:
+        elements: A group element, a batch, or a sequence of elements.
+
+    Returns:
+        The matrices, shape (N, k, k).
+    """
+    if isinstance(elements, (list, tuple)):
+        elements = rl.group_info(elements[0]).stack(elements)
+    info = rl.group_info(elements)
+    matrices = np.asarray(elements.adjoint())
+    return matrices.reshape(-1, info.dimension, info.dimension)
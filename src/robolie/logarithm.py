@@ -5,8 +5,11 @@ import robolie as rl
 
 def log(x):
     """Returns the logarithm of x. Function changes
-    depending on the type of x."""
-    if isinstance(x, rl.Quaternion):
-        return x.log()
-    else:
-        raise NotImplementedError(f"Logarithm not implemented for {type(x)}")
+    depending on the type of x.
+
+    Any element of a registered group is mapped with its log method, the
+    lookup is done once per type, see robolie.group. Arrays of shape (..., 4)
+    are treated as batches of quaternions and are mapped to arrays of pure
+    quaternions of shape (..., 3).
+    """
+    return rl.group_log(type(x))(x)
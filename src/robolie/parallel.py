@@ -0,0 +1,90 @@
+"""Helpers for sharing numpy arrays with worker processes without pickling them.
+
+Workers receive a small descriptor (name, shape, dtype) and attach to the same
+block of shared memory as the parent process, so large inputs and outputs are
+neither copied nor serialized per worker.
+"""
+
+from __future__ import annotations
+
+from multiprocessing import shared_memory
+from typing import Any, Callable
+
+import numpy as np
+
+Descriptor = tuple[str, tuple[int, ...], str]
+
+
+class SharedArray:
+    """A numpy array living in a block of shared memory.
+
+    The parent process creates the array, passes descriptor to the workers,
+    which run functions on it through call_with_shared_array, and finally reads
+    the result back and closes the block. No views into the shared memory are
+    kept alive outside of these calls, so the block can always be released.
+
+    Attributes:
+        descriptor: The (name, shape, dtype) triple identifying the array.
+    """
+
+    def __init__(self, array: np.ndarray) -> None:
+        """Copies an array into a new block of shared memory.
+
+        Args:
+            array: The array to share.
+        """
+        array = np.ascontiguousarray(array)
+        self._memory = shared_memory.SharedMemory(
+            create=True, size=max(array.nbytes, 1)
+        )
+        self.descriptor: Descriptor = (self._memory.name, array.shape, array.dtype.str)
+        _view(self._memory.buf, self.descriptor)[...] = array
+
+    def read(self) -> np.ndarray:
+        """Returns a copy of the current contents of the shared array."""
+        return _view(self._memory.buf, self.descriptor).copy()
+
+    def close(self) -> None:
+        """Releases the block of shared memory."""
+        self._memory.close()
+        self._memory.unlink()
+
+    def __enter__(self) -> SharedArray:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def call_with_shared_array(
+    descriptor: Descriptor, function: Callable[..., Any], *args: Any
+) -> Any:
+    """Attaches to a shared array and calls function(array, *args) on it.
+
+    Meant to be submitted to a process pool. The function may modify the array
+    in place, but must not return views into it.
+
+    Args:
+        descriptor: The descriptor of a SharedArray.
+        function: A module level function taking the array as first argument.
+        args: Further arguments passed to the function.
+
+    Returns:
+        The return value of the function.
+    """
+    memory = shared_memory.SharedMemory(name=descriptor[0])
+    try:
+        return function(_view(memory.buf, descriptor), *args)
+    finally:
+        try:
+            memory.close()
+        except BufferError:
+            # A traceback still references the view, the mapping is released
+            # together with it.
+            pass
+
+
+def _view(buffer: Any, descriptor: Descriptor) -> np.ndarray:
+    """Returns an array viewing a shared memory buffer."""
+    _, shape, dtype = descriptor
+    return np.ndarray(shape, dtype=np.dtype(dtype), buffer=buffer)
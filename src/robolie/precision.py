@@ -0,0 +1,112 @@
+"""The floating point precision of the batched quaternion operations.
+
+Floating point arrays keep their precision through construction, products,
+rotation, exp/log and averaging, so float32 data stays float32 end to end
+and is never upcast. Only half precision is promoted to float32, which
+np.linalg needs for the averages. Data without a floating point type, such as Python
+lists or integer arrays, is converted to the default dtype, which is float64
+unless changed with set_default_dtype or temporarily with
+
+    with rl.default_dtype(np.float32):
+        ...
+
+Functions taking a dtype argument convert their inputs to it, which overrides
+both. Single Quaternion objects always compute in Python floats.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Union
+
+import numpy as np
+from numpy.typing import ArrayLike, DTypeLike
+
+_default = np.dtype(np.float64)
+
+
+def _floating(dtype: DTypeLike) -> np.dtype:
+    """Returns dtype as a numpy dtype, checking that it is floating point.
+
+    Half precision is promoted to float32, the lowest precision supported by
+    np.linalg.
+    """
+    resolved = np.dtype(dtype)
+    if not np.issubdtype(resolved, np.floating):
+        raise ValueError(f"Expected a floating point dtype, got {resolved}.")
+    return np.promote_types(resolved, np.float32)
+
+
+def get_default_dtype() -> np.dtype:
+    """Returns the dtype that data without a floating point type converts to."""
+    return _default
+
+
+def set_default_dtype(dtype: DTypeLike) -> None:
+    """Sets the dtype that data without a floating point type converts to.
+
+    Args:
+        dtype: A floating point dtype, such as np.float32.
+    """
+    global _default
+    _default = _floating(dtype)
+
+
+@contextmanager
+def default_dtype(dtype: DTypeLike) -> Iterator[np.dtype]:
+    """Context manager setting the default dtype, restoring it on exit."""
+    previous = _default
+    set_default_dtype(dtype)
+    try:
+        yield _default
+    finally:
+        set_default_dtype(previous)
+
+
+def as_float_array(data: Any, dtype: Optional[DTypeLike] = None) -> np.ndarray:
+    """Returns data as a floating point array following the dtype policy.
+
+    Args:
+        data: The data. Floating point arrays are returned without copying,
+            and numpy floating point scalars keep their precision as well.
+        dtype: Optional dtype overriding the policy.
+
+    Returns:
+        The array, in dtype if given, else in the dtype of data if it is a
+        floating point array, else in the default dtype. Half precision is
+        promoted to float32.
+    """
+    if dtype is not None:
+        return np.asarray(data, dtype=_floating(dtype))
+    if isinstance(data, (np.ndarray, np.floating)) and np.issubdtype(
+        data.dtype, np.floating
+    ):
+        return np.asarray(data, dtype=_floating(data.dtype))
+    return np.asarray(data, dtype=_default)
+
+
+def tolerances(dtype: Optional[DTypeLike] = None) -> tuple[float, float]:
+    """Returns the relative and absolute tolerance of comparisons in a dtype.
+
+    These are the defaults of np.isclose, widened to 100 and 10 machine
+    epsilons where that is coarser, as for float32.
+    """
+    eps = float(np.finfo(_default if dtype is None else _floating(dtype)).eps)
+    return max(1e-5, 100 * eps), max(1e-8, 10 * eps)
+
+
+def isclose(
+    a: ArrayLike, b: ArrayLike, dtype: Optional[DTypeLike] = None
+) -> Union[bool, np.ndarray]:
+    """Compares values with np.isclose, using the tolerances of a dtype.
+
+    Args:
+        a: The values to compare.
+        b: The values to compare with.
+        dtype: The dtype whose tolerances are used, by default the dtype a
+            has under the policy.
+    """
+    if dtype is None:
+        dtype = as_float_array(a).dtype
+    rtol, atol = tolerances(dtype)
+    return np.isclose(a, b, rtol=rtol, atol=atol)
@@ -0,0 +1,366 @@
+"""Module for averaging large sets of 3D rotations given as unit quaternions."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import ArrayLike, DTypeLike
+
+import robolie as rl
+from robolie.backend import kernel
+from robolie.parallel import SharedArray, call_with_shared_array
+from robolie.precision import _floating, as_float_array, get_default_dtype
+from robolie.quaternions.quaternion_array import _components
+
+
+def _prepare(
+    quaternions: Union[rl.QuaternionArray, ArrayLike],
+    weights: Optional[ArrayLike],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the (N, 4) quaternion array and normalized (N,) weights."""
+    if isinstance(quaternions, rl.QuaternionArray):
+        quaternions = quaternions.full
+    q = as_float_array(quaternions).reshape(-1, 4)
+    if len(q) == 0:
+        raise ValueError("Cannot average an empty set of rotations.")
+    if weights is None:
+        w = np.full(len(q), 1 / len(q), dtype=q.dtype)
+    else:
+        w = np.asarray(weights, dtype=q.dtype).reshape(-1)
+        if w.shape[0] != q.shape[0]:
+            raise ValueError("Expected one weight per quaternion.")
+        w = w / w.sum()
+    return q, w
+
+
+def markley_mean(
+    quaternions: Union[rl.QuaternionArray, ArrayLike],
+    weights: Optional[ArrayLike] = None,
+) -> rl.Quaternion:
+    """Computes the average rotation as the dominant eigenvector of a 4x4 matrix.
+
+    The method by Markley et al. (2007) maximizes the weighted sum of squared
+    inner products with the input quaternions, which makes it insensitive to
+    the sign ambiguity between q and -q.
+
+    Args:
+        quaternions: A batch of unit quaternions or an array of shape (N, 4).
+        weights: Optional non-negative weights, shape (N,).
+
+    Returns:
+        The average rotation as a unit quaternion with non-negative real part.
+    """
+    q, w = _prepare(quaternions, weights)
+    compiled = kernel("mean")
+    if compiled is not None:
+        matrix = compiled(q, w, np.empty((4, 4), dtype=q.dtype))
+    else:
+        matrix = (q * w[:, np.newaxis]).T @ q
+    return rl.Quaternion(*_dominant_eigenvector(matrix))
+
+
+def karcher_mean(
+    quaternions: Union[rl.QuaternionArray, ArrayLike],
+    weights: Optional[ArrayLike] = None,
+    tolerance: float = 1e-12,
+    max_iterations: int = 100,
+) -> rl.Quaternion:
+    """Computes the Karcher (Frechet) mean of a set of rotations.
+
+    Starting from the eigenvector mean, the tangent space is re-centred at the
+    current estimate in every iteration: all rotations are mapped to the lie
+    algebra relative to the estimate, averaged there, and the average is mapped
+    back with the exponential map.
+
+    Args:
+        quaternions: A batch of unit quaternions or an array of shape (N, 4).
+        weights: Optional non-negative weights, shape (N,).
+        tolerance: The iteration stops once the update is smaller than this,
+            or than ten machine epsilons of the dtype of the quaternions.
+        max_iterations: The maximal number of iterations.
+
+    Returns:
+        The average rotation as a unit quaternion with non-negative real part.
+    """
+    q, w = _prepare(quaternions, weights)
+    tolerance = max(tolerance, 10 * float(np.finfo(q.dtype).eps))
+    mean = markley_mean(q, w).full.astype(q.dtype)
+    for _ in range(max_iterations):
+        conjugate = mean * np.array([1, -1, -1, -1], dtype=q.dtype)
+        relative = rl.hamilton_product(conjugate, q)
+        # q and -q represent the same rotation, use the one closest to the mean.
+        relative *= np.where(relative[:, :1] < 0, -1, 1).astype(q.dtype)
+        step = w @ rl.quaternion_log(relative)
+        mean = rl.hamilton_product(mean, rl.quaternion_exp(step))
+        mean /= np.linalg.norm(mean)
+        if np.linalg.norm(step) < tolerance:
+            break
+    if mean[0] < 0:
+        mean = -mean
+    return rl.Quaternion(*mean)
+
+
+def grouped_average(
+    quaternions: Union[rl.QuaternionArray, ArrayLike],
+    group_ids: ArrayLike,
+    weights: Optional[ArrayLike] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 262144,
+) -> tuple[np.ndarray, rl.QuaternionArray]:
+    """Computes the markley_mean of every group of rotations at once.
+
+    The samples are sorted by group, the upper triangles of the weighted 4x4
+    outer products are summed per group with one np.add.reduceat, and the
+    dominant eigenvectors of all group matrices are found in one batched
+    eigendecomposition. The groups are processed in chunks of about chunk_size
+    samples, which bounds the memory used for temporaries, and the chunks can
+    be distributed over worker processes sharing the sorted samples in memory.
+
+    Args:
+        quaternions: A batch of unit quaternions or an array of shape (N, 4).
+        group_ids: The integer group of every quaternion, shape (N,).
+        weights: Optional non-negative weights, shape (N,).
+        workers: If given, the chunks are averaged in this many processes.
+        chunk_size: The approximate number of samples averaged per chunk.
+
+    Returns:
+        The sorted unique group ids, shape (G,), and the average rotation of
+        every group as unit quaternions with non-negative real part.
+    """
+    if isinstance(quaternions, rl.QuaternionArray):
+        quaternions = quaternions.full
+    q = as_float_array(quaternions).reshape(-1, 4)
+    ids = np.asarray(group_ids).reshape(-1)
+    if ids.shape[0] != q.shape[0]:
+        raise ValueError("Expected one group id per quaternion.")
+    if weights is not None:
+        weights = np.asarray(weights).reshape(-1)
+        if weights.shape[0] != q.shape[0]:
+            raise ValueError("Expected one weight per quaternion.")
+    if len(q) == 0:
+        return ids, rl.QuaternionArray(np.empty((0, 4), dtype=q.dtype))
+
+    # Samples and weights are packed into one array, sorted by group.
+    samples = np.empty((len(q), 5), dtype=q.dtype)
+    if np.all(ids[1:] >= ids[:-1]):
+        samples[:, :4] = q
+    else:
+        order = np.argsort(ids)
+        ids = ids[order]
+        np.take(q, order, axis=0, out=samples[:, :4])
+        if weights is not None:
+            weights = weights[order]
+    samples[:, 4] = 1 if weights is None else weights
+
+    starts = np.flatnonzero(np.concatenate([[True], ids[1:] != ids[:-1]]))
+    # Chunks of whole groups with about chunk_size samples each.
+    cuts = np.unique(np.searchsorted(starts, np.arange(0, len(q), chunk_size)))
+    # Boundaries inside the last group would give an empty chunk.
+    chunks = np.split(starts, cuts[(cuts > 0) & (cuts < len(starts))])
+    stops = [int(c[0]) for c in chunks[1:]] + [len(q)]
+
+    if workers is None or workers <= 1 or len(chunks) == 1:
+        means = [
+            _group_means(samples, chunk, stop) for chunk, stop in zip(chunks, stops)
+        ]
+    else:
+        with SharedArray(samples) as shared, ProcessPoolExecutor(workers) as pool:
+            means = list(
+                pool.map(
+                    call_with_shared_array,
+                    [shared.descriptor] * len(chunks),
+                    [_group_means] * len(chunks),
+                    chunks,
+                    stops,
+                )
+            )
+    return ids[starts], rl.QuaternionArray(np.concatenate(means))
+
+
+def _group_means(samples: np.ndarray, starts: np.ndarray, stop: int) -> np.ndarray:
+    """Returns the markley_mean of consecutive groups of sorted samples.
+
+    Args:
+        samples: The quaternions and weights sorted by group, shape (N, 5).
+        starts: The indices of the first samples of the groups, shape (G,).
+        stop: The index after the last sample of the last group.
+
+    Returns:
+        The mean of every group, shape (G, 4).
+    """
+    block = samples[starts[0] : stop]
+    q = block[:, :4]
+    rows, columns = np.triu_indices(4)
+    products = q[:, rows] * q[:, columns]
+    products *= block[:, 4:]
+    sums = np.add.reduceat(products, starts - starts[0], axis=0)
+    matrix = np.empty((len(starts), 4, 4), dtype=samples.dtype)
+    matrix[:, rows, columns] = sums
+    matrix[:, columns, rows] = sums
+    return _dominant_eigenvector(matrix)
+
+
+def _dominant_eigenvector(matrix: np.ndarray) -> np.ndarray:
+    """Returns the eigenvectors of the largest eigenvalues of symmetric matrices.
+
+    Args:
+        matrix: Symmetric matrices, shape (..., 4, 4).
+
+    Returns:
+        The eigenvectors with non-negative first component, shape (..., 4).
+    """
+    _, vectors = np.linalg.eigh(matrix)
+    vector = vectors[..., -1]
+    return np.where(vector[..., :1] < 0, -vector, vector)
+
+
+class RotationAverager:
+    """Streaming average of rotations given as unit quaternions.
+
+    The averager keeps the weighted 4x4 outer-product matrix of the samples seen
+    so far, as used by markley_mean, so each update and each evaluation costs
+    O(1) per sample regardless of the length of the stream. Three modes are
+    supported:
+
+    - "cumulative": all samples since the last reset are averaged.
+    - "window": only the last `window` samples are averaged. The samples are
+      kept in a ring buffer so they can be removed once they leave the window.
+    - "exponential": older samples are forgotten by multiplying the matrix with
+      `decay` for every new sample.
+
+    Attributes:
+        mode: The averaging mode.
+        window: The number of samples averaged in "window" mode.
+        decay: The forgetting factor in "exponential" mode.
+        count: The number of samples currently contributing to the average.
+        dtype: The floating point type of the accumulated matrix and buffers.
+    """
+
+    def __init__(
+        self,
+        mode: str = "cumulative",
+        window: Optional[int] = None,
+        decay: Optional[float] = None,
+        dtype: Optional[DTypeLike] = None,
+    ) -> None:
+        """Initializes an empty averager.
+
+        Args:
+            mode: One of "cumulative", "window" and "exponential".
+            window: The window size, required for "window" mode.
+            decay: The forgetting factor in (0, 1), required for "exponential"
+                mode.
+            dtype: Optional dtype to accumulate in. By default an empty
+                averager takes the dtype of its first samples, following
+                robolie.precision, and converts later samples to it.
+        """
+        if mode not in ("cumulative", "window", "exponential"):
+            raise ValueError(f"Unknown averaging mode {mode}.")
+        if mode == "window" and (window is None or window < 1):
+            raise ValueError("A positive window size is required in window mode.")
+        if mode == "exponential" and (decay is None or not 0 < decay < 1):
+            raise ValueError("A decay in (0, 1) is required in exponential mode.")
+        self.mode = mode
+        self.window = window
+        self.decay = decay
+        self._requested_dtype = None if dtype is None else _floating(dtype)
+        self.reset()
+
+    def reset(self) -> None:
+        """Removes all samples from the averager."""
+        self._allocate(self._requested_dtype or get_default_dtype())
+        self.count = 0
+        if self.mode == "window":
+            self._head = 0
+            self._updates_since_refresh = 0
+
+    def _allocate(self, dtype: np.dtype) -> None:
+        """Allocates the zeroed matrix and ring buffer in a dtype."""
+        self.dtype = dtype
+        self._matrix = np.zeros((4, 4), dtype=dtype)
+        if self.mode == "window":
+            assert self.window is not None
+            self._buffer = np.zeros((self.window, 4), dtype=dtype)
+            self._buffer_weights = np.zeros(self.window, dtype=dtype)
+
+    def update(
+        self,
+        quaternions: Union[rl.Quaternion, rl.QuaternionArray, ArrayLike],
+        weights: Optional[ArrayLike] = None,
+    ) -> None:
+        """Adds a single rotation or a batch of rotations to the average.
+
+        Args:
+            quaternions: A quaternion, a batch of quaternions or an array of
+                shape (N, 4) or (4,). Batches are ordered from old to new.
+            weights: Optional non-negative weights, shape (N,).
+        """
+        q = _components(quaternions).reshape(-1, 4)
+        if self.count == 0 and self._requested_dtype is None:
+            self._allocate(q.dtype)
+        q = q.astype(self.dtype, copy=False)
+        if weights is None:
+            w = np.ones(len(q), dtype=self.dtype)
+        else:
+            w = np.asarray(weights, dtype=self.dtype).reshape(-1)
+            if w.shape[0] != q.shape[0]:
+                raise ValueError("Expected one weight per quaternion.")
+
+        if self.mode == "cumulative":
+            self._matrix += (q * w[:, np.newaxis]).T @ q
+            self.count += len(q)
+        elif self.mode == "exponential":
+            assert self.decay is not None
+            # The i-th of n new samples has decayed n - 1 - i times at the end.
+            factors = w * self.decay ** np.arange(len(q) - 1, -1, -1, dtype=self.dtype)
+            self._matrix *= self.decay ** len(q)
+            self._matrix += (q * factors[:, np.newaxis]).T @ q
+            self.count += len(q)
+        else:
+            self._update_window(q, w)
+
+    def _update_window(self, q: np.ndarray, w: np.ndarray) -> None:
+        """Pushes samples into the ring buffer and updates the matrix."""
+        assert self.window is not None
+        if len(q) >= self.window:
+            q, w = q[-self.window :], w[-self.window :]
+            self._buffer[:] = q
+            self._buffer_weights[:] = w
+            self._head = 0
+            self.count = self.window
+            self._refresh()
+            return
+
+        slots = (self._head + np.arange(len(q))) % self.window
+        old_q = self._buffer[slots]
+        old_w = self._buffer_weights[slots]
+        self._matrix -= (old_q * old_w[:, np.newaxis]).T @ old_q
+        self._matrix += (q * w[:, np.newaxis]).T @ q
+        self._buffer[slots] = q
+        self._buffer_weights[slots] = w
+        self._head = (self._head + len(q)) % self.window
+        self.count = min(self.count + len(q), self.window)
+
+        # Subtracting evicted samples accumulates rounding errors, so the matrix
+        # is recomputed from the buffer once per window, O(1) per sample.
+        self._updates_since_refresh += len(q)
+        if self._updates_since_refresh >= self.window:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        """Recomputes the matrix from the samples in the ring buffer."""
+        q, w = self._buffer, self._buffer_weights
+        self._matrix = (q * w[:, np.newaxis]).T @ q
+        self._updates_since_refresh = 0
+
+    def value(self) -> rl.Quaternion:
+        """Returns the current average rotation.
+
+        Returns:
+            The average rotation as a unit quaternion with non-negative real part.
+        """
+        if self.count == 0:
+            raise ValueError("Cannot average an empty set of rotations.")
+        return rl.Quaternion(*_dominant_eigenvector(self._matrix))
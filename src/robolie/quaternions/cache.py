@@ -0,0 +1,162 @@
+"""Memoization of rotations that are applied repeatedly."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import robolie as rl
+
+
+class CachedRotation(NamedTuple):
+    """A rotation with its precomputed representations.
+
+    Attributes:
+        quaternion: The unit quaternion of the rotation, a copy owned by the
+            caller.
+        matrix: The read-only 3x3 rotation matrix, shared with the cache.
+    """
+
+    quaternion: rl.Quaternion
+    matrix: np.ndarray
+
+
+class RotationCache:
+    """Bounded cache of rotations given by an angle and axis or a quaternion.
+
+    Looking up a rotation that was seen before skips the construction and
+    validation of the quaternion and the computation of its matrix. Angles,
+    axes and quaternion components are rounded to multiples of the resolution
+    to form the keys, so values that differ by rounding errors only share an
+    entry. Once the cache holds maxsize entries, the least recently used one
+    is evicted.
+
+    Attributes:
+        maxsize: The maximal number of cached rotations.
+        resolution: The quantization step of the keys.
+        hits: The number of lookups that found a cached rotation.
+        misses: The number of lookups that computed a new rotation.
+    """
+
+    def __init__(self, maxsize: int = 128, resolution: float = 1e-12) -> None:
+        """Initializes an empty cache.
+
+        Args:
+            maxsize: The maximal number of cached rotations.
+            resolution: The quantization step of angles, axes and quaternion
+                components in the keys.
+        """
+        if maxsize < 1:
+            raise ValueError("The cache must hold at least one rotation.")
+        self.maxsize = maxsize
+        self.resolution = resolution
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, CachedRotation] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Returns the number of cached rotations."""
+        return len(self._entries)
+
+    def get(
+        self,
+        theta: Optional[float] = None,
+        axis: Optional[ArrayLike] = None,
+        quaternion: Optional[Union[rl.Quaternion, ArrayLike]] = None,
+    ) -> CachedRotation:
+        """Returns the cached rotation, computing it on a miss.
+
+        Args:
+            theta: The angle of rotation in radians.
+            axis: The axis of rotation as a unit 3D vector.
+            quaternion: The unit quaternion of the rotation, instead of an
+                angle and an axis.
+
+        Returns:
+            The rotation with its quaternion and matrix. The quaternion is a
+            copy, so changing it does not change the cached rotation.
+        """
+        q, matrix = self._entry(theta, axis, quaternion)
+        return CachedRotation(
+            rl.Quaternion._from_floats(q._w, q._x, q._y, q._z), matrix
+        )
+
+    def matrix(
+        self,
+        theta: Optional[float] = None,
+        axis: Optional[ArrayLike] = None,
+        quaternion: Optional[Union[rl.Quaternion, ArrayLike]] = None,
+    ) -> np.ndarray:
+        """Returns the read-only matrix of the cached rotation, see get."""
+        return self._entry(theta, axis, quaternion).matrix
+
+    def _entry(
+        self,
+        theta: Optional[float],
+        axis: Optional[ArrayLike],
+        quaternion: Optional[Union[rl.Quaternion, ArrayLike]],
+    ) -> CachedRotation:
+        """Returns the stored entry of a rotation, computing it on a miss."""
+        if quaternion is not None:
+            components = _components(quaternion)
+            key: tuple = ("quaternion",) + self._quantize(components)
+        else:
+            assert (
+                theta is not None and axis is not None
+            ), "Either a quaternion or an angle and an axis must be provided."
+            components = _components(axis)
+            angle = float(theta)
+            key = self._quantize((angle,) + components)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        if quaternion is not None:
+            q = rl.Quaternion(*components)
+            assert rl.isclose(q.norm(), 1), "Quaternion must be normalized."
+        else:
+            assert rl.isclose(
+                np.linalg.norm(components), 1
+            ), "The axis must be a unit vector."
+            q = rl.Quaternion.from_angle_and_axis(angle / 2, np.array(components))
+        matrix = rl.quaternion_to_rotation_matrix(q)
+        matrix.flags.writeable = False
+        entry = CachedRotation(q, matrix)
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        """Removes all rotations and resets the statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the hits, misses, hit rate, size and maximal size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def _quantize(self, values: tuple[float, ...]) -> tuple[int, ...]:
+        return tuple(round(v / self.resolution) for v in values)
+
+
+def _components(values: Union[rl.Quaternion, ArrayLike]) -> tuple[float, ...]:
+    """Returns the components of a quaternion or vector as Python floats."""
+    if isinstance(values, rl.Quaternion):
+        return tuple(values.full.tolist())
+    return tuple(np.asarray(values, dtype=np.float64).ravel().tolist())
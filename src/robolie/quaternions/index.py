@@ -0,0 +1,254 @@
+"""Spatial index of rotations for nearest orientation queries."""
+
+from __future__ import annotations
+
+from typing import Any, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+from scipy.spatial import cKDTree
+
+import robolie as rl
+
+# The maximal number of query-sample pairs compared at once in the buffer.
+_BUFFER_CHUNK = 1 << 22
+
+
+def _as_quaternions(
+    quaternions: Union[rl.Quaternion, rl.QuaternionArray, ArrayLike],
+) -> np.ndarray:
+    """Returns quaternions as a normalized (N, 4) float64 array."""
+    if isinstance(quaternions, rl.Quaternion):
+        quaternions = quaternions.full
+    elif isinstance(quaternions, rl.QuaternionArray):
+        quaternions = quaternions.full
+    q = np.array(quaternions, dtype=np.float64).reshape(-1, 4)
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    return q
+
+
+def _canonicalize(q: np.ndarray) -> np.ndarray:
+    """Flips quaternions in place onto the hemisphere of non-negative real part."""
+    q[q[:, 0] < 0] *= -1
+    return q
+
+
+def _is_single(queries: Any) -> bool:
+    """Returns whether queries is a single rotation rather than a batch."""
+    if isinstance(queries, rl.Quaternion):
+        return True
+    if isinstance(queries, rl.QuaternionArray):
+        return False
+    return np.ndim(queries) == 1
+
+
+def _angles(chords: np.ndarray) -> np.ndarray:
+    """Converts distances between unit quaternions to rotation angles.
+
+    Unit quaternions at distance c have the inner product 1 - c^2 / 2, so the
+    rotation between them has the angle 2 arccos(1 - c^2 / 2) = 4 arcsin(c / 2).
+    """
+    return 4 * np.arcsin(np.minimum(chords / 2, 1))
+
+
+class OrientationIndex:
+    """Index of rotations answering nearest neighbour and radius queries.
+
+    The distance of two rotations is the angle of the rotation between them,
+    2 arccos(|p . q|), so q and -q are the same rotation. The quaternions are
+    flipped onto the hemisphere of non-negative real part and stored in a
+    KD-tree, where the distance |p - q| increases with the angle as long as p
+    and q lie on the same side. A query close to the boundary of the hemisphere
+    may be closer to the other side, so queries whose search distance reaches
+    q_w are also done with -q and the results are merged; all others are only
+    searched with q.
+
+    Inserted rotations are collected in a buffer, which is searched by brute
+    force, and merged into the tree once it exceeds a fraction of the size of
+    the tree. Entries are numbered in the order they were added.
+
+    Attributes:
+        leafsize: The leaf size of the KD-tree.
+        rebuild_fraction: The tree is rebuilt once the buffer holds more than
+            this fraction of the entries of the tree.
+    """
+
+    def __init__(
+        self,
+        quaternions: Union[rl.QuaternionArray, ArrayLike],
+        leafsize: int = 16,
+        rebuild_fraction: float = 0.1,
+    ) -> None:
+        """Builds an index of rotations.
+
+        Args:
+            quaternions: The rotations as unit quaternions, a batch or an array
+                of shape (N, 4).
+            leafsize: The leaf size of the KD-tree.
+            rebuild_fraction: The relative size of the buffer of inserted
+                rotations at which the tree is rebuilt.
+        """
+        self.leafsize = leafsize
+        self.rebuild_fraction = rebuild_fraction
+        self._data = _canonicalize(_as_quaternions(quaternions))
+        self._tree = cKDTree(self._data, leafsize=leafsize, balanced_tree=False)
+        self._buffered = np.empty((0, 4))
+
+    def __len__(self) -> int:
+        """Returns the number of rotations in the index."""
+        return len(self._data) + len(self._buffered)
+
+    @property
+    def quaternions(self) -> np.ndarray:
+        """Returns all entries as unit quaternions with non-negative real part."""
+        return np.concatenate([self._data, self._buffered])
+
+    def insert(self, quaternions: Union[rl.QuaternionArray, ArrayLike]) -> np.ndarray:
+        """Adds rotations to the index.
+
+        Args:
+            quaternions: The rotations as unit quaternions, shape (N, 4) or (4,).
+
+        Returns:
+            The indices of the new entries, shape (N,).
+        """
+        q = _canonicalize(_as_quaternions(quaternions))
+        start = len(self)
+        self._buffered = np.concatenate([self._buffered, q])
+        if len(self._buffered) > self.rebuild_fraction * len(self._data):
+            self.rebuild()
+        return np.arange(start, start + len(q))
+
+    def rebuild(self) -> None:
+        """Merges the inserted rotations into the tree."""
+        if len(self._buffered):
+            self._data = np.concatenate([self._data, self._buffered])
+            self._buffered = np.empty((0, 4))
+        self._tree = cKDTree(self._data, leafsize=self.leafsize, balanced_tree=False)
+
+    def nearest(
+        self,
+        queries: Union[rl.Quaternion, rl.QuaternionArray, ArrayLike],
+        k: int = 1,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Finds the k nearest rotations of every query.
+
+        Args:
+            queries: The query rotations as unit quaternions, shape (M, 4), or
+                a single rotation.
+            k: The number of neighbours. At most len(self) are returned.
+
+        Returns:
+            The angles to the neighbours in increasing order and the indices of
+            the neighbours, both of shape (M, k), or (k,) for a single query.
+        """
+        q = _canonicalize(_as_quaternions(queries))
+        k = min(k, len(self))
+        n = len(self._data)
+        candidates = []
+        if n:
+            chords, indices = self._tree.query(q, k=min(k, n))
+            chords, indices = chords.reshape(len(q), -1), indices.reshape(len(q), -1)
+            candidates.append(indices)
+            near = self._near_boundary(q, chords[:, -1])
+            if near.any():
+                _, flipped = self._tree.query(
+                    -q[near], k=min(k, n), distance_upper_bound=chords[near, -1].max()
+                )
+                # Missing neighbours are marked with n, replace them by duplicates.
+                flipped = flipped.reshape(len(flipped), -1)
+                other = np.repeat(indices[:, :1], flipped.shape[1], axis=1)
+                other[near] = np.where(flipped < n, flipped, indices[near, :1])
+                candidates.append(other)
+        if len(self._buffered):
+            candidates.append(n + self._buffer_nearest(q, k))
+        indices = np.concatenate(candidates, axis=1)
+
+        # The same entry may be found repeatedly, with equal distances.
+        chords = self._chords(q, indices)
+        order = np.lexsort((indices, chords), axis=1)
+        indices = np.take_along_axis(indices, order, axis=1)
+        chords = np.take_along_axis(chords, order, axis=1)
+        duplicate = np.zeros(indices.shape, dtype=bool)
+        duplicate[:, 1:] = indices[:, 1:] == indices[:, :-1]
+        chords[duplicate] = np.inf
+        order = np.argsort(chords, axis=1, kind="stable")[:, :k]
+        indices = np.take_along_axis(indices, order, axis=1)
+        angles = _angles(np.take_along_axis(chords, order, axis=1))
+        if _is_single(queries):
+            return angles[0], indices[0]
+        return angles, indices
+
+    def within(
+        self,
+        queries: Union[rl.Quaternion, rl.QuaternionArray, ArrayLike],
+        angle: float,
+    ) -> Union[np.ndarray, list[np.ndarray]]:
+        """Finds all rotations within an angle of every query.
+
+        Args:
+            queries: The query rotations as unit quaternions, shape (M, 4), or
+                a single rotation.
+            angle: The maximal angle of the rotation to a neighbour.
+
+        Returns:
+            For every query the indices of its neighbours, in order of
+            increasing angle, as a list of M arrays, or a single array for a
+            single query.
+        """
+        q = _canonicalize(_as_quaternions(queries))
+        radius = 2 * np.sin(min(angle, np.pi) / 4)
+        found: list = [[] for _ in range(len(q))]
+        if len(self._data):
+            found = self._tree.query_ball_point(q, radius)
+            near = np.flatnonzero(self._near_boundary(q, radius))
+            if len(near):
+                flipped = self._tree.query_ball_point(-q[near], radius)
+                for j, indices in zip(near, flipped):
+                    found[j] = found[j] + indices
+        threshold = np.cos(min(angle, np.pi) / 2)
+        results = []
+        for i in range(len(q)):
+            parts = [np.asarray(found[i], dtype=np.intp)]
+            if len(self._buffered):
+                dots = np.abs(self._buffered @ q[i])
+                parts.append(len(self._data) + np.flatnonzero(dots >= threshold))
+            indices = np.unique(np.concatenate(parts))
+            chords = self._chords(q[i : i + 1], indices[np.newaxis])[0]
+            results.append(indices[np.argsort(chords, kind="stable")])
+        if _is_single(queries):
+            return results[0]
+        return results
+
+    @staticmethod
+    def _near_boundary(q: np.ndarray, distances: ArrayLike) -> np.ndarray:
+        """Returns which queries may have entries closer to -q within a distance.
+
+        An entry p is closer to -q than to q if |p + q| < |p - q|, and as both
+        have non-negative real parts, |p + q| >= q_w. Queries far from the
+        boundary of the hemisphere are therefore only searched with q.
+        """
+        return np.asarray(distances) >= q[:, 0]
+
+    def _buffer_nearest(self, q: np.ndarray, k: int) -> np.ndarray:
+        """Returns the indices into the buffer of candidate neighbours, (M, k)."""
+        k = min(k, len(self._buffered))
+        chunk = max(1, _BUFFER_CHUNK // len(self._buffered))
+        indices = np.empty((len(q), k), dtype=np.intp)
+        for start in range(0, len(q), chunk):
+            dots = np.abs(q[start : start + chunk] @ self._buffered.T)
+            indices[start : start + chunk] = np.argpartition(-dots, k - 1, axis=1)[
+                :, :k
+            ]
+        return indices
+
+    def _chords(self, q: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        """Returns the distances min |p - q|, |p + q| of queries to entries."""
+        n = len(self._data)
+        in_tree = indices < n
+        entries = np.empty(indices.shape + (4,))
+        entries[in_tree] = self._data[indices[in_tree]]
+        entries[~in_tree] = self._buffered[indices[~in_tree] - n]
+        difference = np.linalg.norm(entries - q[:, np.newaxis], axis=-1)
+        total = np.linalg.norm(entries + q[:, np.newaxis], axis=-1)
+        return np.minimum(difference, total)
@@ -0,0 +1,137 @@
+"""Module for integrating angular velocities to orientations."""
+
+from __future__ import annotations
+
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import robolie as rl
+
+
+class AngularVelocityIntegrator:
+    """Integrates a stream of body-frame angular velocities to orientations.
+
+    Every sample omega_i is held over its time step dt_i, which gives the
+    increment exp(omega_i dt_i / 2) as a unit quaternion. The orientations are
+    the running products q_i = q_{i-1} exp(omega_i dt_i / 2), computed for a
+    whole chunk at once with cumulative_product. The last orientation and
+    timestamp are carried over to the next chunk, so a log of any length can
+    be streamed through in chunks of bounded size.
+
+    Attributes:
+        orientation: The orientation after the last integrated sample, shape (4,).
+        dt: The fixed time step, if no timestamps are given.
+        last_timestamp: The timestamp of the last integrated sample.
+    """
+
+    def __init__(
+        self,
+        initial: Optional[Union[rl.Quaternion, ArrayLike]] = None,
+        dt: Optional[float] = None,
+    ) -> None:
+        """Initializes the integrator.
+
+        Args:
+            initial: The orientation before the first sample, by default the
+                identity.
+            dt: A fixed time step between samples. May be omitted if
+                timestamps are passed to update.
+        """
+        if initial is None:
+            initial = np.array([1.0, 0.0, 0.0, 0.0])
+        elif isinstance(initial, rl.Quaternion):
+            initial = initial.full
+        self.orientation = np.array(initial, dtype=np.float64)
+        self.dt = dt
+        self.last_timestamp: Optional[float] = None
+
+    def update(
+        self,
+        angular_velocities: ArrayLike,
+        timestamps: Optional[ArrayLike] = None,
+    ) -> np.ndarray:
+        """Integrates a chunk of samples.
+
+        Args:
+            angular_velocities: Angular velocities in rad/s, shape (N, 3).
+            timestamps: The sample times, shape (N,). The first sample ever
+                passed in defines the start time, i.e. it has a zero time
+                step. If omitted, the fixed time step is used.
+
+        Returns:
+            The orientations after each sample, shape (N, 4). An empty chunk
+            gives an empty array and leaves the state unchanged.
+
+        Raises:
+            ValueError: If neither timestamps nor a fixed time step are given,
+                or if the number of timestamps differs from the number of
+                samples.
+        """
+        omega = np.asarray(angular_velocities, dtype=np.float64).reshape(-1, 3)
+        if timestamps is None and self.dt is None:
+            raise ValueError("Either timestamps or a fixed time step are required.")
+        t = _timestamps(timestamps, len(omega))
+        if len(omega) == 0:
+            return np.empty((0, 4))
+        if t is not None:
+            previous = t[0] if self.last_timestamp is None else self.last_timestamp
+            dt = np.diff(t, prepend=previous)
+            self.last_timestamp = float(t[-1])
+        else:
+            dt = np.full(len(omega), self.dt)
+
+        increments = rl.quaternion_exp(omega * (dt / 2)[:, np.newaxis])
+        increments[0] = rl.hamilton_product(self.orientation, increments[0])
+        orientations = rl.cumulative_product(increments)
+        self.orientation = orientations[-1] / np.linalg.norm(orientations[-1])
+        return orientations
+
+
+def integrate_angular_velocity(
+    angular_velocities: ArrayLike,
+    dt: Optional[float] = None,
+    timestamps: Optional[ArrayLike] = None,
+    initial: Optional[Union[rl.Quaternion, ArrayLike]] = None,
+    chunk_size: int = 65536,
+) -> np.ndarray:
+    """Integrates body-frame angular velocities to orientations.
+
+    See AngularVelocityIntegrator, which this function runs over the input in
+    chunks of chunk_size samples, so temporaries stay bounded in size.
+
+    Args:
+        angular_velocities: Angular velocities in rad/s, shape (N, 3).
+        dt: A fixed time step between samples.
+        timestamps: The sample times, shape (N,), instead of a fixed time step.
+        initial: The orientation before the first sample, by default the
+            identity.
+        chunk_size: The number of samples integrated at once.
+
+    Returns:
+        The orientations after each sample, shape (N, 4).
+
+    Raises:
+        ValueError: If the number of timestamps differs from the number of
+            samples.
+    """
+    omega = np.asarray(angular_velocities, dtype=np.float64).reshape(-1, 3)
+    t = _timestamps(timestamps, len(omega))
+    integrator = AngularVelocityIntegrator(initial, dt)
+    out = np.empty((len(omega), 4))
+    for start in range(0, len(omega), chunk_size):
+        stop = start + chunk_size
+        chunk_times = None if t is None else t[start:stop]
+        out[start:stop] = integrator.update(omega[start:stop], chunk_times)
+    return out
+
+
+def _timestamps(timestamps: Optional[ArrayLike], n: int) -> Optional[np.ndarray]:
+    """Returns the timestamps as an (n,) array, checking there is one per sample."""
+    if timestamps is None:
+        return None
+    t = np.asarray(timestamps, dtype=np.float64).reshape(-1)
+    if len(t) != n:
+        raise ValueError(f"Expected {n} timestamps, one per sample, got {len(t)}.")
+    return t
@@ -0,0 +1,135 @@
+"""Module for interpolating between unit quaternions."""
+
+from __future__ import annotations
+
+from typing import Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import robolie as rl
+from robolie.quaternions.quaternion_array import _components
+
+
+def slerp(
+    q0: Union[rl.Quaternion, rl.QuaternionArray, ArrayLike],
+    q1: Union[rl.Quaternion, rl.QuaternionArray, ArrayLike],
+    t: ArrayLike,
+    shortest_path: bool = True,
+) -> np.ndarray:
+    """Spherical linear interpolation between unit quaternions.
+
+    The end points and the interpolation parameters are broadcast against each
+    other, so a single pair of quaternions can be evaluated at an array of
+    parameters in one call, and batches of pairs can be interpolated at once.
+
+    Args:
+        q0: The start quaternions, shape (..., 4).
+        q1: The end quaternions, shape (..., 4).
+        t: The interpolation parameters, 0 gives q0 and 1 gives q1.
+        shortest_path: If True, q1 is replaced by -q1 where this is closer to q0,
+            so the interpolation follows the shorter of the two arcs between
+            the rotations.
+
+    Returns:
+        The interpolated quaternions, with the broadcast shape of the inputs.
+    """
+    q0 = _components(q0)
+    q1 = _components(q1)
+    t = np.asarray(t, dtype=q0.dtype)[..., np.newaxis]
+
+    dot = np.sum(q0 * q1, axis=-1, keepdims=True)
+    if shortest_path:
+        sign = np.where(dot < 0, -1, 1).astype(q0.dtype)
+        q1 = q1 * sign
+        dot = dot * sign
+
+    # The angle between q0 and q1, recovered from the chord for accuracy.
+    difference = np.linalg.norm(q1 - q0 * dot, axis=-1, keepdims=True)
+    omega = np.arctan2(difference, dot)
+    sin_omega = np.sin(omega)
+
+    small = omega < rl.SMALL_ANGLE
+    safe_sin = np.where(small, 1, sin_omega)
+    c0 = np.where(small, 1 - t, np.sin((1 - t) * omega) / safe_sin)
+    c1 = np.where(small, t, np.sin(t * omega) / safe_sin)
+    out = c0 * q0 + c1 * q1
+    # Linear interpolation close to q0 = q1 needs renormalization.
+    if np.any(small):
+        out /= np.linalg.norm(out, axis=-1, keepdims=True)
+    return out
+
+
+class QuaternionSpline:
+    """Smooth interpolation through keyframe rotations with squad.
+
+    Between two keyframes q_i and q_{i+1} the spline evaluates
+
+        squad = slerp(slerp(q_i, q_{i+1}, h), slerp(s_i, s_{i+1}, h), 2h(1 - h)),
+
+    where h is the normalized time within the segment and the control points
+    s_i = q_i exp(-(log(q_i^* q_{i+1}) + log(q_i^* q_{i-1})) / 4) make the
+    curve continuously differentiable at the keyframes. Before the control
+    points are computed the signs of the keyframes are aligned, so that
+    consecutive keyframes are on the same hemisphere.
+
+    Attributes:
+        times: The sorted keyframe times, shape (K,).
+        keyframes: The sign-aligned keyframe quaternions, shape (K, 4).
+        control_points: The squad control points, shape (K, 4).
+    """
+
+    def __init__(
+        self,
+        times: ArrayLike,
+        quaternions: Union[rl.QuaternionArray, ArrayLike],
+    ) -> None:
+        """Initializes the spline from keyframes.
+
+        Args:
+            times: Strictly increasing keyframe times, shape (K,) with K >= 2.
+            quaternions: The unit quaternions at the keyframes, shape (K, 4).
+        """
+        self.times = np.asarray(times, dtype=np.float64)
+        q = np.array(_components(quaternions))
+        if q.ndim != 2 or len(q) != len(self.times) or len(q) < 2:
+            raise ValueError("Expected at least two keyframes with one time each.")
+        if np.any(np.diff(self.times) <= 0):
+            raise ValueError("Keyframe times must be strictly increasing.")
+
+        # Antipodal sign handling, flip q_{i+1} whenever it is far from q_i.
+        flips = np.einsum("ij,ij->i", q[:-1], q[1:]) < 0
+        signs = np.cumprod(np.where(flips, -1.0, 1.0))
+        q[1:] *= signs[:, np.newaxis]
+        self.keyframes = q
+
+        control = q.copy()
+        if len(q) > 2:
+            inner = q[1:-1]
+            conjugate = inner * np.array([1, -1, -1, -1], dtype=q.dtype)
+            to_next = rl.quaternion_log(rl.hamilton_product(conjugate, q[2:]))
+            to_previous = rl.quaternion_log(rl.hamilton_product(conjugate, q[:-2]))
+            step = rl.quaternion_exp(-(to_next + to_previous) / 4)
+            control[1:-1] = rl.hamilton_product(inner, step)
+        self.control_points = control
+
+    def __call__(self, t: ArrayLike) -> np.ndarray:
+        """Evaluates the spline, clamping times outside the keyframe range.
+
+        Args:
+            t: The query times, of any shape.
+
+        Returns:
+            The interpolated unit quaternions, shape t.shape + (4,).
+        """
+        t = np.asarray(t, dtype=np.float64)
+        segment = np.searchsorted(self.times, t, side="right") - 1
+        segment = np.clip(segment, 0, len(self.times) - 2)
+        start = self.times[segment]
+        h = np.clip((t - start) / (self.times[segment + 1] - start), 0, 1)
+
+        q = self.keyframes
+        s = self.control_points
+        path = slerp(q[segment], q[segment + 1], h, shortest_path=False)
+        control = slerp(s[segment], s[segment + 1], h, shortest_path=False)
+        return slerp(path, control, 2 * h * (1 - h), shortest_path=False)
@@ -0,0 +1,192 @@
+"""Batched exponential and logarithmic maps between su(2) and the unit quaternions.
+
+The maps follow the conventions of PureQuaternion.exp and Quaternion.log: a
+pure quaternion v is mapped to cos|v| + sin|v| v/|v|, i.e. to a rotation by the
+angle 2|v| about v.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import ArrayLike, DTypeLike
+
+import robolie as rl
+from robolie.backend import kernel
+from robolie.precision import as_float_array
+from robolie.workspace import scratch
+
+# Below this angle the closed form expressions are replaced by Taylor series.
+SMALL_ANGLE = 1e-4
+
+
+def sinc(theta: np.ndarray) -> np.ndarray:
+    """Returns sin(theta) / theta, using a Taylor series close to zero."""
+    theta_sq = theta * theta
+    small = theta < SMALL_ANGLE
+    safe_theta = np.where(small, 1, theta)
+    return np.where(
+        small, 1 - theta_sq / 6 + theta_sq * theta_sq / 120, np.sin(theta) / safe_theta
+    )
+
+
+def quaternion_exp(
+    vectors: ArrayLike,
+    out: Optional[np.ndarray] = None,
+    dtype: Optional[DTypeLike] = None,
+) -> np.ndarray:
+    """Exponential map from pure quaternions to unit quaternions.
+
+    Args:
+        vectors: The vectorial parts of the pure quaternions, shape (..., 3).
+        out: Optional array of shape (..., 4) to store the result in. It must
+            not overlap vectors.
+        dtype: Optional dtype to compute in, see robolie.precision.
+
+    Returns:
+        The unit quaternions, shape (..., 4), ordered as (w, x, y, z).
+    """
+    vectors = as_float_array(vectors, dtype)
+    compiled = kernel("exp")
+    if compiled is not None and vectors.ndim == 2 and vectors.shape[-1] == 3:
+        if out is None:
+            out = np.empty((len(vectors), 4), dtype=vectors.dtype)
+        if out.shape == (len(vectors), 4):
+            return compiled(vectors, out, SMALL_ANGLE)
+    if out is not None:
+        return _quaternion_exp_into(vectors, out)
+    theta = np.sqrt(np.einsum("...i,...i->...", vectors, vectors))
+
+    out = np.empty(vectors.shape[:-1] + (4,), dtype=vectors.dtype)
+    out[..., 0] = np.cos(theta)
+    out[..., 1:] = sinc(theta)[..., np.newaxis] * vectors
+    return out
+
+
+def quaternion_log(
+    quaternions: Union[rl.QuaternionArray, ArrayLike],
+    out: Optional[np.ndarray] = None,
+    dtype: Optional[DTypeLike] = None,
+) -> np.ndarray:
+    """Logarithmic map from unit quaternions to pure quaternions.
+
+    The angle is recovered with arctan2, which is accurate over the whole range
+    [0, pi]. Close to the identity a Taylor series is used, so no division by a
+    vanishing vectorial part takes place.
+
+    Args:
+        quaternions: A batch of unit quaternions or an array of shape (..., 4).
+        out: Optional array of shape (..., 3) to store the result in. It must
+            not overlap the quaternions.
+        dtype: Optional dtype to compute in, see robolie.precision.
+
+    Returns:
+        The vectorial parts of the pure quaternions, shape (..., 3).
+    """
+    if isinstance(quaternions, rl.QuaternionArray):
+        quaternions = quaternions.full
+    q = as_float_array(quaternions, dtype)
+    compiled = kernel("log")
+    if compiled is not None and q.ndim == 2 and q.shape[-1] == 4:
+        if out is None:
+            out = np.empty((len(q), 3), dtype=q.dtype)
+        if out.shape == (len(q), 3):
+            return compiled(q, out, SMALL_ANGLE)
+    if out is not None:
+        return _quaternion_log_into(q, out)
+    shape = q.shape[:-1] + (3,)
+    q = q.reshape(-1, 4)
+    w = q[:, 0]
+    u = q[:, 1:]
+    r = np.sqrt(np.einsum("ij,ij->i", u, u))
+
+    # theta / r, where theta = arctan2(r, w). For small r and w > 0 this is
+    # arctan(x) / (x w) with x = r / w, which is evaluated by a Taylor series.
+    scale = np.arctan2(r, w)
+    small = (r < SMALL_ANGLE) & (w > 0)
+    np.divide(scale, r, out=scale, where=~small & (r > 0))
+    if np.any(small):
+        w_small = w[small]
+        x_sq = (r[small] / w_small) ** 2
+        scale[small] = (1 - x_sq / 3 + x_sq * x_sq / 5) / w_small
+    out = scale[:, np.newaxis] * u
+
+    # The quaternion -1 has no unique logarithm; pick a rotation about the x-axis.
+    antipodal = (r == 0) & (w < 0)
+    if np.any(antipodal):
+        out[antipodal] = (np.pi, 0, 0)
+    return out.reshape(shape)
+
+
+def _quaternion_exp_into(vectors: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Computes quaternion_exp into out, using scratch arrays for intermediates."""
+    shape = out.shape[:-1]
+    work = scratch("exp_work", (4,) + shape, out.dtype)
+    theta_sq, theta, scale, series = work
+    small = scratch("exp_small", shape, np.dtype(bool))
+    np.multiply(vectors[..., 0], vectors[..., 0], out=theta_sq)
+    for i in (1, 2):
+        np.multiply(vectors[..., i], vectors[..., i], out=series)
+        np.add(theta_sq, series, out=theta_sq)
+    np.sqrt(theta_sq, out=theta)
+    np.cos(theta, out=out[..., 0])
+
+    # sin(theta) / theta, and its Taylor series for small angles.
+    np.sin(theta, out=scale)
+    np.less(theta, SMALL_ANGLE, out=small)
+    np.logical_not(small, out=small)
+    np.divide(scale, theta, out=scale, where=small)
+    np.logical_not(small, out=small)
+    np.multiply(theta_sq, 1 / 120, out=series)
+    np.subtract(series, 1 / 6, out=series)
+    np.multiply(series, theta_sq, out=series)
+    np.add(series, 1, out=series)
+    np.copyto(scale, series, where=small)
+    for i in range(3):
+        np.multiply(vectors[..., i], scale, out=out[..., i + 1])
+    return out
+
+
+def _quaternion_log_into(q: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Computes quaternion_log into out, using scratch arrays for intermediates."""
+    shape = out.shape[:-1]
+    work = scratch("log_work", (4,) + shape, out.dtype)
+    r, scale, x_sq, series = work
+    masks = scratch("log_masks", (3,) + shape, np.dtype(bool))
+    small, regular, other = masks
+    w = q[..., 0]
+    np.multiply(q[..., 1], q[..., 1], out=r)
+    for i in (2, 3):
+        np.multiply(q[..., i], q[..., i], out=series)
+        np.add(r, series, out=r)
+    np.sqrt(r, out=r)
+    np.arctan2(r, w, out=scale)
+
+    # Small angles with w > 0 use the Taylor series of arctan(x) / (x w).
+    np.less(r, SMALL_ANGLE, out=small)
+    np.greater(w, 0, out=other)
+    np.logical_and(small, other, out=small)
+    np.greater(r, 0, out=regular)
+    np.logical_not(small, out=other)
+    np.logical_and(regular, other, out=regular)
+    np.divide(scale, r, out=scale, where=regular)
+    np.divide(r, w, out=x_sq, where=small)
+    np.multiply(x_sq, x_sq, out=x_sq, where=small)
+    np.multiply(x_sq, 1 / 5, out=series, where=small)
+    np.subtract(series, 1 / 3, out=series, where=small)
+    np.multiply(series, x_sq, out=series, where=small)
+    np.add(series, 1, out=series, where=small)
+    np.divide(series, w, out=series, where=small)
+    np.copyto(scale, series, where=small)
+    for i in range(3):
+        np.multiply(q[..., i + 1], scale, out=out[..., i])
+
+    # The quaternion -1 has no unique logarithm; pick a rotation about the x-axis.
+    antipodal = regular
+    np.equal(r, 0, out=antipodal)
+    np.less(w, 0, out=other)
+    np.logical_and(antipodal, other, out=antipodal)
+    if antipodal.any():
+        out[antipodal] = (np.pi, 0, 0)
+    return out
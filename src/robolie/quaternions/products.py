@@ -0,0 +1,187 @@
+"""Module for cumulative products of sequences of quaternions.
+
+Composing long chains of rotations, such as kinematic chains or dead-reckoning
+trajectories, is an associative scan. The scan is computed blockwise: all
+blocks are advanced together, one vectorized product per position within a
+block, the block totals are scanned recursively, and a final fix-up pass
+multiplies each block by the product of all preceding blocks. Every quaternion
+takes part in two products, as in a sequential fold. For very long sequences the
+blocks can be distributed over worker processes sharing the array in memory.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import robolie as rl
+from robolie.parallel import SharedArray, call_with_shared_array
+from robolie.precision import as_float_array
+
+
+def _as_array(quaternions: Union[rl.QuaternionArray, ArrayLike]) -> np.ndarray:
+    """Returns a floating point copy of the quaternions, shape (N, 4)."""
+    if isinstance(quaternions, rl.QuaternionArray):
+        quaternions = quaternions.full
+    return np.array(as_float_array(quaternions)).reshape(-1, 4)
+
+
+def _normalize(q: np.ndarray) -> None:
+    """Normalizes quaternions along the last axis in place."""
+    q /= np.sqrt(np.einsum("...i,...i->...", q, q))[..., np.newaxis]
+
+
+def _doubling_scan(q: np.ndarray) -> None:
+    """Inclusive scan along axis -2 in place, with log2(length) passes."""
+    n = q.shape[-2]
+    shift = 1
+    while shift < n:
+        q[..., shift:, :] = rl.hamilton_product(q[..., :-shift, :], q[..., shift:, :])
+        shift *= 2
+
+
+def _blocked_scan(q: np.ndarray, block_size: int, renormalize: bool) -> None:
+    """Inclusive scan of an (N, 4) array in place, see the module docstring."""
+    n = len(q)
+    if n <= block_size:
+        _doubling_scan(q)
+        if renormalize:
+            _normalize(q)
+        return
+
+    # Blocks of about sqrt(N) quaternions balance the number of sequential
+    # steps against the number of blocks advanced in each step.
+    length = min(block_size, int(np.ceil(np.sqrt(n))))
+    n_blocks = -(-n // length)
+    # Pad with identities to full blocks, and store step j of every block
+    # contiguously, so each step is one product over all blocks.
+    padded = np.zeros((n_blocks * length, 4), dtype=q.dtype)
+    padded[:, 0] = 1
+    padded[:n] = q
+    steps = np.ascontiguousarray(padded.reshape(n_blocks, length, 4).swapaxes(0, 1))
+    for j in range(1, length):
+        rl.hamilton_product(steps[j - 1], steps[j], out=steps[j])
+
+    # The products of all preceding blocks, renormalized once per block.
+    prefixes = steps[-1, :-1].copy()
+    _blocked_scan(prefixes, block_size, renormalize)
+    blocks = steps.swapaxes(0, 1)
+    q[length:] = rl.hamilton_product(prefixes[:, np.newaxis], blocks[1:]).reshape(
+        -1, 4
+    )[: n - length]
+    q[:length] = blocks[0]
+    if renormalize:
+        _normalize(q)
+
+
+def _scan_segment(
+    q: np.ndarray, start: int, stop: int, block_size: int, renormalize: bool
+) -> np.ndarray:
+    """Scans q[start:stop] in place and returns the segment total."""
+    segment = q[start:stop]
+    _blocked_scan(segment, block_size, renormalize)
+    return segment[-1].copy()
+
+
+def _fix_segment(
+    q: np.ndarray, start: int, stop: int, prefix: np.ndarray, renormalize: bool
+) -> None:
+    """Multiplies q[start:stop] from the left by prefix in place."""
+    segment = q[start:stop]
+    segment[:] = rl.hamilton_product(prefix, segment)
+    if renormalize:
+        _normalize(segment)
+
+
+def cumulative_product(
+    quaternions: Union[rl.QuaternionArray, ArrayLike],
+    block_size: int = 1024,
+    renormalize: bool = False,
+    workers: Optional[int] = None,
+) -> np.ndarray:
+    """Computes the running products q_0, q_0 q_1, q_0 q_1 q_2, ...
+
+    The order of the factors is preserved, the earlier quaternion is always
+    the left factor.
+
+    Args:
+        quaternions: A batch of quaternions or an array of shape (N, 4).
+        block_size: The maximal number of quaternions in one block, which is
+            also the maximal number of sequential steps per level of the scan.
+        renormalize: If True, the quaternions are assumed to be unit
+            quaternions, and the results are renormalized after every block,
+            which keeps round-off drift bounded for arbitrarily long chains.
+        workers: If given, the sequence is split into this many segments which
+            are scanned in separate processes over shared memory, followed by a
+            parallel fix-up pass per segment. Only worthwhile for sequences of
+            millions of quaternions.
+
+    Returns:
+        The running products, shape (N, 4).
+    """
+    q = _as_array(quaternions)
+    if workers is None or workers <= 1 or len(q) <= block_size * workers:
+        _blocked_scan(q, block_size, renormalize)
+        return q
+
+    bounds = np.linspace(0, len(q), workers + 1).astype(int)
+    segments = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+    with SharedArray(q) as shared, ProcessPoolExecutor(workers) as pool:
+        totals = np.array(
+            list(
+                pool.map(
+                    call_with_shared_array,
+                    [shared.descriptor] * workers,
+                    [_scan_segment] * workers,
+                    *zip(*segments),
+                    [block_size] * workers,
+                    [renormalize] * workers,
+                )
+            )
+        )
+        prefixes = totals[:-1]
+        _blocked_scan(prefixes, block_size, renormalize)
+        list(
+            pool.map(
+                call_with_shared_array,
+                [shared.descriptor] * (workers - 1),
+                [_fix_segment] * (workers - 1),
+                *zip(*segments[1:]),
+                prefixes,
+                [renormalize] * (workers - 1),
+            )
+        )
+        return shared.read()
+
+
+def reduce_product(
+    quaternions: Union[rl.QuaternionArray, ArrayLike],
+    renormalize: bool = False,
+) -> np.ndarray:
+    """Computes the total product q_0 q_1 ... q_{N-1}.
+
+    Neighbouring pairs are multiplied in a balanced tree, one vectorized pass
+    per level, so the round-off error grows with log2(N) instead of N.
+
+    Args:
+        quaternions: A batch of quaternions or an array of shape (N, 4).
+        renormalize: If True, the quaternions are assumed to be unit
+            quaternions, and the partial products are renormalized per level.
+
+    Returns:
+        The product, shape (4,).
+    """
+    q = _as_array(quaternions)
+    if len(q) == 0:
+        return np.array([1, 0, 0, 0], dtype=q.dtype)
+    while len(q) > 1:
+        paired = rl.hamilton_product(q[0:-1:2], q[1::2])
+        if len(q) % 2:
+            paired = np.concatenate([paired, q[-1:]])
+        if renormalize:
+            _normalize(paired)
+        q = paired
+    return q[0]
@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+import math
+from typing import Optional, Union
+
 import numpy as np
 
+import robolie as rl
+from robolie.quaternions.maps import SMALL_ANGLE
+
 
 class Quaternion:
     """Class for quaternion objects and operations on them.
@@ -17,11 +23,19 @@ class Quaternion:
     representations, performing arithmetic operations, and converting between
     representations.
 
+    The components are stored as Python floats, which keeps arithmetic on
+    single quaternions free of numpy overhead. The unitary matrix
+    representation is only computed when it is first accessed.
+
     Attributes:
         real: The real part of the quaternion.
         vector: The vectorial part of the quaternion as a numpy array.
+        full: The components (w, x, y, z) as a numpy array.
+        matrix: The unitary 2x2 matrix representation of the quaternion.
     """
 
+    __slots__ = ("_w", "_x", "_y", "_z", "_matrix")
+
     def __init__(self, w: float, x: float, y: float, z: float) -> None:
         """Initializes a quaternion from its components.
 
@@ -31,50 +45,188 @@ class Quaternion:
             y: The second imaginary part of the quaternion.
             z: The third imaginary part of the quaternion.
         """
-        self.full = np.array([w, x, y, z])
-        self.matrix = np.array([[w + 1j * x, y + 1j * z], [-y + 1j * z, w - 1j * x]])
+        self._w = float(w)
+        self._x = float(x)
+        self._y = float(y)
+        self._z = float(z)
+        self._matrix: Optional[np.ndarray] = None
+
+    @classmethod
+    def _from_floats(cls, w: float, x: float, y: float, z: float) -> Quaternion:
+        """Creates a quaternion from Python floats, skipping the conversion."""
+        q = cls.__new__(cls)
+        q._w = w
+        q._x = x
+        q._y = y
+        q._z = z
+        q._matrix = None
+        return q
+
+    def _set(self, w: float, x: float, y: float, z: float) -> None:
+        """Sets all components and invalidates the cached matrix."""
+        self._w = float(w)
+        self._x = float(x)
+        self._y = float(y)
+        self._z = float(z)
+        self._matrix = None
+
+    @property
+    def full(self) -> np.ndarray:
+        """Returns the components (w, x, y, z) of the quaternion.
+
+        The array is a read-only copy, so writing to its elements raises
+        instead of silently leaving the quaternion unchanged. Use the setter,
+        or item assignment on the quaternion, to change components.
+        """
+        return _read_only([self._w, self._x, self._y, self._z])
+
+    @full.setter
+    def full(self, value: np.ndarray) -> None:
+        """Sets all components of the quaternion."""
+        self._set(*value)
 
     @property
     def real(self) -> float:
         """Returns the real part of the quaternion."""
-        return self.full[0]
+        return self._w
 
     @real.setter
     def real(self, value: float) -> None:
         """Sets the real part of the quaternion."""
-        self.full[0] = value
+        self._w = float(value)
+        self._matrix = None
 
     @property
     def vector(self) -> np.ndarray:
-        """Returns the vectorial part of the quaternion."""
-        return self.full[1:]
+        """Returns the vectorial part of the quaternion as a read-only copy."""
+        return _read_only([self._x, self._y, self._z])
 
     @vector.setter
     def vector(self, value: np.ndarray) -> None:
         """Sets the vectorial part of the quaternion."""
-        self.full[1:] = value
+        self._set(self._w, *value)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Returns the unitary matrix representation, computed on first access."""
+        if self._matrix is None:
+            self._matrix = self.to_unitary_matrix()
+        return self._matrix
 
     def __mul__(self, other: Quaternion) -> Quaternion:
         """Multiplies two quaternions."""
-        w = self.real * other.real - np.dot(self.vector, other.vector)
-        v = (
-            self.real * other.vector
-            + other.real * self.vector
-            + np.cross(self.vector, other.vector)
+        if not isinstance(other, Quaternion):
+            return NotImplemented
+        aw, ax, ay, az = self._w, self._x, self._y, self._z
+        bw, bx, by, bz = other._w, other._x, other._y, other._z
+        return Quaternion._from_floats(
+            aw * bw - ax * bx - ay * by - az * bz,
+            aw * bx + ax * bw + ay * bz - az * by,
+            aw * by - ax * bz + ay * bw + az * bx,
+            aw * bz + ax * by - ay * bx + az * bw,
+        )
+
+    def __imul__(self, other: Quaternion) -> Quaternion:
+        """Multiplies the quaternion in place from the right."""
+        if not isinstance(other, Quaternion):
+            return NotImplemented
+        return self.compose(other, out=self)
+
+    def compose(
+        self, other: Quaternion, out: Optional[Quaternion] = None
+    ) -> Quaternion:
+        """Returns the product self * other.
+
+        Args:
+            other: The right factor.
+            out: Optional quaternion to store the product in. May be self or
+                other.
+        """
+        if out is None:
+            return self * other
+        aw, ax, ay, az = self._w, self._x, self._y, self._z
+        bw, bx, by, bz = other._w, other._x, other._y, other._z
+        out._set(
+            aw * bw - ax * bx - ay * by - az * bz,
+            aw * bx + ax * bw + ay * bz - az * by,
+            aw * by - ax * bz + ay * bw + az * bx,
+            aw * bz + ax * by - ay * bx + az * bw,
         )
-        return Quaternion(w, *v)
+        return out
+
+    @classmethod
+    def identity(cls) -> Quaternion:
+        """Returns the identity quaternion 1."""
+        return cls._from_floats(1.0, 0.0, 0.0, 0.0)
+
+    @classmethod
+    def exp(
+        cls,
+        vector: Union[PureQuaternion, np.ndarray],
+        out: Optional[Quaternion] = None,
+    ) -> Quaternion:
+        """Exponential map from a pure quaternion or its vectorial part."""
+        if not isinstance(vector, PureQuaternion):
+            vector = PureQuaternion(*vector)
+        return vector.exp(out=out)
+
+    def adjoint(self) -> np.ndarray:
+        """Returns the adjoint matrix, q v q^* = Ad v for pure quaternions v.
+
+        For a unit quaternion this is the rotation matrix, shape (3, 3).
+        """
+        return rl.quaternion_to_rotation_matrix(self)
+
+    def act(self, points: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rotates a point or an (N, 3) array of points by the unit quaternion."""
+        return rl.rotate_points(points, self, out=out)
+
+    def rotate(
+        self, vector: np.ndarray, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Rotates a single 3D vector by the unit quaternion, q v q^*.
+
+        Uses the expanded form v + 2w(u x v) + 2u x (u x v) on Python floats,
+        so rotating into an out array does not allocate.
+
+        Args:
+            vector: The vector to rotate, shape (3,).
+            out: Optional array of shape (3,) to store the result in. May be
+                vector.
+
+        Returns:
+            The rotated vector.
+        """
+        if isinstance(vector, np.ndarray):
+            vx, vy, vz = vector.item(0), vector.item(1), vector.item(2)
+        else:
+            vx, vy, vz = (float(v) for v in vector)
+        w, x, y, z = self._w, self._x, self._y, self._z
+        tx = 2 * (y * vz - z * vy)
+        ty = 2 * (z * vx - x * vz)
+        tz = 2 * (x * vy - y * vx)
+        if out is None:
+            out = np.empty(3)
+        out[0] = vx + w * tx + y * tz - z * ty
+        out[1] = vy + w * ty + z * tx - x * tz
+        out[2] = vz + w * tz + x * ty - y * tx
+        return out
 
     def __str__(self) -> str:
         """Returns a string representation of the quaternion."""
-        return f"({self.real}, {self.vector[0]}, {self.vector[1]}, {self.vector[2]})"
+        return f"({self._w}, {self._x}, {self._y}, {self._z})"
 
     def __getitem__(self, index: int) -> float:
         """Returns the component of the quaternion at the given index."""
+        if isinstance(index, int):
+            return (self._w, self._x, self._y, self._z)[index]
         return self.full[index]
 
     def __setitem__(self, index: int, value: float) -> None:
         """Sets the component of the quaternion at the given index."""
-        self.full[index] = value
+        full = np.array([self._w, self._x, self._y, self._z])
+        full[index] = value
+        self._set(*full)
 
     @classmethod
     def from_matrix(cls, matrix: np.ndarray) -> Quaternion:
@@ -103,42 +255,61 @@ class Quaternion:
         Returns:
             The quaternion representing the rotation.
         """
-        axis = axis / np.linalg.norm(axis)
-        w = np.cos(theta)
-        v = np.sin(theta) * axis
-        return cls(w, *v)
+        x, y, z = (float(a) for a in axis)
+        scale = math.sin(theta) / math.sqrt(x * x + y * y + z * z)
+        return cls(math.cos(theta), scale * x, scale * y, scale * z)
 
     def normalize(self) -> None:
         """Normalizes the quaternion."""
         norm: float = self.norm()
-        self.full = self.full / norm
+        self._set(self._w / norm, self._x / norm, self._y / norm, self._z / norm)
 
     def normalized(self) -> Quaternion:
         """Returns a normalized copy of the quaternion."""
         norm: float = self.norm()
-        return Quaternion(self.real / norm, *self.vector / norm)
+        return Quaternion._from_floats(
+            self._w / norm, self._x / norm, self._y / norm, self._z / norm
+        )
 
     def conjugate(self) -> None:
         """Conjugates the quaternion."""
-        self.vector *= -1
+        self._set(self._w, -self._x, -self._y, -self._z)
 
     def conjugated(self) -> Quaternion:
         """Returns a conjugated copy of the quaternion."""
-        return Quaternion(self.real, *-self.vector)
+        return Quaternion._from_floats(self._w, -self._x, -self._y, -self._z)
 
     def norm(self) -> float:
         """Returns the norm of the quaternion."""
-        return float(np.linalg.norm(self.full))
+        w, x, y, z = self._w, self._x, self._y, self._z
+        return math.sqrt(w * w + x * x + y * y + z * z)
 
-    def inverse(self) -> Quaternion:
-        """Returns the inverse of the quaternion."""
-        return Quaternion(
-            self.real / self.norm() ** 2, *-self.vector / self.norm() ** 2
+    def inverse(self, out: Optional[Quaternion] = None) -> Quaternion:
+        """Returns the inverse of the quaternion.
+
+        Args:
+            out: Optional quaternion to store the inverse in. May be self.
+        """
+        w, x, y, z = self._w, self._x, self._y, self._z
+        squared_norm = w * w + x * x + y * y + z * z
+        if out is None:
+            return Quaternion._from_floats(
+                w / squared_norm,
+                -x / squared_norm,
+                -y / squared_norm,
+                -z / squared_norm,
+            )
+        out._set(
+            w / squared_norm,
+            -x / squared_norm,
+            -y / squared_norm,
+            -z / squared_norm,
         )
+        return out
 
     def to_unitary_matrix(self) -> np.ndarray:
         """Returns the unitary matrix representation of the quaternion."""
-        w, x, y, z = self.full
+        w, x, y, z = self._w, self._x, self._y, self._z
         return np.array(
             [
                 [w + x * 1j, y + z * 1j],
@@ -146,30 +317,48 @@ class Quaternion:
             ]
         )
 
-    def log(self) -> PureQuaternion:
+    def log(self, out: Optional[PureQuaternion] = None) -> PureQuaternion:
         """Logarithmic map to the lie algebra of unit quaternions.
 
+        Args:
+            out: Optional pure quaternion to store the result in.
+
         Returns:
             The corresponding element of the lie algebra.
         """
-        assert np.isclose(self.norm(), 1), "Quaternion must be normalized."
-        r = np.linalg.norm(self.vector)
-        v = self.vector / r
-        if self.real < 0:
-            theta = np.pi - np.arcsin(r)
+        assert _is_unit(self.norm()), "Quaternion must be normalized."
+        return self._log(out)
+
+    def _log(self, out: Optional[PureQuaternion] = None) -> PureQuaternion:
+        """Computes the logarithm, assuming the quaternion is normalized."""
+        w, x, y, z = self._w, self._x, self._y, self._z
+        r = math.sqrt(x * x + y * y + z * z)
+        if r < SMALL_ANGLE and w > 0:
+            x_sq = (r / w) ** 2
+            scale = (1 - x_sq / 3 + x_sq * x_sq / 5) / w
+        elif r == 0:
+            # The quaternion -1 has no unique logarithm.
+            x, scale = math.pi, 1.0
         else:
-            theta = np.arcsin(r)
-        return PureQuaternion(*(theta * v))
+            scale = math.atan2(r, w) / r
+        if out is None:
+            return PureQuaternion._from_floats(scale * x, scale * y, scale * z)
+        out._x = scale * x
+        out._y = scale * y
+        out._z = scale * z
+        return out
 
     def which_rotation(self) -> tuple:
         """Returns the corresponding angle and axis of rotation of the unit quaternion."""
-        assert np.isclose(self.norm(), 1), "Quaternion must be normalized."
-        r = np.linalg.norm(self.vector)
-        axis = self.vector / r
-        if self.real < 0:
-            theta = np.pi - np.arcsin(r)
-        else:
-            theta = np.arcsin(r)
+        assert _is_unit(self.norm()), "Quaternion must be normalized."
+        return self._which_rotation()
+
+    def _which_rotation(self) -> tuple:
+        """Computes the angle and axis, assuming the quaternion is normalized."""
+        vector = self.vector
+        r = math.sqrt(self._x**2 + self._y**2 + self._z**2)
+        axis = vector / r
+        theta = math.atan2(r, self._w)
         angle = 2 * theta
         return (angle, axis)
 
@@ -184,6 +373,8 @@ class PureQuaternion:
 
     """
 
+    __slots__ = ("_x", "_y", "_z")
+
     def __init__(self, x: float, y: float, z: float) -> None:
         """Initializes a pure quaternion from its components.
 
@@ -192,30 +383,111 @@ class PureQuaternion:
             y: The second imaginary part of the quaternion.
             z: The third imaginary part of the quaternion.
         """
-        self.vector = np.array([x, y, z])
+        self._x = float(x)
+        self._y = float(y)
+        self._z = float(z)
+
+    @classmethod
+    def _from_floats(cls, x: float, y: float, z: float) -> PureQuaternion:
+        """Creates a pure quaternion from Python floats, skipping the conversion."""
+        p = cls.__new__(cls)
+        p._x = x
+        p._y = y
+        p._z = z
+        return p
+
+    @property
+    def vector(self) -> np.ndarray:
+        """Returns the vectorial part of the quaternion as a read-only copy.
+
+        Writing to its elements raises, use the setter to change components.
+        """
+        return _read_only([self._x, self._y, self._z])
+
+    @vector.setter
+    def vector(self, value: np.ndarray) -> None:
+        """Sets the vectorial part of the quaternion."""
+        x, y, z = value
+        self._x = float(x)
+        self._y = float(y)
+        self._z = float(z)
 
     def __mul__(self, other: PureQuaternion) -> PureQuaternion:
         """Multiplies two pure quaternions."""
-        return PureQuaternion(*np.cross(self.vector, other.vector))
+        ax, ay, az = self._x, self._y, self._z
+        bx, by, bz = other._x, other._y, other._z
+        return PureQuaternion._from_floats(
+            ay * bz - az * by, az * bx - ax * bz, ax * by - ay * bx
+        )
+
+    def __imul__(self, other: PureQuaternion) -> PureQuaternion:
+        """Multiplies the pure quaternion in place from the right."""
+        ax, ay, az = self._x, self._y, self._z
+        bx, by, bz = other._x, other._y, other._z
+        self._x = ay * bz - az * by
+        self._y = az * bx - ax * bz
+        self._z = ax * by - ay * bx
+        return self
 
     def __truediv__(self, other: float) -> PureQuaternion:
         """Divides a pure quaternion by a scalar."""
-        return PureQuaternion(*(self.vector / other))
+        return PureQuaternion(self._x / other, self._y / other, self._z / other)
+
+    def __itruediv__(self, other: float) -> PureQuaternion:
+        """Divides the pure quaternion in place by a scalar."""
+        self._x /= other
+        self._y /= other
+        self._z /= other
+        return self
 
     def __add__(self, other: PureQuaternion) -> PureQuaternion:
         """Adds two pure quaternions."""
-        return PureQuaternion(*(self.vector + other.vector))
+        return PureQuaternion._from_floats(
+            self._x + other._x, self._y + other._y, self._z + other._z
+        )
+
+    def __iadd__(self, other: PureQuaternion) -> PureQuaternion:
+        """Adds a pure quaternion in place."""
+        self._x += other._x
+        self._y += other._y
+        self._z += other._z
+        return self
 
     def __str__(self) -> str:
         """Returns a string representation of the pure quaternion."""
-        return f"({self.vector[0]}, {self.vector[1]}, {self.vector[2]})"
+        return f"({self._x}, {self._y}, {self._z})"
 
-    def exp(self) -> Quaternion:
+    def exp(self, out: Optional[Quaternion] = None) -> Quaternion:
         """Exponential map to the lie group of unit quaternions.
 
+        Args:
+            out: Optional quaternion to store the result in.
+
         Returns:
             The corresponding element of the lie group.
         """
-        theta: float = float(np.linalg.norm(self.vector))
-        axis: np.ndarray = self.vector / theta
-        return Quaternion.from_angle_and_axis(theta, axis)
+        x, y, z = self._x, self._y, self._z
+        theta_sq = x * x + y * y + z * z
+        theta = math.sqrt(theta_sq)
+        if theta < SMALL_ANGLE:
+            scale = 1 - theta_sq / 6 + theta_sq * theta_sq / 120
+        else:
+            scale = math.sin(theta) / theta
+        if out is None:
+            return Quaternion._from_floats(
+                math.cos(theta), scale * x, scale * y, scale * z
+            )
+        out._set(math.cos(theta), scale * x, scale * y, scale * z)
+        return out
+
+
+def _read_only(components: list[float]) -> np.ndarray:
+    """Returns the components as a new array whose elements cannot be written."""
+    array = np.array(components)
+    array.flags.writeable = False
+    return array
+
+
+def _is_unit(norm: float) -> bool:
+    """Checks whether a norm equals one, with the tolerances of np.isclose."""
+    return abs(norm - 1) <= 1e-8 + 1e-5
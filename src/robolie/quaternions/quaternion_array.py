@@ -0,0 +1,431 @@
+"""Module for batches of quaternions stored in one contiguous array."""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from numpy.typing import ArrayLike, DTypeLike
+
+import robolie as rl
+from robolie.backend import kernel, loop_safe
+from robolie.precision import as_float_array, get_default_dtype
+from robolie.workspace import scratch
+
+
+def hamilton_product(
+    a: ArrayLike, b: ArrayLike, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Computes the Hamilton product of quaternions stored along the last axis.
+
+    The inputs are broadcast against each other, so a single quaternion of shape
+    (4,) can be multiplied with a batch of shape (N, 4) and vice versa.
+
+    Args:
+        a: The left factors, shape (..., 4), ordered as (w, x, y, z).
+        b: The right factors, shape (..., 4), ordered as (w, x, y, z).
+        out: Optional array to store the result in. May alias a or b.
+
+    Returns:
+        The products a * b, with the broadcast shape of a and b.
+    """
+    a = as_float_array(a)
+    b = as_float_array(b)
+    compiled = kernel("hamilton_product")
+    # The loop only covers matching (N, 4) batches, others use numpy.
+    if compiled is not None and a.ndim == 2 and a.shape == b.shape == (len(a), 4):
+        if out is None:
+            out = np.empty(a.shape, dtype=np.result_type(a, b))
+        if out.shape == a.shape and loop_safe(out, a, b):
+            return compiled(a, b, out)
+    if out is not None:
+        return _hamilton_product_into(a, b, out)
+
+    # A single factor acts as a 4x4 matrix on the batch, one matmul suffices.
+    if a.ndim == 1 and b.ndim > 1:
+        return np.matmul(b, left_multiplication_matrix(a).T, out=out)
+    if b.ndim == 1 and a.ndim > 1:
+        return np.matmul(a, right_multiplication_matrix(b).T, out=out)
+
+    aw, ax, ay, az = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    bw, bx, by, bz = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+
+    w = aw * bw - ax * bx - ay * by - az * bz
+    x = aw * bx + ax * bw + ay * bz - az * by
+    y = aw * by - ax * bz + ay * bw + az * bx
+    z = aw * bz + ax * by - ay * bx + az * bw
+
+    if out is None:
+        out = np.empty(w.shape + (4,), dtype=np.result_type(a, b))
+    out[..., 0] = w
+    out[..., 1] = x
+    out[..., 2] = y
+    out[..., 3] = z
+    return out
+
+
+# The terms (sign, index into a, index into b) of each component of a * b.
+_HAMILTON_TERMS = (
+    ((1, 0, 0), (-1, 1, 1), (-1, 2, 2), (-1, 3, 3)),
+    ((1, 0, 1), (1, 1, 0), (1, 2, 3), (-1, 3, 2)),
+    ((1, 0, 2), (-1, 1, 3), (1, 2, 0), (1, 3, 1)),
+    ((1, 0, 3), (1, 1, 2), (-1, 2, 1), (1, 3, 0)),
+)
+
+
+def _hamilton_product_into(a: np.ndarray, b: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Computes a * b into out, without temporaries proportional to the batch.
+
+    The components are accumulated term by term with in-place ufuncs. If out
+    overlaps a factor, the result is gathered in a scratch array first.
+    """
+    shape = out.shape[:-1]
+    aliased = np.may_share_memory(out, a) or np.may_share_memory(out, b)
+    result = scratch("hamilton_result", shape + (4,), out.dtype) if aliased else out
+    term = scratch("hamilton_term", shape, out.dtype)
+    for i, terms in enumerate(_HAMILTON_TERMS):
+        component = result[..., i]
+        _, j, k = terms[0]
+        np.multiply(a[..., j], b[..., k], out=component)
+        for sign, j, k in terms[1:]:
+            np.multiply(a[..., j], b[..., k], out=term)
+            if sign > 0:
+                np.add(component, term, out=component)
+            else:
+                np.subtract(component, term, out=component)
+    if aliased:
+        np.copyto(out, result)
+    return out
+
+
+def _squared_norm_into(q: np.ndarray, out: np.ndarray, name: str) -> np.ndarray:
+    """Computes the squared norms of quaternions or vectors along the last axis."""
+    term = scratch(name, out.shape, out.dtype)
+    np.multiply(q[..., 0], q[..., 0], out=out)
+    for i in range(1, q.shape[-1]):
+        np.multiply(q[..., i], q[..., i], out=term)
+        np.add(out, term, out=out)
+    return out
+
+
+def left_multiplication_matrix(q: np.ndarray) -> np.ndarray:
+    """Returns the 4x4 matrix L(q) with q * p = L(q) p for all quaternions p."""
+    w, x, y, z = q
+    return np.array(
+        [[w, -x, -y, -z], [x, w, -z, y], [y, z, w, -x], [z, -y, x, w]], dtype=q.dtype
+    )
+
+
+def right_multiplication_matrix(q: np.ndarray) -> np.ndarray:
+    """Returns the 4x4 matrix R(q) with p * q = R(q) p for all quaternions p."""
+    w, x, y, z = q
+    return np.array(
+        [[w, -x, -y, -z], [x, w, z, -y], [y, -z, w, x], [z, y, -x, w]], dtype=q.dtype
+    )
+
+
+class QuaternionArray:
+    """Class for a batch of quaternions stored in a single (N, 4) array.
+
+    All operations act on the whole batch at once through numpy, so no Python
+    level loop over the individual quaternions is involved. Rows are ordered as
+    (w, x, y, z), matching Quaternion.full.
+
+    Attributes:
+        full: The (N, 4) array holding the quaternions.
+        real: The real parts of the quaternions as an (N,) view.
+        vector: The vectorial parts of the quaternions as an (N, 3) view.
+    """
+
+    # Numpy defers arithmetic to the batch, so array * batch is a Hamilton
+    # product through __rmul__ rather than an elementwise product.
+    __array_ufunc__ = None
+
+    def __init__(self, data: ArrayLike, dtype: Optional[DTypeLike] = None) -> None:
+        """Initializes a batch of quaternions from an array.
+
+        Args:
+            data: Array of shape (N, 4) or (4,). Floating point arrays are used
+                without copying; other data is converted to the default dtype.
+            dtype: Optional dtype to convert the data to.
+        """
+        full = as_float_array(data, dtype)
+        if full.ndim == 1:
+            full = full.reshape(1, -1)
+        if full.ndim != 2 or full.shape[1] != 4:
+            raise ValueError(
+                f"Expected an array of shape (N, 4), got shape {full.shape}."
+            )
+        self.full = full
+
+    @property
+    def real(self) -> np.ndarray:
+        """Returns the real parts of the quaternions."""
+        return self.full[:, 0]
+
+    @real.setter
+    def real(self, value: ArrayLike) -> None:
+        """Sets the real parts of the quaternions."""
+        self.full[:, 0] = value
+
+    @property
+    def vector(self) -> np.ndarray:
+        """Returns the vectorial parts of the quaternions."""
+        return self.full[:, 1:]
+
+    @vector.setter
+    def vector(self, value: ArrayLike) -> None:
+        """Sets the vectorial parts of the quaternions."""
+        self.full[:, 1:] = value
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Returns the floating point type of the underlying array."""
+        return self.full.dtype
+
+    def __len__(self) -> int:
+        """Returns the number of quaternions in the batch."""
+        return self.full.shape[0]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """Returns the underlying (N, 4) array."""
+        if dtype is None and not copy:
+            return self.full
+        return np.array(self.full, dtype=dtype, copy=True)
+
+    def __getitem__(
+        self, index: Union[int, slice, np.ndarray]
+    ) -> Union[rl.Quaternion, QuaternionArray]:
+        """Returns a single quaternion for an integer index, otherwise a batch.
+
+        Slices give views that share memory with this batch.
+        """
+        if isinstance(index, (int, np.integer)):
+            return rl.Quaternion(*self.full[index])
+        return QuaternionArray(self.full[index])
+
+    def __setitem__(
+        self,
+        index: Union[int, slice, np.ndarray],
+        value: Union[rl.Quaternion, QuaternionArray, ArrayLike],
+    ) -> None:
+        """Sets the quaternions at the given index."""
+        self.full[index] = _components(value)
+
+    def __mul__(
+        self, other: Union[QuaternionArray, rl.Quaternion, ArrayLike]
+    ) -> QuaternionArray:
+        """Multiplies two batches of quaternions elementwise, with broadcasting."""
+        factor = _operand(other)
+        if factor is None:
+            return NotImplemented
+        return QuaternionArray(hamilton_product(self.full, factor))
+
+    def __rmul__(self, other: Union[rl.Quaternion, ArrayLike]) -> QuaternionArray:
+        """Multiplies a quaternion from the left onto every element of the batch."""
+        factor = _operand(other)
+        if factor is None:
+            return NotImplemented
+        return QuaternionArray(hamilton_product(factor, self.full))
+
+    def __imul__(
+        self, other: Union[QuaternionArray, rl.Quaternion, ArrayLike]
+    ) -> QuaternionArray:
+        """Multiplies the batch in place from the right, without reallocating."""
+        factor = _operand(other)
+        if factor is None:
+            return NotImplemented
+        hamilton_product(self.full, factor, out=self.full)
+        return self
+
+    def compose(
+        self,
+        other: Union[QuaternionArray, rl.Quaternion, ArrayLike],
+        out: Optional[QuaternionArray] = None,
+    ) -> QuaternionArray:
+        """Returns the elementwise products self * other.
+
+        Args:
+            other: The right factors, broadcast against the batch.
+            out: Optional batch to store the products in. May be self.
+        """
+        if out is None:
+            return self * other
+        hamilton_product(self.full, _components(other), out=out.full)
+        return out
+
+    def adjoint(self) -> np.ndarray:
+        """Returns the adjoint matrices, the rotation matrices, shape (N, 3, 3)."""
+        return rl.quaternion_to_rotation_matrix(self.full)
+
+    def act(self, points: ArrayLike, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rotates points by the unit quaternions, see rotate_points."""
+        return rl.rotate_points(points, self, out=out)
+
+    def __str__(self) -> str:
+        """Returns a string representation of the batch."""
+        return f"{type(self).__name__}({self.full})"
+
+    def __repr__(self) -> str:
+        """Returns a string representation of the batch."""
+        return f"{type(self).__name__}({self.full!r})"
+
+    def copy(self) -> QuaternionArray:
+        """Returns a copy of the batch that does not share memory."""
+        return QuaternionArray(self.full.copy())
+
+    @classmethod
+    def identity(cls, n: int = 1, dtype: Optional[DTypeLike] = None) -> QuaternionArray:
+        """Creates a batch of n identity quaternions, by default in the default dtype."""
+        full: np.ndarray = np.zeros((n, 4), dtype=dtype or get_default_dtype())
+        full[:, 0] = 1
+        return cls(full)
+
+    @classmethod
+    def from_quaternions(
+        cls, quaternions: Sequence[rl.Quaternion], dtype: Optional[DTypeLike] = None
+    ) -> QuaternionArray:
+        """Creates a batch from a sequence of quaternions.
+
+        Args:
+            quaternions: The quaternions to collect.
+            dtype: Optional dtype of the batch, by default the default dtype.
+
+        Returns:
+            The batch holding copies of the quaternions.
+        """
+        return cls([q.full.tolist() for q in quaternions], dtype)
+
+    def to_quaternions(self) -> list[rl.Quaternion]:
+        """Returns the batch as a list of quaternions."""
+        return [rl.Quaternion(*row) for row in self.full.tolist()]
+
+    @classmethod
+    def from_angle_and_axis(
+        cls, theta: ArrayLike, axis: ArrayLike, dtype: Optional[DTypeLike] = None
+    ) -> QuaternionArray:
+        """Creates a batch of quaternions from angles and axes of rotation.
+
+        Follows the convention of Quaternion.from_angle_and_axis.
+
+        Args:
+            theta: The angles in radians, shape (N,) or scalar.
+            axis: The axes of rotation, shape (N, 3) or (3,).
+            dtype: Optional dtype to convert the angles and axes to.
+
+        Returns:
+            The batch of quaternions.
+        """
+        theta = as_float_array(theta, dtype)
+        axis = as_float_array(axis, dtype)
+        axis = axis / np.linalg.norm(axis, axis=-1, keepdims=True)
+        w = np.cos(theta)
+        v = np.sin(theta)[..., np.newaxis] * axis
+        w, v = np.broadcast_arrays(w[..., np.newaxis], v)
+        return cls(np.concatenate([w[..., :1], v], axis=-1))
+
+    def normalize(self) -> None:
+        """Normalizes all quaternions in place."""
+        norm = _squared_norm_into(
+            self.full,
+            scratch("normalize_norm", self.full.shape[:1], self.dtype),
+            "normalize_term",
+        )
+        np.sqrt(norm, out=norm)
+        for i in range(4):
+            np.divide(self.full[:, i], norm, out=self.full[:, i])
+
+    def normalized(self) -> QuaternionArray:
+        """Returns a normalized copy of the batch."""
+        return QuaternionArray(self.full / self.norm()[:, np.newaxis])
+
+    def conjugate(self) -> None:
+        """Conjugates all quaternions in place."""
+        self.full[:, 1:] *= -1
+
+    def conjugated(self) -> QuaternionArray:
+        """Returns a conjugated copy of the batch."""
+        full = self.full.copy()
+        full[:, 1:] *= -1
+        return QuaternionArray(full)
+
+    def norm(self) -> np.ndarray:
+        """Returns the norms of the quaternions as an (N,) array."""
+        return np.sqrt(np.einsum("ij,ij->i", self.full, self.full))
+
+    @classmethod
+    def exp(
+        cls, vectors: ArrayLike, out: Optional[QuaternionArray] = None
+    ) -> QuaternionArray:
+        """Exponential map from a batch of pure quaternions to unit quaternions.
+
+        Args:
+            vectors: The vectorial parts of the pure quaternions, shape (N, 3).
+            out: Optional batch to store the quaternions in.
+
+        Returns:
+            The corresponding elements of the lie group.
+        """
+        if out is None:
+            return cls(rl.quaternion_exp(vectors))
+        rl.quaternion_exp(vectors, out=out.full)
+        return out
+
+    def log(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Logarithmic map to the lie algebra of unit quaternions.
+
+        Args:
+            out: Optional (N, 3) array to store the result in.
+
+        Returns:
+            The vectorial parts of the corresponding pure quaternions, shape (N, 3).
+        """
+        return rl.quaternion_log(self.full, out=out)
+
+    def inverse(self, out: Optional[QuaternionArray] = None) -> QuaternionArray:
+        """Returns the inverses of the quaternions.
+
+        Args:
+            out: Optional batch to store the inverses in. May be self.
+        """
+        if out is None:
+            squared_norm = np.einsum("ij,ij->i", self.full, self.full)
+            full = self.full / squared_norm[:, np.newaxis]
+            full[:, 1:] *= -1
+            return QuaternionArray(full)
+        squared_norm = _squared_norm_into(
+            self.full,
+            scratch("inverse_norm", self.full.shape[:1], self.dtype),
+            "inverse_term",
+        )
+        np.divide(self.full[:, 0], squared_norm, out=out.full[:, 0])
+        for i in range(1, 4):
+            np.divide(self.full[:, i], squared_norm, out=out.full[:, i])
+            np.negative(out.full[:, i], out=out.full[:, i])
+        return out
+
+
+def _components(
+    value: Union[QuaternionArray, rl.Quaternion, ArrayLike],
+) -> np.ndarray:
+    """Returns the (..., 4) component array of a quaternion-like value."""
+    if isinstance(value, QuaternionArray):
+        return value.full
+    if isinstance(value, rl.Quaternion):
+        return value.full
+    return as_float_array(value)
+
+
+def _operand(
+    value: Union[QuaternionArray, rl.Quaternion, ArrayLike],
+) -> Optional[np.ndarray]:
+    """Returns the components of a factor of a product, or None if unsupported."""
+    if isinstance(value, (QuaternionArray, rl.Quaternion)):
+        return value.full
+    try:
+        full = as_float_array(value)
+    except (TypeError, ValueError):
+        return None
+    if full.ndim == 0 or full.shape[-1] != 4:
+        return None
+    return full
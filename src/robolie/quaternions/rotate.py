@@ -5,19 +5,25 @@ Module for 3D rotations using quaternions
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import Optional, Union
 
 import numpy as np
-from numpy.typing import NDArray
+from numpy.typing import ArrayLike, DTypeLike, NDArray
 
 import robolie as rl
+from robolie.backend import kernel, loop_safe
+from robolie.precision import as_float_array
+from robolie.quaternions.quaternion_array import _components
+from robolie.workspace import scratch
 
 
 def rotate_by_quaternion(
-    vector: NDArray[np.float64],
+    vector: NDArray[np.floating],
     theta: Optional[float] = None,
-    axis: Optional[NDArray[np.float64]] = None,
+    axis: Optional[NDArray[np.floating]] = None,
     quaternion: Optional[rl.Quaternion] = None,
+    cache: Optional[rl.RotationCache] = None,
+    out: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     """Rotates a vector by a quaternion.
 
@@ -26,10 +32,24 @@ def rotate_by_quaternion(
         theta Optional[float]: The angle of rotation in radians.
         axis Optional[ndarray]: The axis of rotation as a 3D vector.
         quaternion Optional[Quaternion]: The quaternion representing the rotation.
+            A UnitQuaternion is applied directly, without checks or products.
+        cache Optional[RotationCache]: A cache of rotations applied repeatedly.
+            The rotation is looked up there and applied by its matrix.
+        out Optional[ndarray]: An array of shape (3,) to store the result in.
 
     Returns:
-        The rotated vector.
+        The rotated vector, in the floating point dtype of vector.
     """
+    if cache is not None:
+        vector = as_float_array(vector)
+        matrix = cache.matrix(theta, axis, quaternion)
+        return np.matmul(matrix.astype(vector.dtype, copy=False), vector, out=out)
+    if isinstance(quaternion, rl.UnitQuaternion):
+        if out is not None:
+            return quaternion.rotate(vector, out=out)
+        rotated = quaternion.rotate(vector)
+        return rotated.astype(as_float_array(vector).dtype, copy=False)
+
     p: rl.Quaternion = rl.Quaternion(0, *vector)
 
     if quaternion is not None:
@@ -38,16 +58,137 @@ def rotate_by_quaternion(
         assert (
             theta is not None and axis is not None
         ), "Either a quaternion or an angle and an axis must be provided."
-        assert np.isclose(np.linalg.norm(axis), 1), "The axis must be a unit vector."
+        assert rl.isclose(np.linalg.norm(axis), 1), "The axis must be a unit vector."
         q = rl.Quaternion.from_angle_and_axis(theta / 2, axis)
 
     q_conj: rl.Quaternion = q.conjugated()
     p_rot: rl.Quaternion = q * p * q_conj
-    return p_rot.vector
+    if out is not None:
+        out[...] = p_rot.vector
+        return out
+    return np.array(p_rot.vector, dtype=as_float_array(vector).dtype)
+
+
+def quaternion_to_rotation_matrix(
+    quaternions: Union[rl.Quaternion, rl.QuaternionArray, ArrayLike],
+) -> np.ndarray:
+    """Converts unit quaternions to 3x3 rotation matrices.
+
+    Args:
+        quaternions: A quaternion, a batch of quaternions or an array of shape
+            (..., 4) ordered as (w, x, y, z). The quaternions must be normalized.
+
+    Returns:
+        The rotation matrices, shape (..., 3, 3).
+    """
+    q = _components(quaternions)
+    w, x, y, z = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+
+    matrix = np.empty(q.shape[:-1] + (3, 3), dtype=q.dtype)
+    matrix[..., 0, 0] = 1 - 2 * (yy + zz)
+    matrix[..., 0, 1] = 2 * (xy - wz)
+    matrix[..., 0, 2] = 2 * (xz + wy)
+    matrix[..., 1, 0] = 2 * (xy + wz)
+    matrix[..., 1, 1] = 1 - 2 * (xx + zz)
+    matrix[..., 1, 2] = 2 * (yz - wx)
+    matrix[..., 2, 0] = 2 * (xz - wy)
+    matrix[..., 2, 1] = 2 * (yz + wx)
+    matrix[..., 2, 2] = 1 - 2 * (xx + yy)
+    return matrix
+
+
+def rotate_points(
+    points: ArrayLike,
+    rotations: Union[rl.Quaternion, rl.QuaternionArray, ArrayLike],
+    out: Optional[np.ndarray] = None,
+    dtype: Optional[DTypeLike] = None,
+) -> np.ndarray:
+    """Rotates a set of points by unit quaternions in one vectorized pass.
+
+    A single rotation is applied to every point through its rotation matrix.
+    A batch of rotations is paired with the points elementwise, following numpy
+    broadcasting of the leading dimensions, using the expanded form
+    v + 2w(u x v) + 2u x (u x v) of the product q * v * q^*.
+
+    Args:
+        points: The points to rotate, shape (N, 3) or (3,).
+        rotations: A quaternion, a batch of quaternions or an array of shape
+            (M, 4). The quaternions must be normalized.
+        out: Optional array to store the rotated points in. May be points,
+            which are then rotated in place without temporary arrays.
+        dtype: Optional dtype to compute in, see robolie.precision. By default
+            the rotations are applied in the dtype of the points.
+
+    Returns:
+        The rotated points, with the broadcast shape of points and rotations.
+    """
+    points = as_float_array(points, dtype)
+    q = _components(rotations).astype(points.dtype, copy=False)
+    compiled = kernel("rotate")
+    # The loop only covers (N, 3) points with one quaternion each.
+    if (
+        compiled is not None
+        and points.ndim == 2
+        and points.shape[-1] == 3
+        and q.shape == (len(points), 4)
+    ):
+        if out is None:
+            out = np.empty(points.shape, dtype=points.dtype)
+        if out.shape == points.shape and loop_safe(out, points, q):
+            return compiled(points, q, out)
+    if out is not None:
+        return _rotate_points_into(points, q, out)
+
+    if q.ndim == 1:
+        matrix = quaternion_to_rotation_matrix(q)
+        return np.matmul(points, matrix.T, out=out)
+
+    w = q[..., :1]
+    u = q[..., 1:]
+    t = np.cross(u, points)
+    t *= 2
+    rotated = np.cross(u, t)
+    rotated += points
+    rotated += w * t
+    return rotated
+
+
+def _cross_into(
+    a: np.ndarray, b: np.ndarray, out: np.ndarray, term: np.ndarray
+) -> np.ndarray:
+    """Computes the cross products a x b into out, which must not overlap a or b."""
+    for i in range(3):
+        j, k = (i + 1) % 3, (i + 2) % 3
+        np.multiply(a[..., j], b[..., k], out=out[..., i])
+        np.multiply(a[..., k], b[..., j], out=term)
+        np.subtract(out[..., i], term, out=out[..., i])
+    return out
+
+
+def _rotate_points_into(
+    points: np.ndarray, q: np.ndarray, out: np.ndarray
+) -> np.ndarray:
+    """Computes rotate_points into out, using scratch arrays for intermediates."""
+    shape = out.shape[:-1]
+    work = scratch("rotate_work", (2,) + shape + (3,), out.dtype)
+    t, rotated = work
+    term = scratch("rotate_term", shape, out.dtype)
+    w, u = q[..., 0], q[..., 1:]
+    _cross_into(u, points, t, term)
+    np.multiply(t, 2, out=t)
+    _cross_into(u, t, rotated, term)
+    for i in range(3):
+        np.multiply(w, t[..., i], out=term)
+        np.add(rotated[..., i], term, out=rotated[..., i])
+    np.add(rotated, points, out=out)
+    return out
 
 
 def compute_average_rotation_quaternion(
-    rotations: list[tuple[float, np.ndarray]]
+    rotations: list[tuple[float, np.ndarray]],
 ) -> rl.Quaternion:
     """Computes the average of a set of 3D rotations, performed by queternions.
 
@@ -56,22 +197,18 @@ def compute_average_rotation_quaternion(
 
     Returns:
         The average rotation as a Unit Quaternion.
+
+    See also karcher_mean and markley_mean, which iterate to the
+    geodesic mean and handle large sets of rotations.
     """
 
     # Convert rotations to quaternions
-    quaternions = [
-        rl.Quaternion.from_angle_and_axis(theta / 2, axis) for theta, axis in rotations
-    ]
-
-    # Map all quaternions to the lie algebra
-    pure_quaternions = [rl.log(q) for q in quaternions]
+    angles = np.array([theta for theta, _ in rotations], dtype=np.float64)
+    axes = np.array([axis for _, axis in rotations], dtype=np.float64)
+    quaternions = rl.QuaternionArray.from_angle_and_axis(angles / 2, axes)
 
-    # Compute the average pure quaternion
-    average_pure_quaternion = rl.PureQuaternion(0, 0, 0)
-    for i in range(len(pure_quaternions)):
-        average_pure_quaternion += pure_quaternions[i]
-    average_pure_quaternion = average_pure_quaternion / len(pure_quaternions)
+    # Map all quaternions to the lie algebra and average there
+    average_pure_quaternion = quaternions.log().mean(axis=0)
 
     # Map the average pure quaternion back to the group using the exponential map
-    average_quaternion = rl.exp(average_pure_quaternion)
-    return average_quaternion
+    return rl.Quaternion(*rl.quaternion_exp(average_pure_quaternion))
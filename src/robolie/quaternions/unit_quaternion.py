@@ -0,0 +1,404 @@
+"""Unit quaternions whose norm is checked once, on construction.
+
+Quaternion.log and Quaternion.which_rotation check the norm on every call, and
+rotate_by_quaternion builds the rotation from scratch. UnitQuaternion and
+UnitQuaternionArray instead guarantee unit norm when they are created, so
+their operations skip these checks. Products of unit quaternions drift from
+unit norm by rounding errors only, which is corrected after every composition
+by the first-order renormalization q *= (3 - |q|^2) / 2. It needs no square
+root, and a squared norm 1 + e becomes 1 + O(e^2), so the drift stays bounded
+over arbitrarily long chains of compositions.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from numpy.typing import ArrayLike, DTypeLike
+
+import robolie as rl
+from robolie.quaternions.quaternion import PureQuaternion, Quaternion, _is_unit
+from robolie.quaternions.quaternion_array import (
+    QuaternionArray,
+    _components,
+    _squared_norm_into,
+    hamilton_product,
+)
+from robolie.workspace import scratch
+
+
+def _unit_product(a: Quaternion, b: Quaternion) -> tuple[float, float, float, float]:
+    """Returns the renormalized components of the product a * b."""
+    aw, ax, ay, az = a._w, a._x, a._y, a._z
+    bw, bx, by, bz = b._w, b._x, b._y, b._z
+    w = aw * bw - ax * bx - ay * by - az * bz
+    x = aw * bx + ax * bw + ay * bz - az * by
+    y = aw * by - ax * bz + ay * bw + az * bx
+    z = aw * bz + ax * by - ay * bx + az * bw
+    scale = 1.5 - 0.5 * (w * w + x * x + y * y + z * z)
+    return scale * w, scale * x, scale * y, scale * z
+
+
+class UnitQuaternion(Quaternion):
+    """A quaternion of unit norm, representing a rotation.
+
+    The norm is checked when the quaternion is created and whenever its
+    components are set, instead of in every operation. Products of unit
+    quaternions are unit quaternions again, renormalized to first order.
+    Products with other quaternions are plain quaternions.
+    """
+
+    __slots__ = ()
+
+    def __init__(
+        self, w: float, x: float, y: float, z: float, normalize: bool = False
+    ) -> None:
+        """Initializes a unit quaternion from its components.
+
+        Args:
+            w: The real part of the quaternion.
+            x: The first imaginary part of the quaternion.
+            y: The second imaginary part of the quaternion.
+            z: The third imaginary part of the quaternion.
+            normalize: If True, the components are normalized instead of
+                checked.
+
+        Raises:
+            ValueError: If the components do not have unit norm.
+        """
+        super().__init__(w, x, y, z)
+        if normalize:
+            norm = self.norm()
+            self._w, self._x, self._y, self._z = (
+                self._w / norm,
+                self._x / norm,
+                self._y / norm,
+                self._z / norm,
+            )
+        elif not _is_unit(self.norm()):
+            raise ValueError("Quaternion must be normalized.")
+
+    @classmethod
+    def _from_floats(cls, w: float, x: float, y: float, z: float) -> UnitQuaternion:
+        """Creates a unit quaternion from Python floats, skipping the check."""
+        q = cls.__new__(cls)
+        q._w = w
+        q._x = x
+        q._y = y
+        q._z = z
+        q._matrix = None
+        return q
+
+    @classmethod
+    def from_quaternion(
+        cls, quaternion: Quaternion, normalize: bool = False
+    ) -> UnitQuaternion:
+        """Creates a unit quaternion from a quaternion.
+
+        Args:
+            quaternion: The quaternion, which must have unit norm unless
+                normalize is True.
+            normalize: If True, the quaternion is normalized instead of checked.
+        """
+        if isinstance(quaternion, UnitQuaternion):
+            return cls._from_floats(
+                quaternion._w, quaternion._x, quaternion._y, quaternion._z
+            )
+        return cls(
+            quaternion._w, quaternion._x, quaternion._y, quaternion._z, normalize
+        )
+
+    def _set(self, w: float, x: float, y: float, z: float) -> None:
+        """Sets all components, checking that they have unit norm."""
+        w, x, y, z = float(w), float(x), float(y), float(z)
+        if not _is_unit(math.sqrt(w * w + x * x + y * y + z * z)):
+            raise ValueError("Quaternion must be normalized.")
+        super()._set(w, x, y, z)
+
+    @property
+    def real(self) -> float:
+        """Returns the real part of the quaternion."""
+        return self._w
+
+    @real.setter
+    def real(self, value: float) -> None:
+        """Sets the real part of the quaternion, which must keep unit norm."""
+        self._set(value, self._x, self._y, self._z)
+
+    def __mul__(self, other: Quaternion) -> Quaternion:
+        """Multiplies two quaternions, renormalizing products of unit quaternions."""
+        if isinstance(other, UnitQuaternion):
+            return UnitQuaternion._from_floats(*_unit_product(self, other))
+        return super().__mul__(other)
+
+    def compose(
+        self, other: Quaternion, out: Optional[Quaternion] = None
+    ) -> Quaternion:
+        """Returns the product self * other.
+
+        Args:
+            other: The right factor.
+            out: Optional quaternion to store the product in. May be self or
+                other. A unit quaternion only takes the product if other is a
+                unit quaternion, or if the product has unit norm.
+        """
+        if out is None:
+            return self * other
+        if isinstance(other, UnitQuaternion):
+            out._w, out._x, out._y, out._z = _unit_product(self, other)
+            out._matrix = None
+            return out
+        if isinstance(out, UnitQuaternion):
+            product = Quaternion.__mul__(self, other)
+            out._set(product._w, product._x, product._y, product._z)
+            return out
+        return super().compose(other, out)
+
+    @classmethod
+    def exp(
+        cls,
+        vector: Union[PureQuaternion, np.ndarray],
+        out: Optional[Quaternion] = None,
+    ) -> Quaternion:
+        """Exponential map from a pure quaternion or its vectorial part."""
+        if out is None:
+            out = cls._from_floats(1.0, 0.0, 0.0, 0.0)
+        return super().exp(vector, out=out)
+
+    def conjugated(self) -> UnitQuaternion:
+        """Returns a conjugated copy of the unit quaternion."""
+        return UnitQuaternion._from_floats(self._w, -self._x, -self._y, -self._z)
+
+    def normalized(self) -> UnitQuaternion:
+        """Returns a normalized copy of the unit quaternion."""
+        norm = self.norm()
+        return UnitQuaternion._from_floats(
+            self._w / norm, self._x / norm, self._y / norm, self._z / norm
+        )
+
+    def inverse(self, out: Optional[Quaternion] = None) -> Quaternion:
+        """Returns the inverse of the unit quaternion, its conjugate.
+
+        Args:
+            out: Optional quaternion to store the inverse in. May be self.
+        """
+        if out is None:
+            return self.conjugated()
+        out._w, out._x, out._y, out._z = self._w, -self._x, -self._y, -self._z
+        out._matrix = None
+        return out
+
+    def log(self, out: Optional[PureQuaternion] = None) -> PureQuaternion:
+        """Logarithmic map to the lie algebra, without checking the norm again.
+
+        Args:
+            out: Optional pure quaternion to store the result in.
+
+        Returns:
+            The corresponding element of the lie algebra.
+        """
+        return self._log(out)
+
+    def which_rotation(self) -> tuple:
+        """Returns the corresponding angle and axis of rotation."""
+        return self._which_rotation()
+
+
+class UnitQuaternionArray(QuaternionArray):
+    """A batch of unit quaternions stored in a single (N, 4) array.
+
+    The norms are checked once when the batch is created. Products of unit
+    quaternion batches are renormalized to first order, in place, and the
+    inverses are the conjugates. Writing to full or its views directly is not
+    checked.
+    """
+
+    def __init__(
+        self,
+        data: ArrayLike,
+        dtype: Optional[DTypeLike] = None,
+        normalize: bool = False,
+    ) -> None:
+        """Initializes a batch of unit quaternions from an array.
+
+        Args:
+            data: Array of shape (N, 4) or (4,), see QuaternionArray.
+            dtype: Optional dtype to convert the data to.
+            normalize: If True, the quaternions are normalized into a new
+                array instead of checked.
+
+        Raises:
+            ValueError: If the quaternions do not have unit norm.
+        """
+        super().__init__(data, dtype)
+        norms = self.norm()
+        if normalize:
+            self.full = self.full / norms[:, np.newaxis]
+        elif not np.all(rl.isclose(norms, 1)):
+            raise ValueError("Quaternions must be normalized.")
+
+    @classmethod
+    def _trusted(cls, full: np.ndarray) -> UnitQuaternionArray:
+        """Wraps an (N, 4) array known to hold unit quaternions, unchecked."""
+        batch = cls.__new__(cls)
+        batch.full = full
+        return batch
+
+    def __getitem__(
+        self, index: Union[int, slice, np.ndarray]
+    ) -> Union[Quaternion, QuaternionArray]:
+        """Returns a unit quaternion for an integer index, otherwise a batch.
+
+        Slices give views that share memory with this batch.
+        """
+        if isinstance(index, (int, np.integer)):
+            return UnitQuaternion._from_floats(*self.full[index].tolist())
+        return self._trusted(self.full[index])
+
+    def __setitem__(
+        self,
+        index: Union[int, slice, np.ndarray],
+        value: Union[Quaternion, QuaternionArray, ArrayLike],
+    ) -> None:
+        """Sets the quaternions at the given index, which must have unit norm."""
+        self.full[index] = _unit_components(value)
+
+    def __mul__(
+        self, other: Union[QuaternionArray, Quaternion, ArrayLike]
+    ) -> QuaternionArray:
+        """Multiplies two batches elementwise, with broadcasting.
+
+        Products with unit quaternions are renormalized unit quaternion
+        batches, products with other quaternions are plain batches.
+        """
+        if not _is_unit_type(other):
+            return super().__mul__(other)
+        product = hamilton_product(self.full, _components(other))
+        return self._trusted(_renormalize(product))
+
+    def __rmul__(self, other: Union[Quaternion, ArrayLike]) -> QuaternionArray:
+        """Multiplies a quaternion from the left onto every element of the batch."""
+        if not _is_unit_type(other):
+            return super().__rmul__(other)
+        product = hamilton_product(_components(other), self.full)
+        return self._trusted(_renormalize(product))
+
+    def __imul__(
+        self, other: Union[QuaternionArray, Quaternion, ArrayLike]
+    ) -> UnitQuaternionArray:
+        """Multiplies the batch in place from the right by unit quaternions."""
+        hamilton_product(self.full, _unit_components(other), out=self.full)
+        _renormalize(self.full)
+        return self
+
+    def compose(
+        self,
+        other: Union[QuaternionArray, Quaternion, ArrayLike],
+        out: Optional[QuaternionArray] = None,
+    ) -> QuaternionArray:
+        """Returns the elementwise products self * other.
+
+        Args:
+            other: The right factors, broadcast against the batch.
+            out: Optional batch to store the products in. May be self. A unit
+                quaternion batch requires other to have unit norm.
+        """
+        if out is None:
+            return self * other
+        if not isinstance(out, UnitQuaternionArray):
+            return super().compose(other, out)
+        hamilton_product(self.full, _unit_components(other), out=out.full)
+        _renormalize(out.full)
+        return out
+
+    def copy(self) -> UnitQuaternionArray:
+        """Returns a copy of the batch that does not share memory."""
+        return self._trusted(self.full.copy())
+
+    @classmethod
+    def from_quaternions(
+        cls, quaternions: Sequence[Quaternion], dtype: Optional[DTypeLike] = None
+    ) -> UnitQuaternionArray:
+        """Creates a batch from a sequence of unit quaternions."""
+        return cls([q.full.tolist() for q in quaternions], dtype)
+
+    def to_quaternions(self) -> list[Quaternion]:
+        """Returns the batch as a list of unit quaternions."""
+        return [UnitQuaternion._from_floats(*row) for row in self.full.tolist()]
+
+    def normalized(self) -> UnitQuaternionArray:
+        """Returns a normalized copy of the batch."""
+        return self._trusted(self.full / self.norm()[:, np.newaxis])
+
+    def conjugated(self) -> UnitQuaternionArray:
+        """Returns a conjugated copy of the batch."""
+        full = self.full.copy()
+        full[:, 1:] *= -1
+        return self._trusted(full)
+
+    @classmethod
+    def exp(
+        cls, vectors: ArrayLike, out: Optional[QuaternionArray] = None
+    ) -> QuaternionArray:
+        """Exponential map from a batch of pure quaternions to unit quaternions.
+
+        Args:
+            vectors: The vectorial parts of the pure quaternions, shape (N, 3).
+            out: Optional batch to store the quaternions in.
+
+        Returns:
+            The corresponding elements of the lie group.
+        """
+        if out is None:
+            return cls._trusted(rl.quaternion_exp(vectors).reshape(-1, 4))
+        rl.quaternion_exp(vectors, out=out.full)
+        return out
+
+    def inverse(self, out: Optional[QuaternionArray] = None) -> QuaternionArray:
+        """Returns the inverses of the unit quaternions, their conjugates.
+
+        Args:
+            out: Optional batch to store the inverses in. May be self.
+        """
+        if out is None:
+            return self.conjugated()
+        np.copyto(out.full[:, 0], self.full[:, 0])
+        np.negative(self.full[:, 1:], out=out.full[:, 1:])
+        return out
+
+
+def _is_unit_type(value: object) -> bool:
+    """Returns whether a value has unit norm by its type."""
+    return isinstance(value, (UnitQuaternion, UnitQuaternionArray))
+
+
+def _unit_components(
+    value: Union[QuaternionArray, Quaternion, ArrayLike],
+) -> np.ndarray:
+    """Returns the (..., 4) components of unit quaternions, checking other types.
+
+    Raises:
+        ValueError: If the value is not of a unit quaternion type and does not
+            have unit norm.
+    """
+    components = _components(value)
+    if not _is_unit_type(value):
+        norms = np.sqrt(np.einsum("...i,...i->...", components, components))
+        if not np.all(rl.isclose(norms, 1)):
+            raise ValueError("Quaternions must be normalized.")
+    return components
+
+
+def _renormalize(full: np.ndarray) -> np.ndarray:
+    """Applies q *= (3 - |q|^2) / 2 to quaternions along the last axis in place."""
+    shape = full.shape[:-1]
+    scale = _squared_norm_into(
+        full, scratch("renormalize_norm", shape, full.dtype), "renormalize_term"
+    )
+    np.multiply(scale, -0.5, out=scale)
+    np.add(scale, 1.5, out=scale)
+    for i in range(4):
+        np.multiply(full[..., i], scale, out=full[..., i])
+    return full
@@ -0,0 +1,99 @@
+"""Module for 3D rigid-body transformations, a unit quaternion and a translation."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import robolie as rl
+
+
+class SE3:
+    """Class for a single 3D rigid-body transformation p -> R p + t.
+
+    The rotation R is stored as a unit quaternion and the translation t as a
+    numpy array. The exponential and logarithmic maps use twists (rho, phi),
+    see SE3Array, which also handles batches of transformations.
+
+    Attributes:
+        rotation: The rotation as a unit quaternion.
+        translation: The translation vector, shape (3,).
+    """
+
+    def __init__(
+        self,
+        rotation: Optional[rl.Quaternion] = None,
+        translation: Optional[ArrayLike] = None,
+    ) -> None:
+        """Initializes a transformation, by default the identity.
+
+        Args:
+            rotation: The rotation as a unit quaternion.
+            translation: The translation vector.
+        """
+        self.rotation = rotation if rotation is not None else rl.Quaternion(1, 0, 0, 0)
+        if translation is None:
+            translation = np.zeros(3)
+        self.translation = np.asarray(translation, dtype=np.float64).reshape(3)
+
+    def __mul__(self, other: SE3) -> SE3:
+        """Composes two transformations, applying other first."""
+        if not isinstance(other, SE3):
+            return NotImplemented
+        translation = self.translation + rl.rotate_points(
+            other.translation, self.rotation
+        )
+        return SE3(self.rotation * other.rotation, translation)
+
+    def __str__(self) -> str:
+        return f"SE3({self.rotation}, {self.translation})"
+
+    def compose(self, other: SE3) -> SE3:
+        """Returns the composition self * other, applying other first."""
+        return self * other
+
+    @classmethod
+    def identity(cls) -> SE3:
+        """Returns the identity transformation."""
+        return cls()
+
+    def adjoint(self) -> np.ndarray:
+        """Returns the 6x6 adjoint matrix acting on twists, see SE3Array.adjoint."""
+        return rl.SE3Array(self.rotation.full, self.translation).adjoint()[0]
+
+    def act(self, points: ArrayLike) -> np.ndarray:
+        """Transforms points, see apply."""
+        return self.apply(points)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Returns the homogeneous 4x4 matrix of the transformation."""
+        matrix = np.eye(4)
+        matrix[:3, :3] = rl.quaternion_to_rotation_matrix(self.rotation)
+        matrix[:3, 3] = self.translation
+        return matrix
+
+    def inverse(self) -> SE3:
+        """Returns the inverse transformation."""
+        rotation = self.rotation.conjugated()
+        return SE3(rotation, -rl.rotate_points(self.translation, rotation))
+
+    @classmethod
+    def exp(cls, twist: ArrayLike) -> SE3:
+        """Exponential map from a twist (rho, phi) of shape (6,)."""
+        transform = rl.SE3Array.exp(twist)
+        return cls(
+            rl.Quaternion(*transform.rotations.full[0]), transform.translations[0]
+        )
+
+    def log(self) -> np.ndarray:
+        """Logarithmic map to a twist (rho, phi) of shape (6,)."""
+        return rl.SE3Array(self.rotation.full, self.translation).log()[0]
+
+    def apply(self, points: ArrayLike, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Transforms a point or an (N, 3) array of points."""
+        transformed = rl.rotate_points(points, self.rotation, out=out)
+        transformed += self.translation
+        return transformed
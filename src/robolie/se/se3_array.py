@@ -0,0 +1,247 @@
+"""Batches of 3D rigid-body transformations, unit quaternions and translations."""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import robolie as rl
+
+
+def se3_coefficients(
+    theta: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the coefficients (1 - cos)/theta^2, (theta - sin)/theta^3 and
+    (1 - A / (2B)) / theta^2 of the V-matrix and its inverse.
+
+    Here A = sin(theta)/theta and B = (1 - cos(theta))/theta^2. Taylor series
+    are used for small angles, where the closed forms cancel.
+    """
+    theta_sq = theta * theta
+    small = theta < 1e-2
+    safe_theta = np.where(small, 1, theta)
+    safe_sq = safe_theta * safe_theta
+    a, b = rl.rodrigues_coefficients(theta)
+    c = np.where(
+        small,
+        1 / 6 - theta_sq / 120 + theta_sq * theta_sq / 5040,
+        (safe_theta - np.sin(safe_theta)) / (safe_sq * safe_theta),
+    )
+    d = np.where(
+        small,
+        1 / 12 + theta_sq / 720 + theta_sq * theta_sq / 30240,
+        (1 - a / (2 * np.where(small, 1, b))) / safe_sq,
+    )
+    return b, c, d
+
+
+def v_matrix(rotation_vectors: ArrayLike) -> np.ndarray:
+    """Returns the V-matrices I + B K + C K^2 relating twists and translations.
+
+    Args:
+        rotation_vectors: The rotational parts of the twists, shape (N, 3).
+
+    Returns:
+        The matrices, shape (N, 3, 3).
+    """
+    phi = np.asarray(rotation_vectors, dtype=np.float64).reshape(-1, 3)
+    b, c, _ = se3_coefficients(np.linalg.norm(phi, axis=-1))
+    k = rl.hat(phi)
+    matrix = b[:, np.newaxis, np.newaxis] * k
+    matrix += c[:, np.newaxis, np.newaxis] * (k @ k)
+    matrix += np.eye(3)
+    return matrix
+
+
+def inverse_v_matrix(rotation_vectors: ArrayLike) -> np.ndarray:
+    """Returns the inverses I - K / 2 + D K^2 of the V-matrices.
+
+    Args:
+        rotation_vectors: The rotational parts of the twists, shape (N, 3).
+
+    Returns:
+        The matrices, shape (N, 3, 3).
+    """
+    phi = np.asarray(rotation_vectors, dtype=np.float64).reshape(-1, 3)
+    _, _, d = se3_coefficients(np.linalg.norm(phi, axis=-1))
+    k = rl.hat(phi)
+    matrix = -0.5 * k
+    matrix += d[:, np.newaxis, np.newaxis] * (k @ k)
+    matrix += np.eye(3)
+    return matrix
+
+
+class SE3Array:
+    """Class for a batch of 3D rigid-body transformations.
+
+    Each transformation p -> R p + t is stored as a unit quaternion for the
+    rotation R and a translation vector t. The lie algebra se(3) is identified
+    with twists (rho, phi) of shape (6,), where phi is the rotation vector as
+    used by SO3 and rho the translational part.
+
+    Attributes:
+        rotations: The rotations as a QuaternionArray of length N.
+        translations: The (N, 3) array of translations.
+    """
+
+    def __init__(
+        self,
+        rotations: Union[rl.QuaternionArray, ArrayLike],
+        translations: ArrayLike,
+    ) -> None:
+        """Initializes a batch of transformations.
+
+        Args:
+            rotations: Unit quaternions, shape (N, 4) or (4,).
+            translations: Translations, shape (N, 3) or (3,).
+        """
+        if not isinstance(rotations, rl.QuaternionArray):
+            rotations = rl.QuaternionArray(rotations)
+        translations = np.asarray(translations)
+        if not np.issubdtype(translations.dtype, np.floating):
+            translations = translations.astype(np.float64)
+        translations = translations.reshape(-1, 3)
+        if len(translations) != len(rotations):
+            translations = np.broadcast_to(translations, (len(rotations), 3)).copy()
+        self.rotations = rotations
+        self.translations = translations
+
+    def __len__(self) -> int:
+        """Returns the number of transformations in the batch."""
+        return len(self.rotations)
+
+    def __getitem__(
+        self, index: Union[int, slice, np.ndarray]
+    ) -> Union[rl.SE3, SE3Array]:
+        """Returns a single transformation for an integer index, otherwise a batch."""
+        if isinstance(index, (int, np.integer)):
+            return rl.SE3(
+                rl.Quaternion(*self.rotations.full[index]), self.translations[index]
+            )
+        return SE3Array(self.rotations.full[index], self.translations[index])
+
+    def __mul__(self, other: Union[SE3Array, rl.SE3]) -> SE3Array:
+        """Composes the transformations elementwise, with broadcasting."""
+        other = _as_array(other)
+        rotations = self.rotations * other.rotations
+        translations = self.translations + rl.rotate_points(
+            other.translations, self.rotations
+        )
+        return SE3Array(rotations, translations)
+
+    def __rmul__(self, other: rl.SE3) -> SE3Array:
+        """Composes a single transformation from the left with the batch."""
+        return _as_array(other) * self
+
+    def __str__(self) -> str:
+        return f"SE3Array({self.rotations.full}, {self.translations})"
+
+    def compose(self, other: Union[SE3Array, rl.SE3]) -> SE3Array:
+        """Returns the elementwise compositions self * other."""
+        return self * other
+
+    def adjoint(self) -> np.ndarray:
+        """Returns the adjoint matrices acting on twists (rho, phi), shape (N, 6, 6).
+
+        With X exp(xi) X^-1 = exp(Ad xi), the matrices are [[R, t^ R], [0, R]].
+        """
+        rotation = rl.quaternion_to_rotation_matrix(self.rotations)
+        matrix = np.zeros((len(self), 6, 6), dtype=rotation.dtype)
+        matrix[:, :3, :3] = rotation
+        matrix[:, :3, 3:] = rl.hat(self.translations) @ rotation
+        matrix[:, 3:, 3:] = rotation
+        return matrix
+
+    def act(self, points: ArrayLike) -> np.ndarray:
+        """Transforms points, see apply."""
+        return self.apply(points)
+
+    @classmethod
+    def identity(cls, n: int = 1) -> SE3Array:
+        """Creates a batch of n identity transformations."""
+        return cls(rl.QuaternionArray.identity(n), np.zeros((n, 3)))
+
+    @classmethod
+    def from_transforms(cls, transforms: Sequence[rl.SE3]) -> SE3Array:
+        """Creates a batch from a sequence of transformations."""
+        return cls(
+            np.array([t.rotation.full for t in transforms]),
+            np.array([t.translation for t in transforms]),
+        )
+
+    @classmethod
+    def from_matrix(cls, matrix: ArrayLike) -> SE3Array:
+        """Creates transformations from homogeneous matrices, shape (N, 4, 4)."""
+        matrix = np.asarray(matrix, dtype=np.float64).reshape(-1, 4, 4)
+        rotations = rl.SO3(matrix[:, :3, :3]).to_quaternions()
+        return cls(rotations, matrix[:, :3, 3])
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Returns the homogeneous matrices, shape (N, 4, 4)."""
+        matrix = np.zeros((len(self), 4, 4), dtype=self.translations.dtype)
+        matrix[:, :3, :3] = rl.quaternion_to_rotation_matrix(self.rotations)
+        matrix[:, :3, 3] = self.translations
+        matrix[:, 3, 3] = 1
+        return matrix
+
+    def inverse(self) -> SE3Array:
+        """Returns the inverse transformations p -> R^T (p - t)."""
+        rotations = self.rotations.conjugated()
+        return SE3Array(rotations, -rl.rotate_points(self.translations, rotations))
+
+    @classmethod
+    def exp(cls, twists: ArrayLike) -> SE3Array:
+        """Exponential map from twists to transformations.
+
+        Args:
+            twists: The elements of the lie algebra (rho, phi), shape (N, 6).
+
+        Returns:
+            The corresponding transformations.
+        """
+        xi = np.asarray(twists, dtype=np.float64).reshape(-1, 6)
+        rho, phi = xi[:, :3], xi[:, 3:]
+        rotations = rl.QuaternionArray.exp(phi / 2)
+        translations = np.einsum("nij,nj->ni", v_matrix(phi), rho)
+        return cls(rotations, translations)
+
+    def log(self) -> np.ndarray:
+        """Logarithmic map from transformations to twists.
+
+        Returns:
+            The twists (rho, phi), shape (N, 6).
+        """
+        q = self.rotations.full
+        # Use the quaternion with non-negative real part, so that |phi| <= pi.
+        q = q * np.where(q[:, :1] < 0, -1, 1)
+        phi = 2 * rl.quaternion_log(q)
+        rho = np.einsum("nij,nj->ni", inverse_v_matrix(phi), self.translations)
+        return np.concatenate([rho, phi], axis=1)
+
+    def apply(self, points: ArrayLike, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Transforms points, pairing transformations and points as in rotate_points.
+
+        Args:
+            points: The points to transform, shape (N, 3) or (3,).
+            out: Optional array to store the transformed points in.
+
+        Returns:
+            The transformed points.
+        """
+        if len(self) == 1:
+            rotated = rl.rotate_points(points, self.rotations.full[0], out=out)
+            rotated += self.translations[0]
+        else:
+            rotated = rl.rotate_points(points, self.rotations, out=out)
+            rotated += self.translations
+        return rotated
+
+
+def _as_array(value: Union[SE3Array, rl.SE3]) -> SE3Array:
+    """Returns a transformation as a batch of transformations."""
+    if isinstance(value, SE3Array):
+        return value
+    return SE3Array(value.rotation.full, value.translation)
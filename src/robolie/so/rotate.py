@@ -0,0 +1,39 @@
+"""
+Module for 3D rotations using rotation matrices
+
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+def rotate_by_matrix(
+    points: ArrayLike, matrices: ArrayLike, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Rotates a set of points by rotation matrices in one vectorized pass.
+
+    A single matrix, of shape (3, 3) or (1, 3, 3), is applied to every point.
+    Otherwise matrices and points are paired elementwise, following numpy
+    broadcasting of the leading dimensions.
+
+    Args:
+        points: The points to rotate, shape (N, 3) or (3,).
+        matrices: The rotation matrices, shape (M, 3, 3) or (3, 3).
+        out: Optional array to store the rotated points in.
+
+    Returns:
+        The rotated points.
+    """
+    points = np.asarray(points)
+    matrices = np.asarray(matrices)
+    if matrices.ndim == 2 or matrices.shape[0] == 1:
+        return np.matmul(points, matrices.reshape(3, 3).T, out=out)
+    rotated = np.matmul(matrices, points[..., np.newaxis])[..., 0]
+    if out is None:
+        return rotated
+    out[...] = rotated
+    return out
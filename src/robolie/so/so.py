@@ -1,7 +1,11 @@
 """Module for the special orthogonal group in two and three dimensions."""
 
+import copy
+
 import numpy as np
 
+import robolie as rl
+
 
 class SO:
     """Special orthogonal group in two and three dimensions.
@@ -32,15 +36,68 @@ class SO:
         Returns:
             numpy.ndarray: The rotation matrix.
         """
-        return np.array([[np.cos(self.angle) + self.axis[0] ** 2 * (1 - np.cos(self.angle)),
-                          self.axis[0] * self.axis[1] * (1 - np.cos(self.angle)) - self.axis[2] * np.sin(self.angle),
-                          self.axis[0] * self.axis[2] * (1 - np.cos(self.angle)) + self.axis[1] * np.sin(self.angle)],
-                         [self.axis[1] * self.axis[0] * (1 - np.cos(self.angle)) + self.axis[2] * np.sin(self.angle),
-                          np.cos(self.angle) + self.axis[1] ** 2 * (1 - np.cos(self.angle)),
-                          self.axis[1] * self.axis[2] * (1 - np.cos(self.angle)) - self.axis[0] * np.sin(self.angle)],
-                         [self.axis[2] * self.axis[0] * (1 - np.cos(self.angle)) - self.axis[1] * np.sin(self.angle),
-                          self.axis[2] * self.axis[1] * (1 - np.cos(self.angle)) + self.axis[0] * np.sin(self.angle),
-                          np.cos(self.angle) + self.axis[2] ** 2 * (1 - np.cos(self.angle))]])
+        c, s = np.cos(self.angle), np.sin(self.angle)
+        x, y, z = self.axis
+        t = 1 - c
+        return np.array(
+            [
+                [c + x * x * t, x * y * t - z * s, x * z * t + y * s],
+                [y * x * t + z * s, c + y * y * t, y * z * t - x * s],
+                [z * x * t - y * s, z * y * t + x * s, c + z * z * t],
+            ]
+        )
+
+    def __mul__(self, other):
+        """Composes two rotations, applying other first."""
+        if not isinstance(other, SO):
+            return NotImplemented
+        return SO.exp(rl.SO3(self.matrix @ other.matrix).log()[0])
+
+    def compose(self, other):
+        """Returns the composition self * other."""
+        return self * other
+
+    @classmethod
+    def identity(cls):
+        """Returns the identity rotation."""
+        return cls(0.0, np.array([0.0, 0.0, 1.0]))
+
+    @classmethod
+    def exp(cls, rotation_vector):
+        """Exponential map from a rotation vector, angle times unit axis.
+
+        Args:
+            rotation_vector (numpy.ndarray): The element of the lie algebra.
+
+        Returns:
+            SO: The corresponding rotation.
+        """
+        rotation_vector = np.asarray(rotation_vector, dtype=np.float64).reshape(3)
+        angle = np.linalg.norm(rotation_vector)
+        if angle == 0:
+            return cls.identity()
+        return cls(angle, rotation_vector / angle)
+
+    def log(self):
+        """Logarithmic map to the rotation vector, angle times unit axis.
+
+        Returns:
+            numpy.ndarray: The element of the lie algebra.
+        """
+        return self.angle * np.asarray(self.axis, dtype=np.float64)
+
+    def inverse(self):
+        """Returns the inverse rotation."""
+        return SO(-self.angle, self.axis)
+
+    def adjoint(self):
+        """Returns the adjoint matrix acting on rotation vectors, the matrix."""
+        return self.matrix.copy()
+
+    def act(self, points):
+        """Rotates a point or an (N, 3) array of points."""
+        return np.asarray(points) @ self.matrix.T
+
     def __str__(self):
         return "Special orthogonal group in two and three dimensions"
 
@@ -57,7 +114,7 @@ class SO:
         return hash(SO)
 
     def __copy__(self):
-        return SO()
+        return SO(self.angle, self.axis)
 
     def __deepcopy__(self, memo):
-        return SO()
\ No newline at end of file
+        return SO(copy.deepcopy(self.angle, memo), copy.deepcopy(self.axis, memo))
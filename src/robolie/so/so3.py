@@ -0,0 +1,269 @@
+"""Module for batches of 3D rotations represented by rotation matrices."""
+
+from __future__ import annotations
+
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import robolie as rl
+
+
+def hat(vectors: ArrayLike) -> np.ndarray:
+    """Maps vectors to the skew-symmetric matrices of the cross product.
+
+    Args:
+        vectors: The vectors, shape (..., 3).
+
+    Returns:
+        The matrices K with K p = v x p, shape (..., 3, 3).
+    """
+    v = np.asarray(vectors)
+    x, y, z = v[..., 0], v[..., 1], v[..., 2]
+    matrix = np.zeros(v.shape[:-1] + (3, 3), dtype=np.result_type(v, np.float64))
+    matrix[..., 0, 1] = -z
+    matrix[..., 0, 2] = y
+    matrix[..., 1, 0] = z
+    matrix[..., 1, 2] = -x
+    matrix[..., 2, 0] = -y
+    matrix[..., 2, 1] = x
+    return matrix
+
+
+def vee(matrices: np.ndarray) -> np.ndarray:
+    """Inverse of hat, extracts the vectors of skew-symmetric matrices.
+
+    Args:
+        matrices: Skew-symmetric matrices, shape (..., 3, 3).
+
+    Returns:
+        The vectors, shape (..., 3).
+    """
+    return np.stack(
+        [matrices[..., 2, 1], matrices[..., 0, 2], matrices[..., 1, 0]], axis=-1
+    )
+
+
+def rodrigues_coefficients(theta: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Returns sin(theta) / theta and (1 - cos(theta)) / theta^2.
+
+    Taylor series are used for small angles, where the closed forms cancel.
+    """
+    theta_sq = theta * theta
+    small = theta < rl.SMALL_ANGLE
+    safe_theta = np.where(small, 1, theta)
+    a = np.where(
+        small,
+        1 - theta_sq / 6 + theta_sq * theta_sq / 120,
+        np.sin(theta) / safe_theta,
+    )
+    b = np.where(
+        small,
+        0.5 - theta_sq / 24 + theta_sq * theta_sq / 720,
+        2 * (np.sin(safe_theta / 2) / safe_theta) ** 2,
+    )
+    return a, b
+
+
+class SO3:
+    """Class for a batch of 3D rotations stored as an (N, 3, 3) array.
+
+    The lie algebra so(3) is identified with rotation vectors, whose direction
+    is the axis and whose length is the angle of rotation. Note that this is
+    twice the pure quaternion of the same rotation, as used by quaternion_exp.
+
+    Attributes:
+        matrix: The (N, 3, 3) rotation matrices.
+    """
+
+    def __init__(self, matrix: ArrayLike) -> None:
+        """Initializes a batch of rotations from rotation matrices.
+
+        Args:
+            matrix: Rotation matrices, shape (N, 3, 3) or (3, 3).
+        """
+        matrix = np.asarray(matrix)
+        if not np.issubdtype(matrix.dtype, np.floating):
+            matrix = matrix.astype(np.float64)
+        if matrix.ndim == 2:
+            matrix = matrix[np.newaxis]
+        if matrix.ndim != 3 or matrix.shape[1:] != (3, 3):
+            raise ValueError(
+                f"Expected an array of shape (N, 3, 3), got shape {matrix.shape}."
+            )
+        self.matrix = matrix
+
+    def __len__(self) -> int:
+        """Returns the number of rotations in the batch."""
+        return self.matrix.shape[0]
+
+    def __getitem__(self, index: Union[int, slice, np.ndarray]) -> SO3:
+        """Returns the selected rotations as a batch."""
+        if isinstance(index, (int, np.integer)):
+            index = slice(index, index + 1 if index != -1 else None)
+        return SO3(self.matrix[index])
+
+    def __mul__(self, other: SO3) -> SO3:
+        """Composes the rotations elementwise, with broadcasting."""
+        return SO3(np.matmul(self.matrix, other.matrix))
+
+    def __str__(self) -> str:
+        return f"SO3({self.matrix})"
+
+    def compose(self, other: SO3) -> SO3:
+        """Returns the elementwise products self * other."""
+        return self * other
+
+    def adjoint(self) -> np.ndarray:
+        """Returns the adjoint matrices acting on rotation vectors, R itself."""
+        return self.matrix.copy()
+
+    def act(self, points: ArrayLike) -> np.ndarray:
+        """Rotates points, see apply."""
+        return self.apply(points)
+
+    @classmethod
+    def identity(cls, n: int = 1) -> SO3:
+        """Creates a batch of n identity rotations."""
+        return cls(np.broadcast_to(np.eye(3), (n, 3, 3)).copy())
+
+    @classmethod
+    def exp(cls, rotation_vectors: ArrayLike) -> SO3:
+        """Exponential map from rotation vectors, using the Rodrigues formula.
+
+        Args:
+            rotation_vectors: The elements of the lie algebra, shape (N, 3).
+
+        Returns:
+            The corresponding rotations.
+        """
+        v = np.asarray(rotation_vectors, dtype=np.float64).reshape(-1, 3)
+        theta = np.linalg.norm(v, axis=-1)
+        a, b = rodrigues_coefficients(theta)
+        k = hat(v)
+        matrix = a[:, np.newaxis, np.newaxis] * k
+        matrix += b[:, np.newaxis, np.newaxis] * (k @ k)
+        matrix += np.eye(3)
+        return cls(matrix)
+
+    @classmethod
+    def from_angle_and_axis(cls, angles: ArrayLike, axes: ArrayLike) -> SO3:
+        """Creates rotations from angles and axes of rotation.
+
+        Args:
+            angles: The angles of rotation in radians, shape (N,) or scalar.
+            axes: The axes of rotation, shape (N, 3) or (3,).
+
+        Returns:
+            The rotations.
+        """
+        unit_axes = np.asarray(axes, dtype=np.float64)
+        unit_axes = unit_axes / np.linalg.norm(unit_axes, axis=-1, keepdims=True)
+        theta = np.asarray(angles, dtype=np.float64)
+        return cls.exp(theta[..., np.newaxis] * unit_axes)
+
+    @classmethod
+    def from_quaternions(
+        cls, quaternions: Union[rl.Quaternion, rl.QuaternionArray, ArrayLike]
+    ) -> SO3:
+        """Creates rotations from unit quaternions."""
+        return cls(rl.quaternion_to_rotation_matrix(quaternions))
+
+    def to_quaternions(self) -> rl.QuaternionArray:
+        """Returns the rotations as unit quaternions with non-negative real part.
+
+        Uses the method of Shepperd, selecting for each matrix the numerically
+        best conditioned of the four candidate formulas.
+        """
+        m = self.matrix
+        trace = np.trace(m, axis1=1, axis2=2)
+        diagonal = np.diagonal(m, axis1=1, axis2=2)
+        choice = np.argmax(np.column_stack([trace, diagonal]), axis=1)
+
+        q = np.empty((len(m), 4))
+        # The largest of 4w^2, 4x^2, 4y^2, 4z^2 is computed from the diagonal.
+        q[:, 0] = 1 + trace
+        q[:, 1] = 1 + 2 * diagonal[:, 0] - trace
+        q[:, 2] = 1 + 2 * diagonal[:, 1] - trace
+        q[:, 3] = 1 + 2 * diagonal[:, 2] - trace
+        w_x = m[:, 2, 1] - m[:, 1, 2]
+        w_y = m[:, 0, 2] - m[:, 2, 0]
+        w_z = m[:, 1, 0] - m[:, 0, 1]
+        x_y = m[:, 0, 1] + m[:, 1, 0]
+        x_z = m[:, 0, 2] + m[:, 2, 0]
+        y_z = m[:, 1, 2] + m[:, 2, 1]
+        products = np.array(
+            [
+                [q[:, 0], w_x, w_y, w_z],
+                [w_x, q[:, 1], x_y, x_z],
+                [w_y, x_y, q[:, 2], y_z],
+                [w_z, x_z, y_z, q[:, 3]],
+            ]
+        )
+        rows = np.arange(len(m))
+        # Row i of products holds 4 q_i q_j, normalize by the chosen component.
+        selected = products[choice, :, rows]
+        selected /= 2 * np.sqrt(selected[rows, choice])[:, np.newaxis]
+        selected *= np.where(selected[:, :1] < 0, -1, 1)
+        return rl.QuaternionArray(selected)
+
+    def log(self) -> np.ndarray:
+        """Logarithmic map to rotation vectors.
+
+        The angle is recovered with arctan2 from the skew-symmetric and the
+        symmetric part. Close to an angle of pi the axis is read off the
+        symmetric part, where the skew-symmetric part vanishes.
+
+        Returns:
+            The rotation vectors, shape (N, 3).
+        """
+        m = self.matrix
+        v = 0.5 * vee(m - np.swapaxes(m, 1, 2))
+        sin_theta = np.linalg.norm(v, axis=-1)
+        cos_theta = 0.5 * (np.trace(m, axis1=1, axis2=2) - 1)
+        theta = np.arctan2(sin_theta, cos_theta)
+
+        near_pi = cos_theta < -0.9
+        a, _ = rodrigues_coefficients(theta)
+        out = v / np.where(near_pi, 1, a)[:, np.newaxis]
+
+        if np.any(near_pi):
+            # The symmetric part equals cos(theta) I + (1 - cos(theta)) a a^T.
+            mp = m[near_pi]
+            sym = 0.5 * (mp + np.swapaxes(mp, 1, 2))
+            outer = (sym - cos_theta[near_pi, None, None] * np.eye(3)) / (
+                1 - cos_theta[near_pi, None, None]
+            )
+            rows = np.arange(len(mp))
+            column = np.argmax(np.diagonal(outer, axis1=1, axis2=2), axis=1)
+            axis = outer[rows, :, column]
+            axis /= np.linalg.norm(axis, axis=-1, keepdims=True)
+            sign = np.where(np.einsum("ij,ij->i", axis, v[near_pi]) < 0, -1, 1)
+            out[near_pi] = (sign * theta[near_pi])[:, np.newaxis] * axis
+        return out
+
+    def inverse(self) -> SO3:
+        """Returns the inverse rotations, the transposed matrices."""
+        return SO3(np.swapaxes(self.matrix, 1, 2))
+
+    def orthonormalize(self) -> None:
+        """Projects the matrices back onto SO(3) in place.
+
+        Uses the singular value decomposition, which gives the closest rotation
+        matrix in the Frobenius norm. Useful after many compositions.
+        """
+        u, _, vt = np.linalg.svd(self.matrix)
+        det = np.linalg.det(u @ vt)
+        u[:, :, -1] *= det[:, np.newaxis]
+        np.matmul(u, vt, out=self.matrix)
+
+    def orthonormalized(self) -> SO3:
+        """Returns a copy with the matrices projected back onto SO(3)."""
+        copy = SO3(self.matrix.copy())
+        copy.orthonormalize()
+        return copy
+
+    def apply(self, points: ArrayLike, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rotates points, see rotate_by_matrix."""
+        return rl.rotate_by_matrix(points, self.matrix, out=out)
@@ -0,0 +1,278 @@
+"""Module for storing long orientation and pose trajectories in binary files.
+
+A trajectory file consists of a fixed size header followed by contiguous
+records of a timestamp and either a quaternion (w, x, y, z) or a pose
+(w, x, y, z, tx, ty, tz). The records are stored little-endian in float32 or
+float64, and the timestamps in float64. Files are read through np.memmap, so
+opening a trajectory does not load it, and selecting a time range only touches
+the pages it covers.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import robolie as rl
+
+TRAJECTORY_MAGIC = b"RLTRAJ\x00\x00"
+TRAJECTORY_VERSION = 1
+# Magic, version, record width, itemsize and record count, padded to 64 bytes.
+_HEADER = struct.Struct("<8sIIIxxxxQ")
+HEADER_SIZE = 64
+_WIDTHS = {"quaternion": 4, "pose": 7}
+
+
+def record_dtype(width: int, dtype: Union[str, np.dtype, type]) -> np.dtype:
+    """Returns the structured dtype of one record of a trajectory file.
+
+    Args:
+        width: The number of data values per record, 4 or 7.
+        dtype: The floating point type of the data values.
+
+    Returns:
+        The dtype with the fields "time" and "data".
+    """
+    data_type = np.dtype(dtype).newbyteorder("<")
+    if data_type not in (np.dtype("<f4"), np.dtype("<f8")):
+        raise ValueError(f"Expected float32 or float64 data, got {dtype}.")
+    return np.dtype([("time", "<f8"), ("data", data_type, (width,))])
+
+
+class TrajectoryWriter:
+    """Writes a trajectory file chunk by chunk.
+
+    The record count in the header is updated after every chunk, so the file
+    is a valid trajectory at any point in time, even while being written.
+    Timestamps have to be non-decreasing across all chunks.
+
+    Attributes:
+        path: The path of the file.
+        kind: Either "quaternion" or "pose".
+        count: The number of records written so far.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        kind: str = "quaternion",
+        dtype: Union[str, np.dtype, type] = np.float64,
+        append: bool = False,
+    ) -> None:
+        """Opens a trajectory file for writing.
+
+        Args:
+            path: The path of the file.
+            kind: Either "quaternion" for (N, 4) or "pose" for (N, 7) records.
+            dtype: The floating point type of the stored records.
+            append: If True, an existing file is continued instead of
+                overwritten. Its kind and dtype take precedence.
+        """
+        self.path = path
+        if append and os.path.exists(path):
+            width, data_type, self.count = _read_header(path)
+            self.kind = "quaternion" if width == 4 else "pose"
+            self._dtype = record_dtype(width, data_type)
+            self._file = open(path, "r+b")
+            self._file.seek(HEADER_SIZE + self.count * self._dtype.itemsize)
+            self._file.truncate()
+            self._last_time = (
+                float(Trajectory(path).timestamps[-1]) if self.count else -np.inf
+            )
+        else:
+            if kind not in _WIDTHS:
+                raise ValueError(f"Expected kind 'quaternion' or 'pose', got {kind}.")
+            self.kind = kind
+            self._dtype = record_dtype(_WIDTHS[kind], dtype)
+            self.count = 0
+            self._last_time = -np.inf
+            self._file = open(path, "w+b")
+            self._write_header()
+
+    def _write_header(self) -> None:
+        """Writes the header at the start of the file and returns to the end."""
+        width = self._dtype["data"].shape[0]
+        itemsize = self._dtype["data"].base.itemsize
+        self._file.seek(0)
+        self._file.write(
+            _HEADER.pack(
+                TRAJECTORY_MAGIC, TRAJECTORY_VERSION, width, itemsize, self.count
+            ).ljust(HEADER_SIZE, b"\x00")
+        )
+        self._file.seek(0, os.SEEK_END)
+
+    def append(
+        self,
+        timestamps: ArrayLike,
+        data: Union[rl.QuaternionArray, rl.SE3Array, ArrayLike],
+    ) -> None:
+        """Appends a chunk of records to the file.
+
+        Args:
+            timestamps: The non-decreasing times of the records, shape (N,).
+            data: The quaternions, shape (N, 4), or poses, shape (N, 7), as an
+                array or as a QuaternionArray or SE3Array.
+        """
+        if isinstance(data, rl.QuaternionArray):
+            data = data.full
+        elif isinstance(data, rl.SE3Array):
+            data = np.concatenate([data.rotations.full, data.translations], axis=1)
+        times = np.asarray(timestamps, dtype=np.float64).reshape(-1)
+        values = np.asarray(data)
+        width = self._dtype["data"].shape[0]
+        if values.shape != (len(times), width):
+            raise ValueError(
+                f"Expected data of shape ({len(times)}, {width}), "
+                f"got shape {values.shape}."
+            )
+        if len(times) == 0:
+            return
+        if times[0] < self._last_time or np.any(np.diff(times) < 0):
+            raise ValueError("Timestamps must be non-decreasing.")
+
+        records = np.empty(len(times), dtype=self._dtype)
+        records["time"] = times
+        records["data"] = values
+        self._file.write(records.tobytes())
+        self.count += len(times)
+        self._last_time = float(times[-1])
+        self._write_header()
+
+    def close(self) -> None:
+        """Flushes and closes the file."""
+        self._file.close()
+
+    def __enter__(self) -> TrajectoryWriter:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+class Trajectory:
+    """A memory-mapped trajectory, or a contiguous range of one.
+
+    All arrays returned are read-only views into the mapped file, nothing is
+    copied until the values are used in a computation.
+
+    Attributes:
+        records: The structured array of records.
+        kind: Either "quaternion" or "pose".
+    """
+
+    def __init__(
+        self, path: Union[str, os.PathLike], records: Optional[np.ndarray] = None
+    ) -> None:
+        """Maps a trajectory file read-only.
+
+        Args:
+            path: The path of the file.
+            records: Internal, the records of a range of the trajectory.
+        """
+        self.path = path
+        if records is None:
+            width, data_type, count = _read_header(path)
+            dtype = record_dtype(width, data_type)
+            if count == 0:
+                records = np.empty(0, dtype=dtype)
+            else:
+                records = np.memmap(
+                    path, dtype=dtype, mode="r", offset=HEADER_SIZE, shape=(count,)
+                )
+        self.records = records
+        self.kind = "quaternion" if records.dtype["data"].shape[0] == 4 else "pose"
+
+    def __len__(self) -> int:
+        """Returns the number of records."""
+        return len(self.records)
+
+    def __getitem__(self, index: slice) -> Trajectory:
+        """Returns a range of records as a trajectory."""
+        if not isinstance(index, slice):
+            raise TypeError("Trajectories can only be indexed by slices.")
+        return Trajectory(self.path, self.records[index])
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Returns the timestamps, shape (N,)."""
+        return self.records["time"]
+
+    @property
+    def data(self) -> np.ndarray:
+        """Returns the raw records, shape (N, 4) or (N, 7)."""
+        return self.records["data"]
+
+    @property
+    def rotations(self) -> rl.QuaternionArray:
+        """Returns the rotations as a QuaternionArray viewing the file."""
+        return rl.QuaternionArray(self.data[:, :4])
+
+    @property
+    def poses(self) -> rl.SE3Array:
+        """Returns the poses as an SE3Array viewing the file."""
+        if self.kind != "pose":
+            raise ValueError("The trajectory does not contain poses.")
+        return rl.SE3Array(self.rotations, self.data[:, 4:])
+
+    def between(
+        self, start: Optional[float] = None, stop: Optional[float] = None
+    ) -> Trajectory:
+        """Returns the records with start <= time < stop.
+
+        The range is found by binary search on the timestamps, so only a few
+        pages of the file are read.
+
+        Args:
+            start: The start time, by default the beginning.
+            stop: The end time, excluded, by default the end.
+
+        Returns:
+            The range of the trajectory.
+        """
+        times = self.timestamps
+        first = 0 if start is None else int(np.searchsorted(times, start, "left"))
+        last = len(times) if stop is None else int(np.searchsorted(times, stop, "left"))
+        return self[first:last]
+
+
+def write_trajectory(
+    path: Union[str, os.PathLike],
+    timestamps: ArrayLike,
+    data: Union[rl.QuaternionArray, rl.SE3Array, ArrayLike],
+    dtype: Union[str, np.dtype, type] = np.float64,
+) -> None:
+    """Writes a whole trajectory to a file, see TrajectoryWriter.
+
+    Args:
+        path: The path of the file.
+        timestamps: The non-decreasing times, shape (N,).
+        data: Quaternions, shape (N, 4), or poses, shape (N, 7).
+        dtype: The floating point type of the stored records.
+    """
+    if isinstance(data, rl.SE3Array) or np.shape(data)[-1] == 7:
+        kind = "pose"
+    else:
+        kind = "quaternion"
+    with TrajectoryWriter(path, kind, dtype) as writer:
+        writer.append(timestamps, data)
+
+
+def _read_header(path: Union[str, os.PathLike]) -> tuple[int, np.dtype, int]:
+    """Returns the record width, data type and record count of a file."""
+    with open(path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or header[:8] != TRAJECTORY_MAGIC:
+        raise ValueError(f"{path} is not a trajectory file.")
+    _, version, width, itemsize, count = _HEADER.unpack_from(header)
+    if version != TRAJECTORY_VERSION:
+        raise ValueError(f"Unsupported trajectory file version {version}.")
+    if width not in _WIDTHS.values() or itemsize not in (4, 8):
+        raise ValueError(f"{path} has a corrupt header.")
+    data_type = np.dtype(f"<f{itemsize}")
+    # Records of an interrupted write beyond the stored count are ignored.
+    available = (os.path.getsize(path) - HEADER_SIZE) // (8 + width * itemsize)
+    return width, data_type, min(count, available)
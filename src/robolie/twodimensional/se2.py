@@ -0,0 +1,91 @@
+"""Rigid-body transformations in two spatial dimensions, a rotation and a
+translation."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import robolie as rl
+
+
+class SE2:
+    """Class for a single 2D rigid-body transformation p -> R p + t.
+
+    The exponential and logarithmic maps use twists (rho_x, rho_y, omega), see
+    SE2Array, which also handles batches of transformations.
+
+    Attributes:
+        rotation: The rotation as an SO2.
+        translation: The translation vector, shape (2,).
+    """
+
+    def __init__(
+        self, angle: float = 0.0, translation: Optional[ArrayLike] = None
+    ) -> None:
+        """Initializes a transformation, by default the identity.
+
+        Args:
+            angle: The angle of rotation in radians.
+            translation: The translation vector.
+        """
+        self.rotation = rl.SO2(angle)
+        if translation is None:
+            translation = np.zeros(2)
+        self.translation = np.asarray(translation, dtype=np.float64).reshape(2)
+
+    def __mul__(self, other: SE2) -> SE2:
+        """Composes two transformations, applying other first."""
+        if not isinstance(other, SE2):
+            return NotImplemented
+        translation = self.translation + self.rotation.matrix @ other.translation
+        return SE2(self.rotation.angle + other.rotation.angle, translation)
+
+    def __str__(self) -> str:
+        return f"SE2({self.rotation.angle}, {self.translation})"
+
+    def compose(self, other: SE2) -> SE2:
+        """Returns the composition self * other, applying other first."""
+        return self * other
+
+    @classmethod
+    def identity(cls) -> SE2:
+        """Returns the identity transformation."""
+        return cls()
+
+    def adjoint(self) -> np.ndarray:
+        """Returns the 3x3 adjoint matrix acting on twists, see SE2Array.adjoint."""
+        return rl.SE2Array(self.rotation.angle, self.translation).adjoint()[0]
+
+    def act(self, points: ArrayLike) -> np.ndarray:
+        """Transforms points, see apply."""
+        return self.apply(points)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Returns the homogeneous 3x3 matrix of the transformation."""
+        matrix = np.eye(3)
+        matrix[:2, :2] = self.rotation.matrix
+        matrix[:2, 2] = self.translation
+        return matrix
+
+    def inverse(self) -> SE2:
+        """Returns the inverse transformation."""
+        translation = -self.rotation.matrix.T @ self.translation
+        return SE2(-self.rotation.angle, translation)
+
+    @classmethod
+    def exp(cls, twist: ArrayLike) -> SE2:
+        """Exponential map from a twist (rho_x, rho_y, omega) of shape (3,)."""
+        transform = rl.SE2Array.exp(twist)
+        return cls(transform.rotations.angles[0], transform.translations[0])
+
+    def log(self) -> np.ndarray:
+        """Logarithmic map to a twist (rho_x, rho_y, omega) of shape (3,)."""
+        return rl.SE2Array(self.rotation.angle, self.translation).log()[0]
+
+    def apply(self, points: ArrayLike) -> np.ndarray:
+        """Transforms a point or an (N, 2) array of points."""
+        return np.asarray(points) @ self.rotation.matrix.T + self.translation
@@ -0,0 +1,185 @@
+"""Batches of 2D rigid-body transformations, angles and translations."""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import robolie as rl
+
+
+def se2_coefficients(theta: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Returns sin(theta)/theta and (1 - cos(theta))/theta of the V-matrix.
+
+    Taylor series are used for small angles, where the closed forms cancel.
+    """
+    theta_sq = theta * theta
+    small = np.abs(theta) < 1e-4
+    safe_theta = np.where(small, 1, theta)
+    a = np.where(small, 1 - theta_sq / 6, np.sin(theta) / safe_theta)
+    b = np.where(
+        small,
+        theta / 2 - theta * theta_sq / 24,
+        2 * np.sin(safe_theta / 2) ** 2 / safe_theta,
+    )
+    return a, b
+
+
+class SE2Array:
+    """Class for a batch of 2D rigid-body transformations p -> R p + t.
+
+    The rotations are stored as an SO2Array and the translations as an (N, 2)
+    array. The lie algebra se(2) is identified with twists (rho_x, rho_y,
+    omega) of shape (3,).
+
+    Attributes:
+        rotations: The rotations as an SO2Array of length N.
+        translations: The (N, 2) array of translations.
+    """
+
+    def __init__(
+        self, rotations: Union[rl.SO2Array, ArrayLike], translations: ArrayLike
+    ) -> None:
+        """Initializes a batch of transformations.
+
+        Args:
+            rotations: The rotations or their angles, shape (N,).
+            translations: Translations, shape (N, 2) or (2,).
+        """
+        if not isinstance(rotations, rl.SO2Array):
+            rotations = rl.SO2Array(rotations)
+        translations = np.asarray(translations)
+        if not np.issubdtype(translations.dtype, np.floating):
+            translations = translations.astype(np.float64)
+        translations = translations.reshape(-1, 2)
+        if len(translations) != len(rotations):
+            translations = np.broadcast_to(translations, (len(rotations), 2)).copy()
+        self.rotations = rotations
+        self.translations = translations
+
+    def __len__(self) -> int:
+        """Returns the number of transformations in the batch."""
+        return len(self.rotations)
+
+    def __getitem__(
+        self, index: Union[int, slice, np.ndarray]
+    ) -> Union[rl.SE2, SE2Array]:
+        """Returns a single transformation for an integer index, otherwise a batch."""
+        if isinstance(index, (int, np.integer)):
+            return rl.SE2(self.rotations.angles[index], self.translations[index])
+        return SE2Array(self.rotations.angles[index], self.translations[index])
+
+    def __mul__(self, other: Union[SE2Array, rl.SE2]) -> SE2Array:
+        """Composes the transformations elementwise, with broadcasting."""
+        other = _as_array(other)
+        translations = self.translations + self.rotations.apply(other.translations)
+        return SE2Array(self.rotations * other.rotations, translations)
+
+    def __rmul__(self, other: rl.SE2) -> SE2Array:
+        """Composes a single transformation from the left with the batch."""
+        return _as_array(other) * self
+
+    def __str__(self) -> str:
+        return f"SE2Array({self.rotations.angles}, {self.translations})"
+
+    def compose(self, other: Union[SE2Array, rl.SE2]) -> SE2Array:
+        """Returns the elementwise compositions self * other."""
+        return self * other
+
+    def adjoint(self) -> np.ndarray:
+        """Returns the adjoint matrices acting on twists, shape (N, 3, 3).
+
+        With X exp(xi) X^-1 = exp(Ad xi), the matrices are [[R, J t], [0, 1]]
+        with J t = (t_y, -t_x).
+        """
+        matrix = np.zeros((len(self), 3, 3), dtype=self.translations.dtype)
+        matrix[:, :2, :2] = self.rotations.matrix
+        matrix[:, 0, 2] = self.translations[:, 1]
+        matrix[:, 1, 2] = -self.translations[:, 0]
+        matrix[:, 2, 2] = 1
+        return matrix
+
+    def act(self, points: ArrayLike) -> np.ndarray:
+        """Transforms points, see apply."""
+        return self.apply(points)
+
+    @classmethod
+    def identity(cls, n: int = 1) -> SE2Array:
+        """Creates a batch of n identity transformations."""
+        return cls(np.zeros(n), np.zeros((n, 2)))
+
+    @classmethod
+    def from_transforms(cls, transforms: Sequence[rl.SE2]) -> SE2Array:
+        """Creates a batch from a sequence of transformations."""
+        return cls(
+            np.array([t.rotation.angle for t in transforms]),
+            np.array([t.translation for t in transforms]),
+        )
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Returns the homogeneous matrices, shape (N, 3, 3)."""
+        matrix = np.zeros((len(self), 3, 3), dtype=self.translations.dtype)
+        matrix[:, :2, :2] = self.rotations.matrix
+        matrix[:, :2, 2] = self.translations
+        matrix[:, 2, 2] = 1
+        return matrix
+
+    def inverse(self) -> SE2Array:
+        """Returns the inverse transformations p -> R^T (p - t)."""
+        rotations = self.rotations.inverse()
+        return SE2Array(rotations, -rotations.apply(self.translations))
+
+    @classmethod
+    def exp(cls, twists: ArrayLike) -> SE2Array:
+        """Exponential map from twists to transformations.
+
+        Args:
+            twists: The elements of the lie algebra (rho_x, rho_y, omega),
+                shape (N, 3).
+
+        Returns:
+            The corresponding transformations.
+        """
+        xi = np.asarray(twists, dtype=np.float64).reshape(-1, 3)
+        rho_x, rho_y, omega = xi[:, 0], xi[:, 1], xi[:, 2]
+        a, b = se2_coefficients(omega)
+        translations = np.stack([a * rho_x - b * rho_y, b * rho_x + a * rho_y], axis=1)
+        return cls(omega, translations)
+
+    def log(self) -> np.ndarray:
+        """Logarithmic map from transformations to twists.
+
+        Returns:
+            The twists (rho_x, rho_y, omega), shape (N, 3).
+        """
+        omega = self.rotations.log()
+        a, b = se2_coefficients(omega)
+        t_x, t_y = self.translations[:, 0], self.translations[:, 1]
+        det = a * a + b * b
+        rho_x = (a * t_x + b * t_y) / det
+        rho_y = (a * t_y - b * t_x) / det
+        return np.stack([rho_x, rho_y, omega], axis=1)
+
+    def apply(self, points: ArrayLike, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Transforms points, pairing transformations and points with broadcasting.
+
+        Args:
+            points: The points to transform, shape (N, 2) or (2,).
+            out: Optional array to store the transformed points in.
+
+        Returns:
+            The transformed points.
+        """
+        transformed = self.rotations.apply(points, out=out)
+        transformed += self.translations[0] if len(self) == 1 else self.translations
+        return transformed
+
+
+def _as_array(value: Union[SE2Array, rl.SE2]) -> SE2Array:
+    """Returns a transformation as a batch of transformations."""
+    if isinstance(value, SE2Array):
+        return value
+    return SE2Array(value.rotation.angle, value.translation)
@@ -1,14 +1,33 @@
-""" Rotations in two spatial dimensions. Including exponential
+"""Rotations in two spatial dimensions. Including exponential
 and logarithmic maps to and from the lie algebra of the unit
-circle/two-dimensional rotation group. """
+circle/two-dimensional rotation group."""
 
 from __future__ import annotations
 
+import math
+from typing import Optional
+
 import numpy as np
 
 
+def wrap_angle(angle):
+    """Maps angles to the interval (-pi, pi].
+
+    Args:
+        angle: A float or an array of angles in radians.
+
+    Returns:
+        The equivalent angles in (-pi, pi].
+    """
+    return np.pi - np.mod(np.pi - angle, 2 * np.pi)
+
+
 class SO2:
-    """Class for 2D rotations."""
+    """Class for 2D rotations.
+
+    The angle is kept in (-pi, pi], and the rotation matrix is computed on first
+    access and cached until the angle changes.
+    """
 
     def __init__(self, angle: float) -> None:
         """Initializes a 2D rotation.
@@ -18,22 +37,50 @@ class SO2:
         """
         self.angle = angle
 
+    @property
+    def angle(self) -> float:
+        """Returns the angle of rotation in (-pi, pi]."""
+        return self._angle
+
+    @angle.setter
+    def angle(self, value: float) -> None:
+        """Sets the angle of rotation."""
+        self._angle = float(wrap_angle(value))
+        self._matrix: Optional[np.ndarray] = None
+
     def __mul__(self, other: SO2) -> SO2:
         """Multiplies two 2D rotations."""
+        if not isinstance(other, SO2):
+            return NotImplemented
         return SO2(self.angle + other.angle)
 
+    def compose(self, other: SO2) -> SO2:
+        """Returns the product self * other."""
+        return self * other
+
+    @classmethod
+    def identity(cls) -> SO2:
+        """Returns the identity rotation."""
+        return cls(0.0)
+
+    def adjoint(self) -> np.ndarray:
+        """Returns the adjoint matrix, the 1x1 identity, as SO2 is abelian."""
+        return np.ones((1, 1))
+
+    def act(self, points: np.ndarray) -> np.ndarray:
+        """Rotates a point or an (N, 2) array of points."""
+        return np.asarray(points) @ self.matrix.T
+
     @property
     def matrix(self) -> np.ndarray:
-        return np.array(
-            [
-                [np.cos(self.angle), -np.sin(self.angle)],
-                [np.sin(self.angle), np.cos(self.angle)],
-            ]
-        )
+        if self._matrix is None:
+            c, s = math.cos(self.angle), math.sin(self.angle)
+            self._matrix = np.array([[c, -s], [s, c]])
+        return self._matrix
 
     @property
     def complex(self) -> complex:
-        return np.exp(1j * self.angle)
+        return complex(math.cos(self.angle), math.sin(self.angle))
 
     @classmethod
     def exp(cls, omega: float) -> SO2:
@@ -58,5 +105,9 @@ class SO2:
         """
         return self.angle
 
+    def inverse(self) -> SO2:
+        """Returns the inverse rotation."""
+        return SO2(-self.angle)
+
     def __str__(self) -> str:
         return f"SO2({self.angle})"
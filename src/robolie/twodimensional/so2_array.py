@@ -0,0 +1,219 @@
+"""Batches of rotations in two spatial dimensions stored in one array of angles."""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+import robolie as rl
+
+
+class SO2Array:
+    """Class for a batch of 2D rotations stored as an (N,) array of angles.
+
+    The angles are kept in (-pi, pi]. The cosines and sines, and with them the
+    matrix and complex representations, are computed on first access and
+    cached until the angles change.
+
+    Attributes:
+        angles: The (N,) array of angles in radians, a read-only view. Assign
+            to angles to change them.
+        matrix: The (N, 2, 2) rotation matrices.
+        complex: The (N,) unit complex numbers representing the rotations.
+    """
+
+    def __init__(self, angles: ArrayLike) -> None:
+        """Initializes a batch of 2D rotations.
+
+        Args:
+            angles: The angles of rotation in radians, shape (N,) or scalar.
+        """
+        self.angles = angles
+
+    @property
+    def angles(self) -> np.ndarray:
+        """Returns the angles of rotation in (-pi, pi] as a read-only view.
+
+        Writing through the view would bypass the cached cosines and sines.
+        """
+        angles = self._angles.view()
+        angles.flags.writeable = False
+        return angles
+
+    @angles.setter
+    def angles(self, value: ArrayLike) -> None:
+        """Sets the angles of rotation."""
+        angles = np.asarray(value)
+        if not np.issubdtype(angles.dtype, np.floating):
+            angles = angles.astype(np.float64)
+        self._angles = rl.wrap_angle(angles.reshape(-1))
+        self._cos_sin: Optional[tuple[np.ndarray, np.ndarray]] = None
+
+    def _cached_cos_sin(self) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the cosines and sines of the angles, computing them once."""
+        if self._cos_sin is None:
+            self._cos_sin = (np.cos(self._angles), np.sin(self._angles))
+        return self._cos_sin
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Returns the rotation matrices, shape (N, 2, 2)."""
+        c, s = self._cached_cos_sin()
+        matrix = np.empty(c.shape + (2, 2), dtype=c.dtype)
+        matrix[:, 0, 0] = c
+        matrix[:, 0, 1] = -s
+        matrix[:, 1, 0] = s
+        matrix[:, 1, 1] = c
+        return matrix
+
+    @property
+    def complex(self) -> np.ndarray:
+        """Returns the rotations as unit complex numbers, shape (N,)."""
+        c, s = self._cached_cos_sin()
+        return c + 1j * s
+
+    def __len__(self) -> int:
+        """Returns the number of rotations in the batch."""
+        return self._angles.shape[0]
+
+    def __getitem__(
+        self, index: Union[int, slice, np.ndarray]
+    ) -> Union[rl.SO2, SO2Array]:
+        """Returns a single rotation for an integer index, otherwise a batch."""
+        if isinstance(index, (int, np.integer)):
+            return rl.SO2(self._angles[index])
+        return SO2Array(self._angles[index])
+
+    def __mul__(self, other: Union[SO2Array, rl.SO2]) -> SO2Array:
+        """Composes the rotations elementwise, with broadcasting."""
+        if not isinstance(other, (SO2Array, rl.SO2)):
+            return NotImplemented
+        return SO2Array(self._angles + _angles(other))
+
+    def __rmul__(self, other: rl.SO2) -> SO2Array:
+        """Composes a single rotation from the left with every rotation."""
+        if not isinstance(other, rl.SO2):
+            return NotImplemented
+        return SO2Array(_angles(other) + self._angles)
+
+    def __str__(self) -> str:
+        return f"SO2Array({self._angles})"
+
+    def compose(self, other: Union[SO2Array, rl.SO2]) -> SO2Array:
+        """Returns the elementwise products self * other."""
+        return self * other
+
+    def adjoint(self) -> np.ndarray:
+        """Returns the adjoint matrices, 1x1 identities, shape (N, 1, 1)."""
+        return np.ones((len(self), 1, 1), dtype=self._angles.dtype)
+
+    def act(self, points: ArrayLike) -> np.ndarray:
+        """Rotates points, see apply."""
+        return self.apply(points)
+
+    @classmethod
+    def identity(cls, n: int = 1) -> SO2Array:
+        """Creates a batch of n identity rotations."""
+        return cls(np.zeros(n))
+
+    @classmethod
+    def from_rotations(cls, rotations: Sequence[rl.SO2]) -> SO2Array:
+        """Creates a batch from a sequence of 2D rotations."""
+        return cls(np.array([r.angle for r in rotations], dtype=np.float64))
+
+    def to_rotations(self) -> list[rl.SO2]:
+        """Returns the batch as a list of 2D rotations."""
+        return [rl.SO2(angle) for angle in self._angles.tolist()]
+
+    def inverse(self) -> SO2Array:
+        """Returns the inverse rotations."""
+        return SO2Array(-self._angles)
+
+    @classmethod
+    def exp(cls, omegas: ArrayLike) -> SO2Array:
+        """Exponential map to the lie group of 2D rotations.
+
+        Args:
+            omegas: The elements of the lie algebra to map, shape (N,).
+
+        Returns:
+            The corresponding elements of the lie group.
+        """
+        return cls(omegas)
+
+    def log(self) -> np.ndarray:
+        """Logarithmic map to the lie algebra of 2D rotations.
+
+        Returns:
+            The corresponding elements of the lie algebra, shape (N,).
+        """
+        return self._angles.copy()
+
+    def apply(self, points: ArrayLike, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Rotates points, pairing rotations and points with broadcasting.
+
+        Args:
+            points: The points to rotate, shape (N, 2) or (2,).
+            out: Optional array to store the rotated points in.
+
+        Returns:
+            The rotated points.
+        """
+        points = np.asarray(points)
+        c, s = self._cached_cos_sin()
+        if len(c) == 1:
+            c, s = c[0], s[0]
+        x, y = points[..., 0], points[..., 1]
+        if out is None:
+            out = np.empty(np.broadcast(x, c).shape + (2,), dtype=np.result_type(c, x))
+        rotated_x = c * x - s * y
+        out[..., 1] = s * x + c * y
+        out[..., 0] = rotated_x
+        return out
+
+    def mean(
+        self,
+        weights: Optional[ArrayLike] = None,
+        tolerance: float = 1e-12,
+        max_iterations: int = 100,
+    ) -> rl.SO2:
+        """Computes the Karcher mean of the rotations.
+
+        The iteration starts from the circular mean, the direction of the
+        (weighted) sum of the unit complex numbers, and re-centres the angle
+        differences at the current estimate until the update is below the
+        tolerance. Unlike an arithmetic mean of the angles it is not affected by
+        the wraparound at +-pi.
+
+        Args:
+            weights: Optional non-negative weights, shape (N,).
+            tolerance: The iteration stops once the update is smaller than this.
+            max_iterations: The maximal number of iterations.
+
+        Returns:
+            The mean rotation.
+        """
+        if len(self) == 0:
+            raise ValueError("Cannot average an empty set of rotations.")
+        if weights is None:
+            w = np.full(len(self), 1 / len(self))
+        else:
+            w = np.asarray(weights, dtype=np.float64)
+            w = w / w.sum()
+        c, s = self._cached_cos_sin()
+        mean = float(np.arctan2(w @ s, w @ c))
+        for _ in range(max_iterations):
+            step = float(w @ rl.wrap_angle(self._angles - mean))
+            mean += step
+            if abs(step) < tolerance:
+                break
+        return rl.SO2(mean)
+
+
+def _angles(value: Union[SO2Array, rl.SO2]) -> Union[np.ndarray, float]:
+    """Returns the angle or angles of a rotation or a batch of rotations."""
+    if isinstance(value, SO2Array):
+        return value.angles
+    return value.angle
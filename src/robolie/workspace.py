@@ -0,0 +1,41 @@
+"""Reusable scratch arrays for kernels that write into out= buffers.
+
+Kernels called with an out array keep their intermediate results in scratch
+arrays from here instead of temporaries, so a loop calling them with the same
+shapes over and over does not allocate after its first iteration. Every
+kernel uses its own names, and every thread has its own arrays. Only the last
+shape per name is kept, so the memory held stays bounded.
+"""
+
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+
+_local = threading.local()
+
+
+def scratch(name: str, shape: tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    """Returns an uninitialized scratch array, reused while the shape is unchanged.
+
+    Args:
+        name: The name of the scratch array, unique to the calling kernel.
+        shape: The shape of the array.
+        dtype: The data type of the array.
+
+    Returns:
+        The array. Its contents are left over from the previous use.
+    """
+    arrays = getattr(_local, "arrays", None)
+    if arrays is None:
+        arrays = _local.arrays = {}
+    array = arrays.get(name)
+    if array is None or array.shape != shape or array.dtype != dtype:
+        array = arrays[name] = np.empty(shape, dtype=dtype)
+    return array
+
+
+def release() -> None:
+    """Frees the scratch arrays of the calling thread."""
+    _local.arrays = {}
@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+import robolie as rl
+from robolie import backend, benchmark
+
+
+def random_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    q = rng.normal(size=(n, 4))
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    return q, rng.normal(size=(n, 3))
+
+
+def test_backend_selection():
+    assert "numpy" in rl.available_backends()
+    active = rl.get_backend()
+    with rl.use_backend("numpy"):
+        assert rl.get_backend() == "numpy"
+        assert backend.kernel("hamilton_product") is None
+    assert rl.get_backend() == active
+    with pytest.raises(ValueError):
+        rl.set_backend("fortran")
+
+
+def test_loops_match_numpy():
+    q, vectors = random_inputs(50)
+    # Edge cases of the maps: identity, -1, small and antipodal angles.
+    q[:4] = [[1, 0, 0, 0], [-1, 0, 0, 0], [1, 1e-6, 0, 0], [1e-9, 1, 0, 0]]
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    vectors[:2] = [[0, 0, 0], [1e-6, 0, 0]]
+    weights = np.linspace(0.1, 1, 50)
+    with rl.use_backend("numpy"):
+        expected = {
+            "hamilton_product": rl.hamilton_product(q, q[::-1]),
+            "rotate": rl.rotate_points(vectors, q),
+            "exp": rl.quaternion_exp(vectors),
+            "log": rl.quaternion_log(q),
+            "mean": (q * weights[:, np.newaxis]).T @ q,
+        }
+    loops = backend._LOOPS
+    results = {
+        "hamilton_product": loops["hamilton_product"](q, q[::-1], np.empty((50, 4))),
+        "rotate": loops["rotate"](vectors, q, np.empty((50, 3))),
+        "exp": loops["exp"](vectors, np.empty((50, 4)), rl.SMALL_ANGLE),
+        "log": loops["log"](q, np.empty((50, 3)), rl.SMALL_ANGLE),
+        "mean": loops["mean"](q, weights, np.empty((4, 4))),
+    }
+    for name, result in results.items():
+        assert np.allclose(result, expected[name]), name
+
+
+def test_loops_only_cover_matching_shapes(monkeypatch):
+    q, vectors = random_inputs(5)
+    with rl.use_backend("numpy"):
+        expected = rl.rotate_points(vectors, q)
+    # Stand in the plain loops for the compiled kernels.
+    monkeypatch.setattr(backend, "_active", "numba")
+    monkeypatch.setattr(backend, "_compiled", dict(backend._LOOPS))
+    assert np.allclose(rl.rotate_points(vectors, q), expected)
+
+    # Malformed trailing dimensions take the numpy path instead of the loops.
+    wide = np.ones((5, 5))
+    assert rl.hamilton_product(wide, wide).shape == (5, 4)
+    with pytest.raises(ValueError):
+        rl.rotate_points(q, q)
+    with pytest.raises(ValueError):
+        rl.quaternion_exp(q)
+    with pytest.raises(IndexError):
+        rl.quaternion_exp(vectors, out=np.empty((5, 3)))
+
+
+def test_loops_skip_overlapping_out(monkeypatch):
+    q, vectors = random_inputs(6)
+    with rl.use_backend("numpy"):
+        expected = rl.hamilton_product(q, q[::-1])
+        same = rl.hamilton_product(q, q)
+    monkeypatch.setattr(backend, "_active", "numba")
+    monkeypatch.setattr(backend, "_compiled", dict(backend._LOOPS))
+
+    # The loop itself is wrong for a reversed view of out, numpy is used instead.
+    o = q.copy()
+    assert not np.allclose(backend._hamilton_loop(o, o[::-1], o), expected)
+    o = q.copy()
+    assert np.allclose(rl.hamilton_product(o, o[::-1], out=o), expected)
+    o = q.copy()
+    assert np.allclose(rl.hamilton_product(o, o, out=o), same)
+
+
+def test_backends_agree():
+    pytest.importorskip("numba")
+    q, vectors = random_inputs(100)
+    outputs = []
+    for name in ("numpy", "numba"):
+        with rl.use_backend(name):
+            outputs.append(
+                [
+                    rl.hamilton_product(q, q[::-1]),
+                    rl.rotate_points(vectors, q),
+                    rl.quaternion_exp(vectors),
+                    rl.quaternion_log(q),
+                    rl.markley_mean(q).full,
+                ]
+            )
+    for numpy_result, numba_result in zip(*outputs):
+        assert np.allclose(numpy_result, numba_result)
+
+
+def test_benchmark_crossovers():
+    results = benchmark.run_benchmarks(["exp"], [1, 10], False, 0, backends=["numpy"])
+    assert {r["library"] for r in results} == {"robolie-numpy"}
+
+    times = {("a", 10): 1.0, ("a", 100): 2.0, ("b", 10): 2.0, ("b", 100): 1.0}
+    results = [
+        {"operation": "exp", "library": f"robolie-{b}", "size": s, "seconds": t}
+        for (b, s), t in times.items()
+    ]
+    crossovers = benchmark.find_crossovers(results)
+    assert [(c["size"], c["fastest"]) for c in crossovers] == [
+        (10, "robolie-a"),
+        (100, "robolie-b"),
+    ]
+    assert crossovers[1]["speedup"] == 2
@@ -0,0 +1,30 @@
+import json
+
+from robolie import benchmark
+
+
+def test_benchmark_run_and_compare(tmp_path):
+    results = benchmark.run_benchmarks(["hamilton_product", "log"], [1, 10], True, 0)
+    assert {(r["operation"], r["library"]) for r in results} == {
+        ("hamilton_product", "robolie"),
+        ("hamilton_product", "scipy"),
+        ("log", "robolie"),
+        ("log", "scipy"),
+    }
+    assert all(r["seconds"] > 0 and r["peak_bytes"] > 0 for r in results)
+
+    path = tmp_path / "results.json"
+    benchmark.save_results(str(path), results)
+    slower = [dict(r, seconds=2 * r["seconds"]) for r in results]
+    comparison = benchmark.compare_results(benchmark.load_results(str(path)), slower)
+    assert len(comparison) == len(results)
+    assert all(c["regression"] for c in comparison)
+
+    output = tmp_path / "cli.json"
+    argv = ["exp", "--sizes", "1", "10", "--min-time", "0", "--no-baseline"]
+    assert benchmark.main(argv + ["--output", str(output)]) == 0
+    assert len(json.loads(output.read_text())["results"]) == 2
+
+    results = benchmark.run_benchmarks(["quaternion_create_mul"], [1, 10], True, 0)
+    assert {r["library"] for r in results} == {"robolie", "scipy"}
+    assert all(r["peak_bytes"] > 0 for r in results)
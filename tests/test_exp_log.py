@@ -9,4 +9,32 @@ def test_exp_log():
     z = log_q
     assert type(log_q) == rl.PureQuaternion
     assert np.allclose(q.full,rl.exp(log_q).full)
-    assert np.allclose(z.vector, rl.log(rl.exp(z)).vector)
\ No newline at end of file
+    assert np.allclose(z.vector, rl.log(rl.exp(z)).vector)
+
+def test_batched_exp_log():
+    rng = np.random.default_rng(3)
+    vectors = rng.normal(size=(50, 3))
+    vectors *= (np.pi * rng.uniform(size=50) / np.linalg.norm(vectors, axis=1))[:, None]
+    quaternions = rl.exp(vectors)
+    assert quaternions.shape == (50, 4)
+    assert np.allclose(np.linalg.norm(quaternions, axis=1), 1)
+    assert np.allclose(rl.log(quaternions), vectors)
+    assert np.allclose(
+        quaternions, [rl.PureQuaternion(*v).exp().full for v in vectors]
+    )
+
+
+def test_exp_log_near_identity():
+    vectors = np.array([[0.0, 0.0, 0.0], [1e-9, 0, 0], [0, 3e-5, 4e-5]])
+    quaternions = rl.quaternion_exp(vectors)
+    assert np.all(np.isfinite(quaternions))
+    assert np.allclose(quaternions[0], [1, 0, 0, 0])
+    assert np.allclose(rl.quaternion_log(quaternions), vectors, rtol=1e-12, atol=0)
+    assert np.allclose(rl.PureQuaternion(0, 0, 0).exp().full, [1, 0, 0, 0])
+    assert np.allclose(rl.Quaternion(1, 0, 0, 0).log().vector, 0)
+
+
+def test_log_near_pi():
+    theta = np.pi - 1e-7
+    q = np.array([np.cos(theta), np.sin(theta), 0, 0])
+    assert np.isclose(rl.quaternion_log(q)[0], theta, rtol=1e-14)
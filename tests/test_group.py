@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+
+import robolie as rl
+
+
+def as_matrix(element):
+    """Returns the matrix representation of a group element of any type."""
+    if isinstance(element, rl.QuaternionArray):
+        return rl.quaternion_to_rotation_matrix(element)
+    if isinstance(element, rl.SO2Array):
+        return element.matrix
+    return element.matrix
+
+
+BATCHED_GROUPS = [
+    (rl.SO2Array, 1),
+    (rl.SO3, 3),
+    (rl.QuaternionArray, 3),
+    (rl.SE2Array, 3),
+    (rl.SE3Array, 6),
+]
+
+
+@pytest.mark.parametrize("group, dim", BATCHED_GROUPS)
+def test_protocol_of_batched_groups(group, dim):
+    rng = np.random.default_rng(dim)
+    algebra = 0.4 * rng.normal(size=(5, dim)).squeeze()
+    x = rl.exp(algebra, group=group)
+    xi = 0.3 * rng.normal(size=(5, dim)).squeeze()
+
+    assert rl.group_info(x).dimension == dim
+    assert np.allclose(rl.log(x), algebra)
+    identity = group.identity(5)
+    assert np.allclose(as_matrix(x.compose(identity)), as_matrix(x))
+    assert np.allclose(as_matrix(x.inverse().compose(x)), as_matrix(identity))
+
+    # X exp(xi) X^-1 = exp(Ad_X xi)
+    conjugated = x * group.exp(xi) * x.inverse()
+    adjoint = x.adjoint()
+    assert adjoint.shape == (5, dim, dim)
+    moved = np.einsum("nij,nj->ni", adjoint, xi.reshape(5, dim)).squeeze()
+    assert np.allclose(as_matrix(conjugated), as_matrix(group.exp(moved)))
+
+
+def test_scalar_groups_dispatch():
+    assert isinstance(rl.log(rl.SO2(0.5)), float)
+    assert rl.exp(0.5, group=rl.SO2).angle == 0.5
+    assert np.allclose(rl.log(rl.SE3.exp(np.arange(6) / 10)), np.arange(6) / 10)
+    rotation = rl.exp(np.array([0.0, 0.0, 0.5]), group=rl.SO)
+    assert isinstance(rotation, rl.SO)
+    assert np.allclose(rl.log(rotation * rotation), [0, 0, 1])
+    assert np.allclose(rotation.act([1.0, 0, 0]), [np.cos(0.5), np.sin(0.5), 0])
+
+    with pytest.raises(NotImplementedError):
+        rl.log("not a group element")
+
+
+def test_group_mean_and_interpolate():
+    rng = np.random.default_rng(9)
+    xi = 0.2 * rng.normal(size=(40, 3))
+    rotations = rl.SO3.exp(xi)
+    mean = rl.group_mean(rotations)
+    expected = rl.karcher_mean(rl.QuaternionArray.exp(xi / 2))
+    assert np.allclose(mean.matrix[0], rl.quaternion_to_rotation_matrix(expected))
+
+    transforms = [rl.SE2.exp(v) for v in 0.3 * rng.normal(size=(10, 3))]
+    mean = rl.group_mean(transforms)
+    residuals = [(mean.inverse() * t).log() for t in transforms]
+    assert np.allclose(np.mean(residuals, axis=0), 0, atol=1e-10)
+
+    a, b = rl.SE3.exp(np.arange(6) / 10), rl.SE3.exp(-np.arange(6) / 10)
+    assert np.allclose(rl.interpolate(a, b, 0).matrix, a.matrix)
+    assert np.allclose(rl.interpolate(a, b, 1).matrix, b.matrix)
+    middle = rl.interpolate(a, b, 0.5)
+    assert np.allclose((a.inverse() * middle).log(), (middle.inverse() * b).log())
+
+    q0 = rl.Quaternion(1, 0, 0, 0)
+    q1 = rl.Quaternion.from_angle_and_axis(0.5, np.array([0.0, 0.0, 1.0]))
+    assert np.allclose(rl.interpolate(q0, q1, 0.5).full, rl.slerp(q0, q1, 0.5))
+
+
+class Translation:
+    """The additive group of the plane, as a minimal plugged-in group."""
+
+    def __init__(self, vectors):
+        self.vectors = np.asarray(vectors, dtype=float).reshape(-1, 2)
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def __getitem__(self, index):
+        return Translation(self.vectors[index])
+
+    def __mul__(self, other):
+        return Translation(self.vectors + other.vectors)
+
+    def inverse(self):
+        return Translation(-self.vectors)
+
+    def log(self):
+        return self.vectors
+
+    @classmethod
+    def exp(cls, vectors):
+        return cls(vectors)
+
+
+def test_register_group():
+    rl.register_group(Translation, 2)
+    points = Translation(np.arange(10.0).reshape(5, 2))
+    assert np.allclose(rl.group_mean(points).vectors, [[4, 5]])
+    assert np.allclose(rl.exp([1, 2], group=Translation).vectors, [[1, 2]])
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+import robolie as rl
+
+# Modules which must not be imported by import robolie alone.
+HEAVY_MODULES = [
+    "numpy",
+    "scipy",
+    "matplotlib",
+    "pygame",
+    "pandas",
+    "plotly",
+    "multiprocessing",
+    "concurrent",
+]
+
+
+def imported_modules(code):
+    """Returns the cumulative import times in microseconds of running code."""
+    env = {k: v for k, v in os.environ.items() if k != "ROBOLIE_INSTRUMENT"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_is_lazy():
+    times = imported_modules("import robolie")
+    heavy = [m for m in times if m.split(".")[0] in HEAVY_MODULES]
+    assert heavy == []
+    # Generous budget, the import of the package itself is a few milliseconds.
+    assert times["robolie"] < 200_000
+
+    times = imported_modules("import robolie as rl; rl.Quaternion")
+    assert "numpy" in times
+    assert "robolie.quaternions.average" not in times
+    assert "concurrent.futures.process" not in times
+
+
+def test_lazy_names():
+    assert set(rl.__all__) <= set(dir(rl))
+    assert rl.exp is rl.exponential.exp
+    assert isinstance(rl.SO2(0.5) * rl.SO2(0.5), rl.SO2)
@@ -0,0 +1,67 @@
+import numpy as np
+
+import robolie as rl
+
+
+def random_quaternions(n, seed):
+    q = np.random.default_rng(seed).normal(size=(n, 4))
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+
+def brute_force_angles(queries, templates):
+    return 2 * np.arccos(np.clip(np.abs(queries @ templates.T), 0, 1))
+
+
+def test_nearest_matches_brute_force():
+    templates = random_quaternions(2000, 0)
+    queries = random_quaternions(50, 1)
+    index = rl.OrientationIndex(templates)
+
+    angles, indices = index.nearest(queries, k=5)
+    expected = brute_force_angles(queries, templates)
+    assert np.array_equal(indices, np.argsort(expected, axis=1)[:, :5])
+    assert np.allclose(angles, np.sort(expected, axis=1)[:, :5])
+
+    # Both signs of a template are the same rotation.
+    angle, nearest = index.nearest(-templates[7])
+    assert nearest[0] == 7 and angle[0] < 1e-7
+    angle, nearest = index.nearest(rl.Quaternion(*templates[8]), k=1)
+    assert nearest[0] == 8
+
+
+def test_within_and_insert():
+    templates = random_quaternions(1000, 2)
+    queries = random_quaternions(20, 3)
+    index = rl.OrientationIndex(templates[:900], rebuild_fraction=0.5)
+    assert np.array_equal(index.insert(templates[900:]), np.arange(900, 1000))
+    assert len(index) == 1000 and len(index._buffered) == 100
+
+    expected = brute_force_angles(queries, templates)
+    for result, angles in zip(index.within(queries, 0.5), expected):
+        assert np.array_equal(np.sort(result), np.flatnonzero(angles <= 0.5))
+        assert np.all(np.diff(angles[result]) >= 0)
+    _, indices = index.nearest(queries, k=3)
+    assert np.array_equal(indices, np.argsort(expected, axis=1)[:, :3])
+
+    index.insert(random_quaternions(400, 4))
+    assert len(index._buffered) == 0 and len(index) == 1400
+    _, indices = index.nearest(templates[950])
+    assert indices[0] == 950
+
+
+def test_queries_across_the_hemisphere_boundary():
+    # Rotations by nearly pi, whose quaternions have real parts close to zero.
+    templates = random_quaternions(500, 5)
+    templates[:, 0] *= 1e-2
+    templates /= np.linalg.norm(templates, axis=1, keepdims=True)
+    queries = templates[:20] + 1e-3 * random_quaternions(20, 6)
+    queries[:, 0] = -queries[:, 0]
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    index = rl.OrientationIndex(templates)
+
+    expected = brute_force_angles(queries, templates)
+    angles, indices = index.nearest(queries, k=4)
+    assert np.array_equal(indices, np.argsort(expected, axis=1)[:, :4])
+    assert np.allclose(angles, np.sort(expected, axis=1)[:, :4])
+    for result, row in zip(index.within(queries, 0.3), expected):
+        assert np.array_equal(np.sort(result), np.flatnonzero(row <= 0.3))
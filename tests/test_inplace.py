@@ -0,0 +1,110 @@
+import tracemalloc
+
+import numpy as np
+
+import robolie as rl
+
+
+def traced(step, iterations=100):
+    """Returns the memory held after and the peak while step runs repeatedly."""
+    step()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        for _ in range(iterations):
+            step()
+        return tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+
+def allocated(step, iterations=100):
+    """Returns the memory held after and the peak while step runs, in excess
+    of the bookkeeping of the measurement itself."""
+    current, peak = traced(step, iterations)
+    base_current, base_peak = traced(lambda: None, iterations)
+    return current - base_current, peak - base_peak
+
+
+def test_in_place_scalar_operations():
+    q = rl.Quaternion.from_angle_and_axis(0.3, np.array([0.0, 0.6, 0.8]))
+    p = rl.Quaternion(0.9, 0.1, -0.3, 0.2)
+    expected = q * p
+    q *= p
+    assert np.allclose(q.full, expected.full)
+    assert np.allclose(q.inverse(out=q).full, expected.inverse().full)
+
+    v = rl.PureQuaternion(0.1, 0.2, 0.3)
+    u = rl.PureQuaternion(-0.2, 0.5, 0.1)
+    expected_v = (v * u + u) / 2
+    v *= u
+    v += u
+    v /= 2
+    assert np.allclose(v.vector, expected_v.vector)
+
+    unit = rl.Quaternion(1, 0, 0, 0)
+    assert v.exp(out=unit) is unit
+    assert np.allclose(unit.full, v.exp().full)
+    assert np.allclose(unit.log(out=u).vector, v.vector)
+    vector = np.array([1.0, 2.0, 3.0])
+    expected_vector = rl.rotate_by_quaternion(vector, quaternion=unit)
+    assert np.allclose(unit.rotate(vector, out=vector), expected_vector)
+
+
+def test_control_loop_does_not_allocate():
+    attitude = rl.Quaternion(1, 0, 0, 0)
+    increment = rl.Quaternion(1, 0, 0, 0)
+    inverse = rl.Quaternion(1, 0, 0, 0)
+    rate = rl.PureQuaternion(1e-3, -2e-3, 5e-4)
+    error = rl.PureQuaternion(0, 0, 0)
+    command = rl.PureQuaternion(0, 0, 0)
+    thrust = np.array([0.0, 0.0, 1.0])
+    body_thrust = np.empty(3)
+
+    def step():
+        nonlocal attitude, error, command
+        rate.exp(out=increment)
+        attitude *= increment
+        attitude.normalize()
+        attitude.inverse(out=inverse)
+        inverse.log(out=error)
+        error /= 2.0
+        command += error
+        inverse.rotate(thrust, out=body_thrust)
+
+    assert allocated(step) == (0, 0)
+
+
+def test_batched_in_place_operations_do_not_scale_with_the_batch():
+    rng = np.random.default_rng(3)
+    n = 10000
+    rates = 1e-3 * rng.normal(size=(n, 3))
+    attitudes = rl.QuaternionArray(rng.normal(size=(n, 4)))
+    attitudes.normalize()
+    increments = rl.QuaternionArray.identity(n)
+    inverses = rl.QuaternionArray.identity(n)
+    errors = np.empty((n, 3))
+    points = rng.normal(size=(n, 3))
+
+    expected = (attitudes * rl.QuaternionArray.exp(rates)).normalized()
+    expected_points = rl.rotate_points(points, expected.inverse())
+
+    def step():
+        rl.QuaternionArray.exp(rates, out=increments)
+        attitudes.compose(increments, out=attitudes)
+        attitudes.normalize()
+        attitudes.inverse(out=inverses)
+        inverses.log(out=errors)
+        inverses.act(points, out=points)
+
+    step()
+    assert np.allclose(attitudes.full, expected.full)
+    assert np.allclose(errors, expected.inverse().log())
+    assert np.allclose(points, expected_points)
+
+    attitudes *= increments
+    # numpy keeps a few small objects cached between calls, but nothing of
+    # the size of the batch is allocated.
+    current, peak = allocated(step, 10)
+    assert current < 1024
+    assert peak < 16 * 1024 < errors.nbytes
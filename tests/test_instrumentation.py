@@ -0,0 +1,37 @@
+import pstats
+
+import numpy as np
+
+import robolie as rl
+
+
+def test_instrumentation_counts_calls(tmp_path):
+    original_exp = rl.exp
+    original_mul = rl.Quaternion.__mul__
+
+    with rl.instrument(allocations=True) as instrumentation:
+        q = rl.Quaternion.from_angle_and_axis(0.3, np.array([0.0, 0.0, 1.0]))
+        for _ in range(5):
+            q = q * q
+        rl.exp(np.ones((1000, 3)))
+        rl.karcher_mean(rl.quaternion_exp(0.1 * np.ones((100, 3))))
+
+    stats = instrumentation.stats()
+    assert stats["Quaternion.__mul__"]["calls"] == 5
+    assert stats["exp"]["calls"] == 1
+    # exp calls quaternion_exp, the time of the callee is not its own time
+    assert stats["quaternion_exp"]["calls"] >= 2
+    assert stats["exp"]["own_time"] < stats["exp"]["total_time"]
+    assert stats["exp"]["peak_bytes"] >= 1000 * 4 * 8
+    assert "karcher_mean" in instrumentation.table()
+
+    # The original functions are restored
+    assert rl.exp is original_exp
+    assert rl.Quaternion.__mul__ is original_mul
+    rl.exp(np.ones(3))
+    assert instrumentation.stats()["exp"]["calls"] == 1
+
+    path = tmp_path / "robolie.prof"
+    instrumentation.dump_stats(str(path))
+    profile = pstats.Stats(str(path))
+    assert profile.total_calls == sum(s["calls"] for s in stats.values())
@@ -0,0 +1,90 @@
+import robolie as rl
+
+import numpy as np
+import pytest
+
+
+def sequential_product(quaternions):
+    q = rl.Quaternion(*quaternions[0])
+    out = [q.full]
+    for row in quaternions[1:]:
+        q = q * rl.Quaternion(*row)
+        out.append(q.full)
+    return np.array(out)
+
+
+def test_cumulative_product():
+    rng = np.random.default_rng(21)
+    quaternions = rl.quaternion_exp(rng.normal(size=(37, 3)))
+    assert np.allclose(
+        rl.cumulative_product(quaternions), sequential_product(quaternions)
+    )
+
+
+def test_blocked_and_parallel_cumulative_product():
+    rng = np.random.default_rng(23)
+    quaternions = rl.quaternion_exp(0.1 * rng.normal(size=(1000, 3)))
+    expected = sequential_product(quaternions)
+
+    blocked = rl.cumulative_product(quaternions, block_size=16, renormalize=True)
+    assert np.allclose(blocked, expected)
+    assert np.allclose(np.linalg.norm(blocked, axis=1), 1, atol=1e-15, rtol=0)
+
+    parallel = rl.cumulative_product(quaternions, block_size=16, workers=3)
+    assert np.allclose(parallel, expected)
+
+    assert np.allclose(rl.reduce_product(quaternions), expected[-1])
+    assert np.allclose(rl.reduce_product(quaternions[:7]), expected[6])
+
+
+def test_constant_rotation_rate():
+    omega = np.tile([0.0, 0.0, 0.5], (1000, 1))
+    orientations = rl.integrate_angular_velocity(omega, dt=0.01, chunk_size=64)
+    angles = 0.5 * 0.01 * np.arange(1, 1001)
+    expected = rl.QuaternionArray.from_angle_and_axis(angles / 2, [0, 0, 1]).full
+    assert np.allclose(orientations, expected)
+
+
+def test_chunked_integration_with_timestamps():
+    rng = np.random.default_rng(22)
+    omega = rng.normal(size=(500, 3))
+    timestamps = np.cumsum(rng.uniform(0.001, 0.002, size=500))
+    initial = rl.Quaternion.from_angle_and_axis(0.3, np.array([1.0, 0.0, 0.0]))
+
+    whole = rl.integrate_angular_velocity(
+        omega, timestamps=timestamps, initial=initial, chunk_size=1000
+    )
+    chunked = rl.integrate_angular_velocity(
+        omega, timestamps=timestamps, initial=initial, chunk_size=7
+    )
+    assert np.allclose(whole, chunked)
+    assert np.allclose(whole[0], initial.full)
+
+    dt = np.diff(timestamps, prepend=timestamps[0])
+    increments = rl.quaternion_exp(omega * dt[:, None] / 2)
+    increments[0] = (initial * rl.Quaternion(*increments[0])).full
+    assert np.allclose(whole, sequential_product(increments))
+
+
+def test_empty_chunk_keeps_state():
+    integrator = rl.AngularVelocityIntegrator()
+    integrator.update(np.ones((3, 3)), np.array([0.0, 0.1, 0.2]))
+    orientation = integrator.orientation.copy()
+
+    result = integrator.update(np.empty((0, 3)), np.empty(0))
+    assert result.shape == (0, 4)
+    assert np.array_equal(integrator.orientation, orientation)
+    assert integrator.last_timestamp == 0.2
+
+
+def test_timestamps_must_match_samples():
+    omega = np.ones((5, 3))
+    integrator = rl.AngularVelocityIntegrator()
+    for timestamps in (np.arange(4.0), np.arange(6.0)):
+        with pytest.raises(ValueError):
+            integrator.update(omega, timestamps)
+        with pytest.raises(ValueError):
+            rl.integrate_angular_velocity(omega, timestamps=timestamps, chunk_size=2)
+    with pytest.raises(ValueError):
+        integrator.update(np.empty((0, 3)), [1.0])
+    assert integrator.last_timestamp is None
@@ -0,0 +1,39 @@
+import robolie as rl
+
+import numpy as np
+
+
+def test_slerp():
+    axis = np.array([0.0, 0.6, 0.8])
+    q0 = rl.Quaternion(1, 0, 0, 0)
+    q1 = rl.Quaternion.from_angle_and_axis(1.2, axis)
+    t = np.linspace(0, 1, 11)
+    path = rl.slerp(q0, q1, t)
+    assert path.shape == (11, 4)
+    expected = rl.QuaternionArray.from_angle_and_axis(1.2 * t, axis).full
+    assert np.allclose(path, expected)
+
+    # The antipodal representation gives the same rotations
+    assert np.allclose(rl.slerp(q0.full, -q1.full, t), expected)
+
+    # Identical end points
+    assert np.allclose(rl.slerp(q1, q1, t), q1.full)
+
+
+def test_quaternion_spline():
+    rng = np.random.default_rng(20)
+    times = np.cumsum(rng.uniform(0.5, 1.5, size=8))
+    keyframes = rl.quaternion_exp(0.5 * rng.normal(size=(8, 3)))
+    keyframes[3] *= -1
+    spline = rl.QuaternionSpline(times, keyframes)
+
+    # The spline passes through the keyframes, up to sign
+    values = spline(times)
+    assert np.allclose(np.abs(np.sum(values * keyframes, axis=1)), 1)
+
+    queries = np.linspace(times[0] - 1, times[-1] + 1, 10001)
+    values = spline(queries)
+    assert values.shape == (10001, 4)
+    assert np.allclose(np.linalg.norm(values, axis=1), 1)
+    # Continuity, no jumps between neighbouring query times
+    assert np.max(np.linalg.norm(np.diff(values, axis=0), axis=1)) < 1e-2
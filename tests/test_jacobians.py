@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+import robolie as rl
+
+
+def numerical_jacobians(group, xi, eps=1e-6):
+    """Finite differences of exp(xi + d) against exp(xi) from both sides."""
+    x = group.exp(xi)
+    n, k = xi.shape
+    left, right = np.zeros((n, k, k)), np.zeros((n, k, k))
+    for i in range(k):
+        d = np.zeros(k)
+        d[i] = eps
+        moved = group.exp(xi + d)
+        left[:, :, i] = np.asarray((moved * x.inverse()).log()).reshape(n, k) / eps
+        right[:, :, i] = np.asarray((x.inverse() * moved).log()).reshape(n, k) / eps
+    return left, right
+
+
+@pytest.mark.parametrize(
+    "group, k", [(rl.SO3, 3), (rl.QuaternionArray, 3), (rl.SE3Array, 6)]
+)
+@pytest.mark.parametrize("scale", [1.0, 1e-3, 0.0])
+def test_jacobians_match_finite_differences(group, k, scale):
+    xi = scale * np.random.default_rng(k).normal(size=(20, k))
+    if group is rl.QuaternionArray:
+        xi = xi / 2
+    left, right = numerical_jacobians(group, xi)
+
+    assert np.allclose(rl.left_jacobian(group, xi), left, atol=1e-5)
+    assert np.allclose(rl.right_jacobian(group, xi), right, atol=1e-5)
+    identity = np.broadcast_to(np.eye(k), (20, k, k))
+    assert np.allclose(rl.inverse_left_jacobian(group, xi) @ left, identity, atol=1e-5)
+    assert np.allclose(
+        rl.inverse_right_jacobian(group, xi) @ right, identity, atol=1e-5
+    )
+
+
+def test_se3_jacobians_near_small_angle_threshold():
+    phi = np.array([[0.0, 0.0, t] for t in (0.0999999, 0.1, 0.1000001)])
+    twists = np.hstack([np.ones((3, 3)), phi])
+    jacobians = rl.left_jacobian(rl.SE3, twists)
+    assert np.allclose(jacobians[0], jacobians[1], atol=1e-6)
+    assert np.allclose(jacobians[1], jacobians[2], atol=1e-6)
+    inverses = rl.inverse_left_jacobian(rl.SE3, twists)
+    assert np.allclose(inverses @ jacobians, np.eye(6))
+
+
+def test_shapes_and_adjoint():
+    assert rl.left_jacobian(rl.SO2, [0.3, 1.0]).shape == (2, 1, 1)
+    assert rl.right_jacobian(rl.SE3, np.arange(6)).shape == (1, 6, 6)
+    pure = rl.PureQuaternion(0.1, 0.2, 0.3)
+    assert np.allclose(
+        rl.left_jacobian(rl.Quaternion, pure), rl.left_jacobian(rl.SO3, 2 * pure.vector)
+    )
+
+    transforms = [rl.SE3.exp(v) for v in np.random.default_rng(0).normal(size=(4, 6))]
+    adjoints = rl.adjoint(transforms)
+    assert adjoints.shape == (4, 6, 6)
+    assert np.allclose(adjoints[2], transforms[2].adjoint())
+    assert rl.adjoint(rl.SO2(0.4)).shape == (1, 1, 1)
+
+    with pytest.raises(NotImplementedError):
+        rl.left_jacobian(rl.SE2, np.zeros(3))
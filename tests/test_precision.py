@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+import robolie as rl
+
+
+def random_quaternions(n, seed=0):
+    q = np.random.default_rng(seed).normal(size=(n, 4))
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+
+def test_default_dtype():
+    assert rl.get_default_dtype() == np.float64
+    with rl.default_dtype(np.float32):
+        assert rl.get_default_dtype() == np.float32
+        assert rl.QuaternionArray([[1, 0, 0, 0]]).full.dtype == np.float32
+        assert rl.QuaternionArray.identity(2).full.dtype == np.float32
+        assert rl.quaternion_exp([0, 0, 1]).dtype == np.float32
+    assert rl.get_default_dtype() == np.float64
+    assert rl.QuaternionArray([[1, 0, 0, 0]]).full.dtype == np.float64
+
+    # An explicit dtype overrides the policy.
+    assert rl.QuaternionArray([[1, 0, 0, 0]], dtype=np.float32).full.dtype == (
+        np.float32
+    )
+    with pytest.raises(ValueError):
+        rl.set_default_dtype(np.int32)
+
+
+def test_float32_end_to_end():
+    q64 = random_quaternions(1000)
+    q = q64.astype(np.float32)
+    batch = rl.QuaternionArray(q)
+    assert np.shares_memory(batch.full, q)
+
+    results = {
+        "product": (batch * batch).full,
+        "inverse": batch.inverse().full,
+        "exp": rl.quaternion_exp(q[:, 1:]),
+        "log": rl.quaternion_log(q),
+        "rotate": rl.rotate_points(q[:, 1:], batch),
+        "rotate single": rl.rotate_points(q[:, 1:], rl.Quaternion(*q64[0])),
+        "cumulative product": rl.cumulative_product(q),
+        "grouped average": rl.grouped_average(q, np.arange(1000) % 7)[1].full,
+    }
+    for name, result in results.items():
+        assert result.dtype == np.float32, name
+
+
+def test_interpolation_follows_default_dtype():
+    keyframes = random_quaternions(4).tolist()
+    with rl.default_dtype(np.float32):
+        assert rl.slerp(keyframes[0], keyframes[1], 0.5).dtype == np.float32
+        spline = rl.QuaternionSpline([0, 1, 2, 3], keyframes)
+        assert spline(np.linspace(0, 3, 7)).dtype == np.float32
+    assert rl.slerp(keyframes[0], keyframes[1], 0.5).dtype == np.float64
+
+
+def test_float16_promoted_to_float32():
+    q = random_quaternions(100).astype(np.float16)
+    assert rl.QuaternionArray(q).dtype == np.float32
+    assert rl.grouped_average(q, np.arange(100) % 3)[1].dtype == np.float32
+    assert rl.cumulative_product(q).dtype == np.float32
+    assert np.isclose(
+        abs(rl.markley_mean(q).full @ rl.markley_mean(q.astype(float)).full), 1
+    )
+
+
+def test_float32_accuracy():
+    q64 = random_quaternions(10000, seed=1)
+    p64 = random_quaternions(10000, seed=2)
+    q, p = q64.astype(np.float32), p64.astype(np.float32)
+    points = np.random.default_rng(3).normal(size=(10000, 3))
+    bounds = [
+        (rl.hamilton_product(q, p), rl.hamilton_product(q64, p64), 1e-6),
+        (rl.quaternion_exp(q[:, 1:]), rl.quaternion_exp(q64[:, 1:]), 1e-6),
+        (rl.quaternion_log(q), rl.quaternion_log(q64), 1e-5),
+        (
+            rl.rotate_points(points.astype(np.float32), q),
+            rl.rotate_points(points, q64),
+            1e-5,
+        ),
+        (
+            rl.cumulative_product(q[:1000]),
+            rl.cumulative_product(q64[:1000]),
+            1e-4,
+        ),
+    ]
+    for single, double, bound in bounds:
+        assert np.max(np.abs(single - double)) < bound
+
+    mean = rl.karcher_mean(q[:100])
+    assert np.abs(mean.full @ rl.karcher_mean(q64[:100]).full) > 1 - 1e-6
+
+
+def test_tolerances():
+    rtol64, atol64 = rl.tolerances(np.float64)
+    rtol32, atol32 = rl.tolerances(np.float32)
+    assert (rtol64, atol64) == (1e-5, 1e-8)
+    assert rtol32 > rtol64 and atol32 > atol64
+
+    # Rounding errors of float32 are within the float32 tolerances only.
+    assert rl.isclose(np.float32(1e-7), 0)
+    assert not rl.isclose(1e-7, 0)
+    assert rl.isclose(np.linalg.norm(np.float32([0.6, 0, 0.8])), 1)
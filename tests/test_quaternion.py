@@ -1,6 +1,7 @@
 import robolie as rl
 
 import numpy as np
+import pytest
 
 def test_quaternion_initialization():
     q = rl.Quaternion(1, 2, 3, 4)
@@ -30,4 +31,148 @@ def test_quaternion_averaging():
     avg_quaternion = rl.compute_average_rotation_quaternion(rotations)
     avg_angle, avg_axis = avg_quaternion.which_rotation()
     assert np.isclose(avg_angle, 0.9553166181245093)
-    assert np.allclose(avg_axis, np.array([0.0, 0.7071067811865475, 0.7071067811865475]))
\ No newline at end of file
+    assert np.allclose(avg_axis, np.array([0.0, 0.7071067811865475, 0.7071067811865475]))
+
+def test_karcher_and_markley_mean():
+    rng = np.random.default_rng(4)
+    center = rl.Quaternion.from_angle_and_axis(0.7, np.array([1.0, -2.0, 0.5]))
+    noise = rl.quaternion_exp(0.1 * rng.normal(size=(1000, 3)))
+    samples = rl.hamilton_product(center.full, noise)
+    # Flip half of the samples, q and -q are the same rotation
+    samples[::2] *= -1
+
+    karcher = rl.karcher_mean(samples)
+    markley = rl.markley_mean(samples)
+    assert abs(np.dot(karcher.full, center.full)) > 0.999
+    assert abs(np.dot(markley.full, center.full)) > 0.999
+
+    # The Karcher mean is a fixed point of the log-average-exp iteration
+    relative = rl.hamilton_product(karcher.conjugated().full, samples)
+    relative *= np.sign(relative[:, :1])
+    assert np.allclose(rl.quaternion_log(relative).mean(axis=0), 0, atol=1e-10)
+
+
+def test_weighted_mean():
+    q1 = rl.Quaternion.from_angle_and_axis(0.0, np.array([0.0, 0.0, 1.0]))
+    q2 = rl.Quaternion.from_angle_and_axis(0.6, np.array([0.0, 0.0, 1.0]))
+    samples = np.array([q1.full, q2.full])
+    mean = rl.karcher_mean(samples, weights=[1, 2])
+    angle, axis = mean.which_rotation()
+    assert np.isclose(angle, 0.8)
+    assert np.allclose(axis, [0, 0, 1])
+    assert np.isclose(abs(np.dot(rl.markley_mean(samples, [0, 1]).full, q2.full)), 1)
+
+
+def test_rotation_averager_modes():
+    rng = np.random.default_rng(5)
+    samples = rl.quaternion_exp(0.2 * rng.normal(size=(100, 3)))
+
+    cumulative = rl.RotationAverager()
+    for q in samples[:50]:
+        cumulative.update(q)
+    cumulative.update(rl.QuaternionArray(samples[50:]))
+    assert cumulative.count == 100
+    assert np.allclose(cumulative.value().full, rl.markley_mean(samples).full)
+
+    window = rl.RotationAverager("window", window=30)
+    window.update(samples[:45])
+    for q in samples[45:]:
+        window.update(q)
+    assert window.count == 30
+    assert np.allclose(window.value().full, rl.markley_mean(samples[-30:]).full)
+
+    decay = 0.9
+    exponential = rl.RotationAverager("exponential", decay=decay)
+    exponential.update(samples[:60])
+    exponential.update(samples[60:])
+    weights = decay ** np.arange(99, -1, -1)
+    expected = rl.markley_mean(samples, weights)
+    assert np.allclose(exponential.value().full, expected.full)
+
+    exponential.reset()
+    assert exponential.count == 0
+
+
+def test_rotation_averager_float32():
+    rng = np.random.default_rng(8)
+    samples = rl.quaternion_exp(0.2 * rng.normal(size=(100, 3))).astype(np.float32)
+    expected = rl.markley_mean(samples.astype(np.float64))
+    for averager in (
+        rl.RotationAverager(),
+        rl.RotationAverager("window", window=100),
+        rl.RotationAverager("exponential", decay=0.99999),
+    ):
+        averager.update(samples[:40])
+        for q in samples[40:]:
+            averager.update(q)
+        assert averager.dtype == np.float32
+        assert averager._matrix.dtype == np.float32
+        assert abs(np.dot(averager.value().full, expected.full)) > 1 - 1e-5
+
+    # An explicit dtype converts the samples, the default dtype applies to lists.
+    explicit = rl.RotationAverager(dtype=np.float32)
+    explicit.update(samples.astype(np.float64).tolist())
+    assert explicit._matrix.dtype == np.float32
+    with rl.default_dtype(np.float32):
+        assert rl.RotationAverager().dtype == np.float32
+    explicit.reset()
+    assert explicit.dtype == np.float32
+
+
+def test_grouped_average():
+    rng = np.random.default_rng(6)
+    samples = rl.quaternion_exp(0.3 * rng.normal(size=(500, 3)))
+    samples[::3] *= -1
+    groups = rng.integers(10, 60, size=500)
+    weights = rng.uniform(size=500)
+
+    ids, means = rl.grouped_average(samples, groups, weights, chunk_size=64)
+    assert np.array_equal(ids, np.unique(groups))
+    for group, mean in zip(ids, means.full):
+        expected = rl.markley_mean(samples[groups == group], weights[groups == group])
+        assert np.allclose(mean, expected.full)
+
+    parallel_ids, parallel = rl.grouped_average(
+        samples, groups, weights, workers=2, chunk_size=64
+    )
+    assert np.array_equal(parallel_ids, ids)
+    assert np.allclose(parallel.full, means.full)
+
+    for wrong in (weights[:-1], np.append(weights, 1.0)):
+        with pytest.raises(ValueError):
+            rl.grouped_average(samples, groups, wrong)
+
+
+def test_grouped_average_groups_spanning_chunks():
+    rng = np.random.default_rng(7)
+    samples = rl.quaternion_exp(0.3 * rng.normal(size=(1001, 3)))
+    for sizes in ([1, 1000], [5, 300, 696]):
+        groups = np.repeat(np.arange(len(sizes)), sizes)
+        ids, means = rl.grouped_average(samples, groups, chunk_size=64)
+        assert np.array_equal(ids, np.arange(len(sizes)))
+        for group, mean in zip(ids, means.full):
+            expected = rl.markley_mean(samples[groups == group])
+            assert np.allclose(mean, expected.full)
+
+
+def test_quaternion_matrix_is_lazy():
+    q = rl.Quaternion(1, 2, 3, 4)
+    assert not hasattr(q, "__dict__")
+    assert q._matrix is None
+    assert np.allclose(q.matrix, q.to_unitary_matrix())
+
+    # Mutations invalidate the cached matrix
+    q.conjugate()
+    assert np.allclose(q.matrix, rl.Quaternion(1, -2, -3, -4).to_unitary_matrix())
+    q[0] = 5
+    assert np.array_equal(q.full, [5, -2, -3, -4])
+
+    # The component arrays are read-only copies, writes raise.
+    with pytest.raises(ValueError):
+        q.full[0] = 6
+    with pytest.raises(ValueError):
+        q.vector[0] = 6
+    with pytest.raises(ValueError):
+        rl.PureQuaternion(1, 2, 3).vector[0] = 6
+    assert q[0] == 5
+    assert np.isclose(q.matrix[0, 0], 5 - 2j)
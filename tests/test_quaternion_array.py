@@ -0,0 +1,61 @@
+import robolie as rl
+
+import numpy as np
+import pytest
+
+
+def test_quaternion_array_multiplication():
+    q1 = rl.Quaternion(1, 2, 3, 4)
+    q2 = rl.Quaternion(5, 6, 7, 8)
+    a = rl.QuaternionArray([q1.full, q2.full])
+    b = rl.QuaternionArray([q2.full, q1.full])
+    c = a * b
+    assert np.allclose(c.full[0], (q1 * q2).full)
+    assert np.allclose(c.full[1], (q2 * q1).full)
+
+    # Broadcasting a single quaternion over the batch
+    assert np.allclose((a * q2).full[0], (q1 * q2).full)
+    assert np.allclose((q2 * a).full[0], (q2 * q1).full)
+
+
+def test_array_times_quaternion_array():
+    # Numpy arrays on the left are Hamilton products too, not elementwise.
+    left = np.array([[0, 0, 1, 0.0]])
+    product = left * rl.QuaternionArray([[0, 1, 0, 0]])
+    assert isinstance(product, rl.QuaternionArray)
+    assert np.allclose(product.full, [[0, 0, 0, -1]])
+    single = left[0] * rl.QuaternionArray([[0, 1, 0, 0]])
+    assert np.allclose(single.full, product.full)
+
+    batch = rl.QuaternionArray.identity(2)
+    for other in ("a", None, np.ones(3)):
+        with pytest.raises(TypeError):
+            batch * other
+        with pytest.raises(TypeError):
+            other * batch
+
+
+def test_quaternion_array_operations():
+    rng = np.random.default_rng(0)
+    qs = rl.QuaternionArray(rng.normal(size=(10, 4)))
+    scalars = qs.to_quaternions()
+
+    assert np.allclose(qs.norm(), [q.norm() for q in scalars])
+    assert np.allclose(qs.normalized().norm(), 1)
+    assert np.allclose(qs.conjugated().full, [q.conjugated().full for q in scalars])
+    assert np.allclose(qs.inverse().full, [q.inverse().full for q in scalars])
+    assert np.allclose((qs * qs.inverse()).full, rl.QuaternionArray.identity(10).full)
+
+    back = rl.QuaternionArray.from_quaternions(scalars)
+    assert np.allclose(back.full, qs.full)
+
+
+def test_quaternion_array_indexing():
+    qs = rl.QuaternionArray(np.arange(12.0).reshape(3, 4))
+    assert isinstance(qs[1], rl.Quaternion)
+    assert np.array_equal(qs[1].full, [4, 5, 6, 7])
+
+    view = qs[1:]
+    assert len(view) == 2
+    view.normalize()
+    assert np.allclose(qs.norm()[1:], 1)
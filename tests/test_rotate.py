@@ -0,0 +1,81 @@
+import robolie as rl
+
+import numpy as np
+
+
+def test_rotate_points_single_rotation():
+    rng = np.random.default_rng(1)
+    points = rng.normal(size=(20, 3))
+    axis = np.array([1.0, 2.0, 2.0]) / 3
+    q = rl.Quaternion.from_angle_and_axis(0.4, axis)
+
+    expected = [rl.rotate_by_quaternion(p, quaternion=q) for p in points]
+    assert np.allclose(rl.rotate_points(points, q), expected)
+
+    out = np.empty_like(points)
+    result = rl.rotate_points(points, q.full, out=out)
+    assert result is out
+    assert np.allclose(out, expected)
+
+
+def test_rotate_points_many_rotations():
+    rng = np.random.default_rng(2)
+    points = rng.normal(size=(20, 3))
+    qs = rl.QuaternionArray(rng.normal(size=(20, 4))).normalized()
+
+    expected = [
+        rl.rotate_by_quaternion(p, quaternion=q)
+        for p, q in zip(points, qs.to_quaternions())
+    ]
+    assert np.allclose(rl.rotate_points(points, qs), expected)
+
+    matrices = rl.quaternion_to_rotation_matrix(qs)
+    assert np.allclose(np.einsum("nij,nj->ni", matrices, points), expected)
+
+
+def test_rotation_cache():
+    cache = rl.RotationCache(maxsize=2)
+    axis = np.array([1.0, 2.0, 2.0]) / 3
+    vector = np.array([0.5, -1.0, 2.0])
+
+    expected = rl.rotate_by_quaternion(vector, 0.8, axis)
+    for _ in range(2):
+        rotated = rl.rotate_by_quaternion(vector, 0.8, axis, cache=cache)
+        assert np.allclose(rotated, expected)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Rounding errors in the key hit the same entry.
+    entry = cache.get(0.8 + 1e-15, axis * (1 + 1e-15))
+    assert entry.matrix is cache.get(0.8, axis).matrix
+    assert not entry.matrix.flags.writeable
+
+    # Changing a returned quaternion leaves the cached rotation unchanged.
+    entry.quaternion.real = 0.5
+    assert cache.get(0.8, axis).quaternion.real == np.cos(0.4)
+
+    q = rl.Quaternion.from_angle_and_axis(0.2, axis)
+    rotated = rl.rotate_by_quaternion(vector, quaternion=q, cache=cache)
+    assert np.allclose(rotated, rl.rotate_by_quaternion(vector, quaternion=q))
+    cache.get(0.1, axis)
+    assert len(cache) == 2
+    # The least recently used entry, the angle 0.8, was evicted.
+    cache.get(0.8, axis)
+    assert cache.stats()["misses"] == 4
+    assert cache.stats()["hit_rate"] == 4 / 8
+
+
+def test_rotate_by_quaternion_out_matches_product():
+    vector = np.array([1.0, 2.0, 3.0])
+    for q in (
+        rl.Quaternion(2, 0, 0, 0),
+        rl.Quaternion(1, 2, 3, 4),
+        rl.UnitQuaternion.from_angle_and_axis(0.4, np.array([0.0, 0.6, 0.8])),
+    ):
+        out = np.empty(3)
+        result = rl.rotate_by_quaternion(vector, quaternion=q, out=out)
+        assert result is out
+        assert np.allclose(out, rl.rotate_by_quaternion(vector, quaternion=q))
+    assert np.allclose(
+        rl.rotate_by_quaternion(vector, quaternion=rl.Quaternion(2, 0, 0, 0)),
+        4 * vector,
+    )
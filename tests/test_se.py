@@ -0,0 +1,64 @@
+import robolie as rl
+
+import numpy as np
+
+
+def random_twists(n, dim, seed):
+    return np.random.default_rng(seed).normal(size=(n, dim))
+
+
+def test_se3_exp_log():
+    twists = random_twists(30, 6, 12)
+    # Keep the angles below pi, where the logarithm is unique
+    twists[:, 3:] *= 0.5
+    transforms = rl.SE3Array.exp(twists)
+    assert np.allclose(transforms.log(), twists)
+
+    # The exponential agrees with the matrix exponential of the twist
+    from scipy.linalg import expm
+
+    xi = twists[0]
+    algebra = np.zeros((4, 4))
+    algebra[:3, :3] = rl.hat(xi[3:])
+    algebra[:3, 3] = xi[:3]
+    assert np.allclose(transforms.matrix[0], expm(algebra))
+
+    small = np.array([1.0, 2.0, 3.0, 1e-9, 0, 0])
+    assert np.allclose(rl.SE3.exp(small).log(), small)
+
+
+def test_se3_compose_and_apply():
+    a = rl.SE3Array.exp(random_twists(10, 6, 13))
+    b = rl.SE3Array.exp(random_twists(10, 6, 14))
+    points = np.random.default_rng(15).normal(size=(10, 3))
+
+    c = a * b
+    assert np.allclose(c.matrix, a.matrix @ b.matrix)
+    assert np.allclose(c.apply(points), a.apply(b.apply(points)))
+    assert np.allclose((a * a.inverse()).matrix, np.eye(4))
+
+    single = a[0]
+    assert np.allclose((single * b).matrix, a.matrix[0] @ b.matrix)
+    assert np.allclose((single * single.inverse()).matrix, np.eye(4))
+    homogeneous = np.c_[points, np.ones(10)] @ single.matrix.T
+    assert np.allclose(single.apply(points), homogeneous[:, :3])
+    assert np.allclose(rl.SE3Array.from_matrix(c.matrix).matrix, c.matrix)
+
+
+def test_se2():
+    twists = random_twists(30, 3, 16)
+    twists[:, 2] = np.clip(twists[:, 2], -3, 3)
+    transforms = rl.SE2Array.exp(twists)
+    assert np.allclose(transforms.log(), twists)
+
+    a = rl.SE2Array.exp(random_twists(10, 3, 17))
+    b = rl.SE2Array.exp(random_twists(10, 3, 18))
+    points = np.random.default_rng(19).normal(size=(10, 2))
+    assert np.allclose((a * b).matrix, a.matrix @ b.matrix)
+    assert np.allclose((a * b).apply(points), a.apply(b.apply(points)))
+    assert np.allclose((a * a.inverse()).matrix, np.eye(3))
+
+    single = a[3]
+    assert np.allclose((single * single.inverse()).matrix, np.eye(3))
+    assert np.allclose(single.apply(points), a[3:4].apply(points))
+    assert np.allclose(rl.SE2.exp(single.log()).matrix, single.matrix)
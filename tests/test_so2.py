@@ -0,0 +1,60 @@
+import robolie as rl
+
+import numpy as np
+import pytest
+
+
+def test_so2_wraps_angle():
+    rot = rl.SO2(3 * np.pi / 4) * rl.SO2(np.pi / 2)
+    assert np.isclose(rot.angle, -3 * np.pi / 4)
+    assert np.isclose(rl.SO2(-np.pi).angle, np.pi)
+    assert np.allclose(
+        rot.matrix,
+        [
+            [np.cos(rot.angle), -np.sin(rot.angle)],
+            [np.sin(rot.angle), np.cos(rot.angle)],
+        ],
+    )
+
+
+def test_so2_array_operations():
+    rng = np.random.default_rng(6)
+    a = rl.SO2Array(rng.uniform(-10, 10, size=20))
+    b = rl.SO2Array(rng.uniform(-10, 10, size=20))
+    assert np.all((a.angles > -np.pi) & (a.angles <= np.pi))
+
+    c = a * b
+    for i in range(20):
+        assert np.isclose(c[i].angle, (a[i] * b[i]).angle)
+        assert np.allclose(c.matrix[i], a.matrix[i] @ b.matrix[i])
+    assert np.allclose((a * a.inverse()).angles, 0)
+    assert np.allclose(rl.SO2Array.exp(a.log()).angles, a.angles)
+    assert np.allclose(a.complex, np.exp(1j * a.angles))
+
+    # Neither the logarithm nor the angles expose the stored angles.
+    angles = a.angles.copy()
+    a.log()[:] = 3
+    with pytest.raises(ValueError):
+        a.angles[:] = 3
+    assert np.array_equal(a.angles, angles)
+    assert np.allclose(a.complex, np.exp(1j * angles))
+
+    points = rng.normal(size=(20, 2))
+    rotated = a.apply(points)
+    assert np.allclose(rotated, np.einsum("nij,nj->ni", a.matrix, points))
+    assert np.allclose(a[:1].apply(points), points @ a.matrix[0].T)
+
+    assert np.allclose((a[0] * b).angles, (rl.SO2Array([a[0].angle]) * b).angles)
+    with pytest.raises(TypeError):
+        a * "a"
+    with pytest.raises(TypeError):
+        "a" * a
+
+
+def test_so2_array_mean_across_pi():
+    rotations = rl.SO2Array([np.pi - 0.1, -np.pi + 0.1, np.pi - 0.2, -np.pi + 0.2])
+    mean = rotations.mean()
+    assert np.isclose(abs(mean.angle), np.pi)
+
+    weighted = rl.SO2Array([np.pi - 0.1, -np.pi + 0.3]).mean(weights=[1, 1])
+    assert np.isclose(weighted.angle, -np.pi + 0.1)
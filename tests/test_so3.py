@@ -0,0 +1,59 @@
+import copy
+
+import robolie as rl
+
+import numpy as np
+from robolie.so.so import SO
+
+
+def random_rotation_vectors(n, seed):
+    rng = np.random.default_rng(seed)
+    v = rng.normal(size=(n, 3))
+    return v / np.linalg.norm(v, axis=1)[:, None] * rng.uniform(0, np.pi, n)[:, None]
+
+
+def test_so3_exp_matches_quaternions():
+    v = random_rotation_vectors(50, 7)
+    rotations = rl.SO3.exp(v)
+    expected = rl.quaternion_to_rotation_matrix(rl.quaternion_exp(v / 2))
+    assert np.allclose(rotations.matrix, expected)
+
+    q = rotations.to_quaternions()
+    assert np.allclose(rl.quaternion_to_rotation_matrix(q), rotations.matrix)
+    assert np.all(q.real >= 0)
+
+
+def test_so3_log():
+    v = random_rotation_vectors(50, 8)
+    assert np.allclose(rl.SO3.exp(v).log(), v)
+
+    # Small angles and angles close to pi
+    axis = np.array([2.0, -1.0, 2.0]) / 3
+    for angle in [0.0, 1e-9, 1e-5, np.pi - 1e-6, np.pi - 1e-9]:
+        log = rl.SO3.from_angle_and_axis(angle, axis).log()[0]
+        assert np.allclose(log, angle * axis, atol=1e-8)
+
+
+def test_so3_group_operations():
+    a = rl.SO3.exp(random_rotation_vectors(20, 9))
+    b = rl.SO3.exp(random_rotation_vectors(20, 10))
+    assert np.allclose((a * a.inverse()).matrix, np.eye(3))
+    assert np.allclose((a * b).matrix[3], a.matrix[3] @ b.matrix[3])
+
+    points = np.random.default_rng(11).normal(size=(20, 3))
+    assert np.allclose(a.apply(points), np.einsum("nij,nj->ni", a.matrix, points))
+    assert np.allclose(a[2].apply(points), points @ a.matrix[2].T)
+
+    noisy = rl.SO3(a.matrix + 1e-3)
+    fixed = noisy.orthonormalized()
+    assert np.allclose(fixed.matrix @ np.swapaxes(fixed.matrix, 1, 2), np.eye(3))
+    assert np.allclose(np.linalg.det(fixed.matrix), 1)
+    assert np.allclose(fixed.matrix, a.matrix, atol=1e-2)
+
+
+def test_so_copy():
+    rotation = SO(np.pi / 3, np.array([0.0, 0.0, 1.0]))
+    assert np.allclose(rotation.matrix, rl.SO3.exp([0, 0, np.pi / 3]).matrix[0])
+    duplicate = copy.deepcopy(rotation)
+    assert np.allclose(duplicate.matrix, rotation.matrix)
+    assert np.allclose(copy.copy(rotation).matrix, rotation.matrix)
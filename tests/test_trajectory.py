@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+import robolie as rl
+
+
+def test_trajectory_roundtrip_in_chunks(tmp_path):
+    path = tmp_path / "orientations.rltraj"
+    rng = np.random.default_rng(0)
+    q = rl.QuaternionArray(rng.normal(size=(1000, 4))).normalized()
+    times = np.arange(1000) * 0.01
+
+    with rl.TrajectoryWriter(path, dtype=np.float32) as writer:
+        for start in range(0, 1000, 300):
+            writer.append(times[start : start + 300], q[start : start + 300])
+    with rl.TrajectoryWriter(path, append=True) as writer:
+        with pytest.raises(ValueError):
+            writer.append([0.0], q.full[:1])
+        writer.append([10.0], q.full[:1])
+
+    trajectory = rl.Trajectory(path)
+    assert len(trajectory) == 1001
+    assert trajectory.rotations.dtype == np.float32
+    assert np.allclose(trajectory.rotations.full[:1000], q.full, atol=1e-6)
+    assert np.shares_memory(trajectory.rotations.full, trajectory.records)
+
+    window = trajectory.between(2.0, 3.0)
+    assert len(window) == 100
+    assert np.allclose(window.timestamps, times[200:300])
+    assert np.allclose(window.rotations.full, q.full[200:300], atol=1e-6)
+    assert len(trajectory.between(stop=-1.0)) == 0
+
+
+def test_pose_trajectory(tmp_path):
+    path = tmp_path / "poses.rltraj"
+    poses = rl.SE3Array.exp(np.random.default_rng(1).normal(size=(50, 6)) * 0.5)
+    rl.write_trajectory(path, np.linspace(0, 1, 50), poses)
+
+    trajectory = rl.Trajectory(path)
+    assert trajectory.kind == "pose"
+    assert np.allclose(trajectory.poses.matrix, poses.matrix)
+    points = np.ones((50, 3))
+    assert np.allclose(trajectory.poses.apply(points), poses.apply(points))
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+import robolie as rl
+
+
+def test_unit_quaternion():
+    q = rl.UnitQuaternion.from_angle_and_axis(0.3, np.array([0.0, 0.6, 0.8]))
+    p = rl.Quaternion(*q.full)
+    assert isinstance(q * q, rl.UnitQuaternion)
+    assert isinstance(q.inverse(), rl.UnitQuaternion)
+    assert type(q * p) is rl.Quaternion
+    assert np.allclose((q * q).full, (p * p).full)
+    assert np.allclose(q.inverse().full, p.inverse().full)
+    assert np.allclose(q.log().vector, p.log().vector)
+    assert np.allclose(q.which_rotation()[1], p.which_rotation()[1])
+    vector = np.array([1.0, 2.0, 3.0])
+    assert np.allclose(
+        rl.rotate_by_quaternion(vector, quaternion=q),
+        rl.rotate_by_quaternion(vector, quaternion=p),
+    )
+
+    with pytest.raises(ValueError):
+        rl.UnitQuaternion(1, 1, 0, 0)
+    with pytest.raises(ValueError):
+        q.real = 2
+    with pytest.raises(ValueError):
+        q.compose(rl.Quaternion(2, 0, 0, 0), out=q)
+    assert np.isclose(rl.UnitQuaternion(1, 1, 0, 0, normalize=True).norm(), 1)
+
+
+def test_plain_quaternion_into_unit_out():
+    u = rl.UnitQuaternion.identity()
+    q = rl.UnitQuaternion.from_angle_and_axis(0.3, np.array([0.0, 0.6, 0.8]))
+    with pytest.raises(ValueError):
+        rl.Quaternion(2, 0, 0, 0).inverse(out=u)
+    with pytest.raises(ValueError):
+        rl.Quaternion(2, 0, 0, 0).compose(q, out=u)
+    assert u.norm() == 1
+
+    rl.Quaternion(*q.full).compose(q, out=u)
+    assert np.allclose(u.full, (q * q).full)
+    rl.PureQuaternion(0.1, 0.2, 0.3).exp(out=u)
+    assert np.isclose(u.norm(), 1)
+
+
+def test_renormalization_bounds_drift():
+    q = rl.UnitQuaternion.from_angle_and_axis(0.1, np.array([1.0, 2.0, 3.0]))
+    # A perturbed norm is pulled back to one quadratically.
+    r = rl.UnitQuaternion._from_floats(*(q.full * (1 + 1e-4)).tolist())
+    assert abs((r * q).norm() - 1) < 1e-7
+    for _ in range(100000):
+        r *= q
+    assert abs(r.norm() - 1) < 1e-14
+
+
+def test_unit_quaternion_array():
+    vectors = np.random.default_rng(0).normal(size=(100, 3))
+    batch = rl.UnitQuaternionArray.exp(vectors)
+    plain = rl.QuaternionArray(batch.full.copy())
+    assert isinstance(batch * batch, rl.UnitQuaternionArray)
+    assert isinstance(batch[0], rl.UnitQuaternion)
+    assert isinstance(batch[:10], rl.UnitQuaternionArray)
+    assert np.allclose((batch * batch).full, (plain * plain).full)
+    assert np.allclose(batch.inverse().full, plain.inverse().full)
+    assert isinstance(rl.group_mean(batch), rl.UnitQuaternion)
+
+    product = batch.copy()
+    product *= batch
+    assert np.allclose(product.full, (plain * plain).full)
+    assert np.allclose(product.norm(), 1)
+
+    with pytest.raises(ValueError):
+        rl.UnitQuaternionArray([[1.0, 1.0, 0.0, 0.0]])
+    with pytest.raises(ValueError):
+        batch *= np.array([2.0, 0.0, 0.0, 0.0])
+    normalized = rl.UnitQuaternionArray([[1.0, 1.0, 0.0, 0.0]], normalize=True)
+    assert np.allclose(normalized.norm(), 1)